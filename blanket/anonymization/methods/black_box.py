@@ -2,16 +2,17 @@ import cv2
 
 
 class BlackBoxAnonymizer:
-    def anonymize(self, image, detections):
+    def anonymize(self, image, detections, in_place=False):
         """
         Draws a black rectangle over each detected face in the image.
         Args:
             image (np.ndarray): BGR image.
             detections (list): List of FaceDetection objects.
+            in_place (bool): If True, the face regions of the input image are overwritten instead of copying it.
         Returns:
             np.ndarray: Anonymized image.
         """
-        anonymized = image.copy()
+        anonymized = image if in_place else image.copy()
         for det in detections:
             l, t, r, b = det.left, det.top, det.right, det.bottom
             cv2.rectangle(anonymized, (l, t), (r, b), (0, 0, 0), thickness=-1)
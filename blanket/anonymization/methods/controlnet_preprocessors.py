@@ -1,14 +1,117 @@
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
 import cv2
 import numpy as np
 from PIL import Image
 
 
-class CannyPreprocessor:
+class ConditioningCache:
+    """Bounded LRU cache of ControlNet conditioning images keyed by input image hash and preprocessor parameters."""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, Image.Image] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def hash_image(image: Image.Image) -> str:
+        """
+        Hash image content together with its size and mode.
+        Args:
+            image (Image.Image): Input image.
+        Returns:
+            str: Hex digest of the image.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{image.mode}{image.size}".encode())
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: tuple) -> Optional[Image.Image]:
+        with self._lock:
+            control_image = self._entries.get(key)
+            if control_image is not None:
+                self._entries.move_to_end(key)
+            return control_image
+
+    def put(self, key: tuple, control_image: Image.Image) -> None:
+        with self._lock:
+            self._entries[key] = control_image
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# shared by all preprocessors (and therefore by all StableDiffusionAnonymizer instances) in the process
+conditioning_cache = ConditioningCache()
+
+
+class ConditioningPreprocessor(ABC):
+    """Base class for ControlNet preprocessors with conditioning caching and optional crop-local processing."""
+
+    @property
+    @abstractmethod
+    def parameters(self) -> tuple:
+        """Parameters that influence the conditioning image (part of the cache key)."""
+        pass
+
+    @abstractmethod
+    def _process(self, image: Image.Image) -> Image.Image:
+        """Compute the conditioning image (to be implemented by subclasses)."""
+        pass
+
+    def __call__(self, image: Image.Image, crop_box: Optional[tuple[int, int, int, int]] = None) -> Image.Image:
+        """
+        Compute (or load from cache) the conditioning image.
+        Args:
+            image (Image.Image): RGB input image.
+            crop_box (Optional[tuple]): (left, top, right, bottom) region to process. Outside of it the conditioning
+                image is black (no conditioning). If None, the full image is processed.
+        Returns:
+            Image.Image: Conditioning image with the same size as the input image.
+        """
+        cache_key = (type(self).__name__, self.parameters, ConditioningCache.hash_image(image), crop_box)
+        control_image = conditioning_cache.get(cache_key)
+        if control_image is not None:
+            return control_image
+
+        if crop_box is None:
+            control_image = self._process(image)
+            if control_image.size != image.size:
+                control_image = control_image.resize(image.size, Image.LANCZOS)
+        else:
+            crop_width, crop_height = crop_box[2] - crop_box[0], crop_box[3] - crop_box[1]
+            control_crop = self._process(image.crop(crop_box))
+            if control_crop.size != (crop_width, crop_height):
+                control_crop = control_crop.resize((crop_width, crop_height), Image.LANCZOS)
+            control_image = Image.new("RGB", image.size)
+            control_image.paste(control_crop.convert("RGB"), crop_box[:2])
+
+        conditioning_cache.put(cache_key, control_image)
+        return control_image
+
+
+class CannyPreprocessor(ConditioningPreprocessor):
     def __init__(self, low_threshold: int = 100, high_threshold: int = 200):
         self.low_threshold = low_threshold
         self.high_threshold = high_threshold
 
-    def __call__(self, image: Image.Image) -> Image.Image:
+    @property
+    def parameters(self) -> tuple:
+        return self.low_threshold, self.high_threshold
+
+    def _process(self, image: Image.Image) -> Image.Image:
         image_np = np.array(image)
 
         gray = cv2.cvtColor(image_np, cv2.COLOR_RGB2GRAY)
@@ -17,14 +120,31 @@ class CannyPreprocessor:
         return Image.fromarray(edges_rgb)
 
 
-class OpenPosePreprocessor:
-    def __init__(self):
-        self.processor = None
-        from controlnet_aux import OpenposeDetector
-        self.processor = OpenposeDetector.from_pretrained('lllyasviel/ControlNet')
+_openpose_annotator = None
+_openpose_annotator_lock = threading.Lock()
+
+
+def get_openpose_annotator():
+    """
+    Lazily load the OpenPose annotator weights once per process.
+    Returns:
+        OpenposeDetector: Shared annotator instance.
+    """
+    global _openpose_annotator
+
+    with _openpose_annotator_lock:
+        if _openpose_annotator is None:
+            from controlnet_aux import OpenposeDetector
+
+            _openpose_annotator = OpenposeDetector.from_pretrained('lllyasviel/ControlNet')
+
+    return _openpose_annotator
+
 
-    def __call__(self, image: Image.Image) -> Image.Image:
-        if self.processor is None:
-            return image
+class OpenPosePreprocessor(ConditioningPreprocessor):
+    @property
+    def parameters(self) -> tuple:
+        return ('lllyasviel/ControlNet',)
 
-        return self.processor(image)
\ No newline at end of file
+    def _process(self, image: Image.Image) -> Image.Image:
+        return get_openpose_annotator()(image)
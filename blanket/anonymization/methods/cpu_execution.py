@@ -0,0 +1,199 @@
+"""CPU execution helpers for the diffusers pipelines (threads, memory format, bf16, torch.compile)."""
+import contextlib
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import torch
+from PIL import Image
+
+DEFAULT_CPU_EXECUTION = {
+    "intra_op_threads": None,  # None -> leave torch default (all physical cores)
+    "inter_op_threads": 1,
+    "channels_last": True,
+    "bf16_autocast": True,
+    "compile_unet": False,
+    "compile_controlnet": False,
+    "compile_mode": "default",
+    "compile_cache_dir": ".cache/torch_compile",
+    "validate_bf16": False,
+    "bf16_min_psnr": 30.0,
+}
+
+_interop_threads_configured = False
+
+
+def resolve_cpu_execution(cpu_execution: Optional[dict]) -> dict:
+    """
+    Merge user provided CPU execution options with defaults.
+    Args:
+        cpu_execution (Optional[dict]): Options from the module parameters YAML.
+    Returns:
+        dict: Complete CPU execution options.
+    """
+    resolved = dict(DEFAULT_CPU_EXECUTION)
+    if cpu_execution:
+        resolved.update(cpu_execution)
+    return resolved
+
+
+def configure_torch_threads(intra_op_threads: Optional[int], inter_op_threads: Optional[int]) -> None:
+    """
+    Set torch intra/inter-op thread pools. Inter-op threads can only be set once per process, before any parallel
+    work has started, so repeated calls only update the intra-op pool.
+    Args:
+        intra_op_threads (Optional[int]): Threads used inside a single operator (GEMM, convolution).
+        inter_op_threads (Optional[int]): Threads used to run independent operators concurrently.
+    """
+    global _interop_threads_configured
+
+    if intra_op_threads:
+        torch.set_num_threads(int(intra_op_threads))
+
+    if inter_op_threads and not _interop_threads_configured:
+        try:
+            torch.set_num_interop_threads(int(inter_op_threads))
+            _interop_threads_configured = True
+        except RuntimeError:
+            # interop pool already started (e.g. by another pipeline in this process)
+            pass
+
+
+def is_bf16_supported() -> bool:
+    """
+    Check whether the CPU has native bfloat16 support (AVX512-BF16 / AMX) through oneDNN.
+    Returns:
+        bool: True if bf16 autocast is expected to be faster than fp32.
+    """
+    try:
+        return bool(torch.backends.mkldnn.is_available() and torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def cpu_autocast(enabled: bool):
+    """
+    Return a bf16 CPU autocast context, or a no-op context if disabled.
+    Args:
+        enabled (bool): Whether bf16 autocast should be used.
+    Returns:
+        contextlib.AbstractContextManager: Autocast context.
+    """
+    if enabled:
+        return torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+    return contextlib.nullcontext()
+
+
+def _configure_compile_cache(compile_cache_dir: Optional[str]) -> None:
+    """
+    Point the inductor cache to a persistent directory so that compiled kernels survive process restarts.
+    Args:
+        compile_cache_dir (Optional[str]): Directory for the on-disk compile cache.
+    """
+    if compile_cache_dir is None:
+        return
+
+    cache_dir = Path(compile_cache_dir).absolute()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(cache_dir))
+
+    try:
+        import torch._inductor.config as inductor_config
+
+        inductor_config.fx_graph_cache = True
+    except (ImportError, AttributeError):
+        pass
+
+
+def _controlnet_modules(pipeline) -> list:
+    """
+    Return the list of ControlNet modules of a pipeline (handles both single and multi ControlNet).
+    """
+    controlnet = getattr(pipeline, "controlnet", None)
+    if controlnet is None:
+        return []
+    if hasattr(controlnet, "nets"):
+        return list(controlnet.nets)
+    return [controlnet]
+
+
+def optimize_pipeline_for_cpu(pipeline, cpu_execution: dict):
+    """
+    Apply CPU specific optimizations to a diffusers pipeline in place.
+    Args:
+        pipeline: Diffusers pipeline already moved to the CPU.
+        cpu_execution (dict): Resolved CPU execution options.
+    Returns:
+        The optimized pipeline.
+    """
+    configure_torch_threads(cpu_execution["intra_op_threads"], cpu_execution["inter_op_threads"])
+
+    if cpu_execution["channels_last"]:
+        pipeline.unet.to(memory_format=torch.channels_last)
+        pipeline.vae.to(memory_format=torch.channels_last)
+        for controlnet in _controlnet_modules(pipeline):
+            controlnet.to(memory_format=torch.channels_last)
+
+    if cpu_execution["compile_unet"] or cpu_execution["compile_controlnet"]:
+        _configure_compile_cache(cpu_execution["compile_cache_dir"])
+        compile_mode = cpu_execution["compile_mode"]
+
+        if cpu_execution["compile_unet"]:
+            pipeline.unet = torch.compile(pipeline.unet, mode=compile_mode)
+
+        if cpu_execution["compile_controlnet"] and hasattr(pipeline, "controlnet"):
+            if hasattr(pipeline.controlnet, "nets"):
+                pipeline.controlnet.nets = torch.nn.ModuleList(
+                    [torch.compile(controlnet, mode=compile_mode) for controlnet in pipeline.controlnet.nets]
+                )
+            else:
+                pipeline.controlnet = torch.compile(pipeline.controlnet, mode=compile_mode)
+
+    return pipeline
+
+
+class StepLatencyTracker:
+    """
+    Records wall-clock latency of individual denoising steps through the diffusers step-end callback. Latencies are
+    measured between consecutive step ends so that prompt encoding and latent preparation are not counted.
+    """
+
+    def __init__(self):
+        self.step_latencies: list[float] = []
+        self._last_time: Optional[float] = None
+
+    def start(self) -> None:
+        """Reset recorded latencies before a new pipeline call."""
+        self.step_latencies = []
+        self._last_time = None
+
+    def __call__(self, pipeline, step: int, timestep, callback_kwargs: dict) -> dict:
+        now = time.perf_counter()
+        if self._last_time is not None:
+            self.step_latencies.append(now - self._last_time)
+        self._last_time = now
+        return callback_kwargs
+
+    @property
+    def mean_latency(self) -> float:
+        """Mean latency of a denoising step in seconds (0 if nothing was recorded)."""
+        return float(np.mean(self.step_latencies)) if len(self.step_latencies) > 0 else 0.0
+
+
+def peak_signal_to_noise_ratio(first_image: Image.Image, second_image: Image.Image) -> float:
+    """
+    Compute PSNR between two images of the same size.
+    Args:
+        first_image (Image.Image): Reference image.
+        second_image (Image.Image): Compared image.
+    Returns:
+        float: PSNR in dB (inf for identical images).
+    """
+    first_array = np.asarray(first_image, dtype=np.float32)
+    second_array = np.asarray(second_image, dtype=np.float32)
+    mse = float(np.mean((first_array - second_array) ** 2))
+    if mse == 0:
+        return float("inf")
+    return float(10 * np.log10(255.0**2 / mse))
@@ -0,0 +1,78 @@
+"""Inpainting mask helpers shared by the local (diffusers) and remote (SD WebUI) identity generation backends."""
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from blanket.core.objects.masks import RegionMask
+
+
+def create_face_region_mask(
+    image_shape, bbox, landmarks: Optional[np.ndarray] = None, mask_blur: int = 0
+) -> RegionMask:
+    """
+    Create a single-channel inpainting mask bounded to the face region (blurring only the face tile).
+    Args:
+        image_shape (tuple): Shape of the image (H, W, ...).
+        bbox: Face bounding box [left, top, right, bottom].
+        landmarks (Optional[np.ndarray]): Facial landmarks (N, 2). If given, the mask is their convex hull,
+            otherwise the bounding box padded by 10 % of its width.
+        mask_blur (int): Gaussian blur radius applied to the mask edges.
+    Returns:
+        RegionMask: Mask tile with its offset in the image.
+    """
+    if landmarks is not None and len(landmarks) > 0:
+        region_mask = RegionMask.from_convex_hull(landmarks, image_shape)
+    else:
+        bbox = np.asarray(bbox, dtype=np.float64).astype(np.int32)
+        region_mask = RegionMask.from_box(bbox, image_shape, padding=int((bbox[2] - bbox[0]) * 0.1))
+
+    return region_mask.feathered(mask_blur)
+
+
+def create_face_mask(image_shape, bbox, landmarks: Optional[np.ndarray] = None, mask_blur: int = 0) -> Image.Image:
+    """
+    Create a full-frame grayscale inpainting mask covering the face (as expected by the inpainting pipelines).
+    Args:
+        image_shape (tuple): Shape of the image (H, W, ...).
+        bbox: Face bounding box [left, top, right, bottom].
+        landmarks (Optional[np.ndarray]): Facial landmarks (N, 2). If given, the mask is their convex hull,
+            otherwise the bounding box padded by 10 % of its width.
+        mask_blur (int): Gaussian blur radius applied to the mask edges.
+    Returns:
+        Image.Image: Mask image in mode "L".
+    """
+    return Image.fromarray(create_face_region_mask(image_shape, bbox, landmarks, mask_blur).to_full_frame())
+
+
+def mask_crop_box(
+    mask: Image.Image, margin_ratio: float, extra_margin: int = 0
+) -> Optional[tuple[int, int, int, int]]:
+    """
+    Compute the (left, top, right, bottom) bounding box of the non-zero mask region enlarged by a context margin.
+    Args:
+        mask (Image.Image): Inpainting mask.
+        margin_ratio (float): Margin added on each side relative to the box size.
+        extra_margin (int): Constant margin in pixels added on each side.
+    Returns:
+        Optional[tuple[int, int, int, int]]: Crop box clipped to the image, or None for an empty mask.
+    """
+    mask_array = np.asarray(mask.convert("L")) > 0
+    rows = np.flatnonzero(mask_array.any(axis=1))
+    cols = np.flatnonzero(mask_array.any(axis=0))
+    if len(rows) == 0 or len(cols) == 0:
+        return None
+
+    height, width = mask_array.shape
+    top, bottom = int(rows[0]), int(rows[-1]) + 1
+    left, right = int(cols[0]), int(cols[-1]) + 1
+
+    margin_x = int((right - left) * margin_ratio) + extra_margin
+    margin_y = int((bottom - top) * margin_ratio) + extra_margin
+
+    return (
+        max(0, left - margin_x),
+        max(0, top - margin_y),
+        min(width, right + margin_x),
+        min(height, bottom + margin_y),
+    )
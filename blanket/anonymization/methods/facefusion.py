@@ -9,6 +9,10 @@ from facefusion import face_analyser, face_detector, face_landmarker, face_recog
 from facefusion.processors.modules.face_swapper import core as face_swapper
 from facefusion.processors.modules.face_enhancer import core as face_enhancer
 
+from blanket.settings.logging_settings import get_process_logger
+
+process_logger = get_process_logger()
+
 
 class IoUFilterException(RuntimeError):
     def __init__(self, message, debug_image=None):
@@ -16,6 +20,10 @@ class IoUFilterException(RuntimeError):
         self.debug_image = debug_image
 
 
+class NoFacesDetectedException(RuntimeError):
+    pass
+
+
 def calculate_iou(bbox1, bbox2):
     x1_1, y1_1, x2_1, y2_1 = bbox1
     x1_2, y1_2, x2_2, y2_2 = bbox2
@@ -88,6 +96,8 @@ class FaceFusionDirectAnonymizer:
         self.expression_restorer_factor = config.get('expression_restorer_factor', 80)
         self.expression_restorer_areas = config.get('expression_restorer_areas', ['upper-face', 'lower-face'])
         self.execution_providers = config.get('execution_providers', ['CPUExecutionProvider'])
+        self.use_quantized_models = config.get('use_quantized_models', False)
+        self.profile_inference = config.get('profile_inference', False)
 
         self.iou_filter = config.get('iou_filter', False)
         self.iou_threshold = config.get('iou_threshold', 0.3)
@@ -107,6 +117,8 @@ class FaceFusionDirectAnonymizer:
         state_manager.init_item('execution_providers', self.execution_providers)
         state_manager.init_item('execution_device_ids', ['0'])
         state_manager.init_item('execution_thread_count', 4)
+        state_manager.init_item('execution_quantized_models', self.use_quantized_models)
+        state_manager.init_item('execution_profiling', self.profile_inference)
         state_manager.init_item('face_detector_model', 'yolo_face')
         state_manager.init_item('face_detector_size', '640x640')
         state_manager.init_item('face_detector_score', self.face_detector_score)
@@ -217,7 +229,7 @@ class FaceFusionDirectAnonymizer:
         target_faces = face_analyser.get_many_faces([image])
 
         if len(target_faces) == 0:
-            raise RuntimeError("No faces detected")
+            raise NoFacesDetectedException("No faces detected")
 
         if self.max_faces is not None and len(target_faces) > self.max_faces:
             target_faces = target_faces[:self.max_faces]
@@ -251,13 +263,16 @@ class FaceFusionDirectAnonymizer:
             if len(target_faces) == 0:
                 iou_failed = True
                 if draw_debug_bboxes:
-                    print(f"  [DEBUG] IoU filter rejected all faces - will use previous frame")
+                    process_logger.debug("  [DEBUG] IoU filter rejected all faces - will use previous frame")
                     debug_img = self._draw_debug_visualization(
                         image, all_detected_bboxes, filtered_bboxes, [], iou_values
                     )
                     raise IoUFilterException("IoU filter rejected all faces - use previous frame", debug_img)
         elif skip_iou_check and draw_debug_bboxes:
-            print(f"  [DEBUG] Skipping IoU filter ({self.frames_since_last_swap} frames since last swap >= {self.iou_skip_threshold})")
+            process_logger.debug(
+                f"  [DEBUG] Skipping IoU filter ({self.frames_since_last_swap} frames since last swap "
+                f">= {self.iou_skip_threshold})"
+            )
 
         result_frame = image.copy()
         bounding_boxes = []
@@ -291,7 +306,7 @@ class FaceFusionDirectAnonymizer:
 
             except Exception as e:
                 if draw_debug_bboxes:
-                    print(f"  [DEBUG] Face swap failed: {e}")
+                    process_logger.debug(f"  [DEBUG] Face swap failed: {e}")
                 continue
 
         if iou_failed:
@@ -310,8 +325,10 @@ class FaceFusionDirectAnonymizer:
             debug_img = self._draw_debug_visualization(
                 image, all_detected_bboxes, filtered_bboxes, bounding_boxes, iou_values
             )
-            print(f"  [DEBUG] Prev: {len(self.previous_bboxes)}, Detected: {len(all_detected_bboxes)}, "
-                  f"Filtered: {len(filtered_bboxes)}, Final: {len(bounding_boxes)}, IoU filter: {self.iou_filter}")
+            process_logger.debug(
+                f"  [DEBUG] Prev: {len(self.previous_bboxes)}, Detected: {len(all_detected_bboxes)}, "
+                f"Filtered: {len(filtered_bboxes)}, Final: {len(bounding_boxes)}, IoU filter: {self.iou_filter}"
+            )
             return result_frame, bounding_boxes, debug_img
 
         return result_frame, bounding_boxes
@@ -3,27 +3,54 @@ import numpy as np
 
 
 class PixelationAnonymizer:
-    def anonymize(self, image, detections, pixel_size=16):
+    def anonymize(
+        self, image, detections, pixel_size=16, in_place=False, use_landmarks_mask=False, blocks_per_face=None
+    ):
         """
         Applies pixelation to each detected face region in the image.
         Args:
             image (np.ndarray): BGR image.
             detections (list): List of FaceDetection objects.
             pixel_size (int): Size of the pixel blocks.
+            in_place (bool): If True, the face regions of the input image are overwritten instead of copying it.
+            use_landmarks_mask (bool): If True, only the landmarks convex hull of faces with landmarks is pixelated.
+            blocks_per_face (Optional[int]): If given, pixel_size is ignored and every face is split into this many
+                blocks along its shorter side (same strength for small and large faces).
         Returns:
             np.ndarray: Anonymized image.
         """
-        anonymized = image.copy()
+        anonymized = image if in_place else image.copy()
         for det in detections:
+            if blocks_per_face is not None:
+                pixel_size = max(1, min(det.width, det.height) // blocks_per_face)
+
+            if use_landmarks_mask and det.landmarks is not None:
+                region_mask = det.create_region_mask(anonymized.shape)
+                face_roi = region_mask.image_roi(anonymized)
+                if face_roi.size > 0:
+                    region_mask.apply(anonymized, self._pixelate(face_roi, pixel_size))
+                continue
+
             l, t, r, b = det.left, det.top, det.right, det.bottom
             face_roi = anonymized[t:b, l:r]
             if face_roi.size == 0:
                 continue
-            h, w = face_roi.shape[:2]
-            # Downscale and then upscale to create pixelation
-            temp = cv2.resize(
-                face_roi, (max(1, w // pixel_size), max(1, h // pixel_size)), interpolation=cv2.INTER_LINEAR
-            )
-            pixelated = cv2.resize(temp, (w, h), interpolation=cv2.INTER_NEAREST)
-            anonymized[t:b, l:r] = pixelated
+            self._pixelate(face_roi, pixel_size, dst=face_roi)
         return anonymized
+
+    @staticmethod
+    def _pixelate(face_roi, pixel_size, dst=None):
+        """
+        Downscale and then upscale the region to create pixelation.
+        Args:
+            face_roi (np.ndarray): Image region.
+            pixel_size (int): Size of the pixel blocks.
+            dst (Optional[np.ndarray]): Output array (may be the region itself), allocated if None.
+        Returns:
+            np.ndarray: Pixelated region.
+        """
+        h, w = face_roi.shape[:2]
+        temp = cv2.resize(
+            face_roi, (max(1, w // pixel_size), max(1, h // pixel_size)), interpolation=cv2.INTER_LINEAR
+        )
+        return cv2.resize(temp, (w, h), dst=dst, interpolation=cv2.INTER_NEAREST)
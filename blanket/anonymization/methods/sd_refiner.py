@@ -4,6 +4,8 @@ from diffusers import StableDiffusionXLImg2ImgPipeline
 from PIL import Image
 from typing import Optional
 
+from blanket.anonymization.methods.cpu_execution import cpu_autocast, optimize_pipeline_for_cpu
+
 
 class SDRefiner:
     """Stable Diffusion XL refiner for high-quality output."""
@@ -15,12 +17,16 @@ class SDRefiner:
         device: str,
         switch_at: float,
         use_fp32: bool = True,
+        cpu_execution: Optional[dict] = None,
+        use_bf16: bool = False,
     ):
         self.enabled = enabled
         self.refiner_model_id = refiner_model_id
         self.device = device
         self.switch_at = switch_at
         self.use_fp32 = use_fp32
+        self.cpu_execution = cpu_execution
+        self.use_bf16 = use_bf16
         self.refiner_pipe = None
 
     def load(self):
@@ -43,6 +49,9 @@ class SDRefiner:
         else:
             self.refiner_pipe = self.refiner_pipe.to(self.device)
 
+        if self.device == "cpu" and self.cpu_execution is not None:
+            self.refiner_pipe = optimize_pipeline_for_cpu(self.refiner_pipe, self.cpu_execution)
+
     def unload(self):
         if self.refiner_pipe is not None:
             del self.refiner_pipe
@@ -73,13 +82,7 @@ class SDRefiner:
 
         refiner_steps = max(1, int(num_inference_steps * (1.0 - self.switch_at)))
 
-        refined_output = self.refiner_pipe(
-            prompt=prompt,
-            negative_prompt=negative_prompt,
-            image=base_output,
-            num_inference_steps=refiner_steps,
-            guidance_scale=guidance_scale,
-        ).images[0]
+        refined_output = self._run_refiner(base_output, prompt, negative_prompt, refiner_steps, guidance_scale)
 
         if mask is not None:
             mask_array = np.array(mask.convert('L')).astype(np.float32) / 255.0
@@ -91,4 +94,16 @@ class SDRefiner:
 
             return Image.fromarray(composited)
 
-        return refined_output
\ No newline at end of file
+        return refined_output
+
+    def _run_refiner(
+        self, image: Image.Image, prompt: str, negative_prompt: str, refiner_steps: int, guidance_scale: float
+    ) -> Image.Image:
+        with cpu_autocast(self.use_bf16):
+            return self.refiner_pipe(
+                prompt=prompt,
+                negative_prompt=negative_prompt,
+                image=image,
+                num_inference_steps=refiner_steps,
+                guidance_scale=guidance_scale,
+            ).images[0]
@@ -0,0 +1,217 @@
+"""Remote synthetic identity generation through an SD WebUI compatible HTTP API."""
+import base64
+import copy
+import io
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from blanket.anonymization.methods.face_mask import create_face_mask
+from blanket.settings.config_loader import create_settings_from_config_file
+from blanket.settings.individual_modules_settings.sdwebui_settings import SDWebUISettings
+from blanket.settings.logging_settings import get_process_logger
+
+IMG2IMG_ENDPOINT = "/sdapi/v1/img2img"
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+module_parameters_folder = Path(__file__).parent.parent.parent / "configs" / "module_parameters"
+
+process_logger = get_process_logger()
+
+
+def encode_image_base64(image: Image.Image) -> str:
+    """
+    Encode an image as base64 PNG string.
+    Args:
+        image (Image.Image): Image to encode.
+    Returns:
+        str: Base64 encoded PNG.
+    """
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def decode_image_base64(image_base64: str) -> Image.Image:
+    """
+    Decode a base64 image returned by the server (optionally prefixed by a data URI header).
+    Args:
+        image_base64 (str): Base64 encoded image.
+    Returns:
+        Image.Image: Decoded image in RGB mode.
+    """
+    if image_base64.startswith("data:"):
+        image_base64 = image_base64.split(",", 1)[1]
+    return Image.open(io.BytesIO(base64.b64decode(image_base64))).convert("RGB")
+
+
+class SDWebUIClient:
+    """
+    Thin SD WebUI API client with a pooled keep-alive session, automatic retries and a bounded number of concurrent
+    in-flight requests.
+    """
+
+    def __init__(self, settings: SDWebUISettings):
+        self.settings = settings
+
+        retry = Retry(
+            total=settings.max_retries,
+            backoff_factor=settings.retry_backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.max_concurrent_requests, max_retries=retry)
+
+        self._session = requests.Session()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.max_concurrent_requests, thread_name_prefix="sdwebui_request"
+        )
+
+    def img2img(self, payload: dict) -> list[Image.Image]:
+        """
+        Send a blocking img2img (inpainting) request.
+        Args:
+            payload (dict): SD WebUI img2img payload.
+        Returns:
+            list[Image.Image]: Returned images (generated image first, then e.g. ControlNet detected maps).
+        Raises:
+            requests.HTTPError: If the server responds with an error after all retries.
+            RuntimeError: If the server returns no images.
+        """
+        response = self._session.post(
+            self.settings.server_url + IMG2IMG_ENDPOINT, json=payload, timeout=self.settings.request_timeout
+        )
+        response.raise_for_status()
+
+        images = response.json().get("images") or []
+        if len(images) == 0:
+            raise RuntimeError(f"SD WebUI server {self.settings.server_url} returned no images")
+
+        return [decode_image_base64(image) for image in images]
+
+    def submit_img2img(self, payload: dict) -> Future:
+        """
+        Queue an img2img request, at most max_concurrent_requests are in flight at the same time.
+        Args:
+            payload (dict): SD WebUI img2img payload.
+        Returns:
+            Future: Future resolving to the list of returned images.
+        """
+        return self._executor.submit(self.img2img, payload)
+
+    def close(self) -> None:
+        """Wait for in-flight requests and close pooled connections."""
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class SDWebUIAnonymizer:
+    """
+    Generate synthetic face identities on a remote SD WebUI server. Mirrors the interface of
+    StableDiffusionAnonymizer so that worker processes don't need to load the SDXL weights themselves.
+    """
+
+    def __init__(self, settings_path=None, settings: Optional[SDWebUISettings] = None):
+        if settings is None:
+            if settings_path is None:
+                settings_path = module_parameters_folder / "sdwebui_settings.yaml"
+            settings = create_settings_from_config_file(Path(settings_path), SDWebUISettings)
+        self.settings = settings
+
+        parameters_path = settings.parameters_path or module_parameters_folder / "sdwebui_parameters.json"
+        with open(parameters_path, "r") as f:
+            self.payload_template = json.load(f)
+
+        self._client = None
+
+    @property
+    def client(self) -> SDWebUIClient:
+        if self._client is None:
+            self._client = SDWebUIClient(self.settings)
+        return self._client
+
+    def create_payload(self, image, face_bbox, face_landmarks=None, output_size=None, save_mask_path=None) -> dict:
+        """
+        Build the inpainting payload (image, mask, output size and ControlNet units from the template).
+        Args:
+            image (np.ndarray): BGR image.
+            face_bbox: Face bounding box [left, top, right, bottom].
+            face_landmarks (Optional[np.ndarray]): Facial landmarks (N, 2).
+            output_size (Optional[tuple]): (width, height) to resize the image to before inpainting.
+            save_mask_path (Optional[str]): If given, the inpainting mask is saved there.
+        Returns:
+            dict: SD WebUI img2img payload.
+        """
+        pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+        if output_size is not None and tuple(output_size) != pil_image.size:
+            scale_x = output_size[0] / pil_image.width
+            scale_y = output_size[1] / pil_image.height
+            pil_image = pil_image.resize(output_size, Image.LANCZOS)
+            face_bbox = [face_bbox[0] * scale_x, face_bbox[1] * scale_y, face_bbox[2] * scale_x, face_bbox[3] * scale_y]
+            if face_landmarks is not None:
+                face_landmarks = face_landmarks.astype(np.float64) * np.asarray([scale_x, scale_y])
+
+        # mask blur is applied by the server (mask_blur in the payload template)
+        mask = create_face_mask(np.asarray(pil_image).shape, face_bbox, face_landmarks)
+        if save_mask_path is not None:
+            mask.save(save_mask_path)
+            process_logger.info(f"Saved inpainting mask to: {save_mask_path}")
+
+        payload = copy.deepcopy(self.payload_template)
+        payload["init_images"] = [encode_image_base64(pil_image)]
+        payload["mask"] = encode_image_base64(mask)
+        # generate at the size of the sent image, the template size would not match the frame it is composited into
+        payload["width"], payload["height"] = pil_image.size
+
+        return payload
+
+    def generate(self, image, face_bbox, face_landmarks=None, output_size=None, save_mask_path=None) -> Image.Image:
+        """
+        Generate a synthetic identity (blocking).
+        Returns:
+            Image.Image: Inpainted RGB image.
+        """
+        return self.submit(image, face_bbox, face_landmarks, output_size, save_mask_path).result()
+
+    def submit(self, image, face_bbox, face_landmarks=None, output_size=None, save_mask_path=None) -> Future:
+        """
+        Queue a synthetic identity generation request without waiting for it.
+        Returns:
+            Future: Future resolving to the inpainted RGB image.
+        """
+        payload = self.create_payload(image, face_bbox, face_landmarks, output_size, save_mask_path)
+        images_future = self.client.submit_img2img(payload)
+
+        output_future = Future()
+
+        def _resolve(done_future: Future):
+            try:
+                output_future.set_result(done_future.result()[0])
+            except Exception as e:
+                output_future.set_exception(e)
+
+        images_future.add_done_callback(_resolve)
+        return output_future
+
+    def unload(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
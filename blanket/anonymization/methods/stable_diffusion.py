@@ -14,9 +14,22 @@ from diffusers import (
 
 from blanket.anonymization.methods.controlnet_preprocessors import (
     CannyPreprocessor,
-    OpenPosePreprocessor
+    OpenPosePreprocessor,
+    conditioning_cache,
 )
+from blanket.anonymization.methods.cpu_execution import (
+    StepLatencyTracker,
+    cpu_autocast,
+    is_bf16_supported,
+    optimize_pipeline_for_cpu,
+    peak_signal_to_noise_ratio,
+    resolve_cpu_execution,
+)
+from blanket.anonymization.methods.face_mask import create_face_mask, mask_crop_box
 from blanket.anonymization.methods.sd_refiner import SDRefiner
+from blanket.settings.logging_settings import get_process_logger
+
+process_logger = get_process_logger()
 
 
 class StableDiffusionAnonymizer:
@@ -49,14 +62,20 @@ class StableDiffusionAnonymizer:
 
         self.use_controlnet = self.config.get('use_controlnet', True)
         self.controlnet_configs = self.config.get('controlnet_models', [])
+        self.conditioning_crop_margin = self.config.get('conditioning_crop_margin', 0.5)
+        conditioning_cache.max_entries = self.config.get('conditioning_cache_size', conditioning_cache.max_entries)
 
         self.use_refiner = self.config.get('use_refiner', True)
         self.refiner_switch_at = self.config.get('refiner_switch_at', 0.4)
         self.refiner_model = self.config.get('refiner_model', 'stabilityai/stable-diffusion-xl-refiner-1.0')
 
+        self.cpu_execution = resolve_cpu_execution(self.config.get('cpu_execution'))
+        self.use_bf16 = self.device == "cpu" and self.cpu_execution['bf16_autocast'] and is_bf16_supported()
+
         self._pipeline = None
         self._preprocessors = {}
         self._refiner = None
+        self._step_latency_tracker = StepLatencyTracker()
 
     def _load_pipeline(self):
         if self._pipeline is not None:
@@ -99,13 +118,18 @@ class StableDiffusionAnonymizer:
         else:
             self._pipeline = self._pipeline.to(self.device)
 
+        if self.device == "cpu":
+            self._pipeline = optimize_pipeline_for_cpu(self._pipeline, self.cpu_execution)
+
         if self.use_refiner:
             self._refiner = SDRefiner(
                 enabled=True,
                 refiner_model_id=self.refiner_model,
                 device=self.device,
                 switch_at=self.refiner_switch_at,
-                use_fp32=(self.device != "cuda")
+                use_fp32=(self.device != "cuda"),
+                cpu_execution=self.cpu_execution,
+                use_bf16=self.use_bf16,
             )
             self._refiner.load()
 
@@ -125,26 +149,9 @@ class StableDiffusionAnonymizer:
             elif ctrl_type == 'openpose':
                 self._preprocessors['openpose'] = OpenPosePreprocessor()
 
-    def _create_face_mask(self, image, bbox, landmarks=None):
-        height, width = image.shape[:2]
-        mask = np.zeros((height, width), dtype=np.uint8)
-
-        if landmarks is not None and len(landmarks) > 0:
-            hull = cv2.convexHull(landmarks.astype(np.int32))
-            cv2.fillConvexPoly(mask, hull, 255)
-        else:
-            x1, y1, x2, y2 = map(int, bbox)
-            padding = int((x2 - x1) * 0.1)
-            x1 = max(0, x1 - padding)
-            y1 = max(0, y1 - padding)
-            x2 = min(width, x2 + padding)
-            y2 = min(height, y2 + padding)
-            mask[y1:y2, x1:x2] = 255
-
-        if self.mask_blur > 0:
-            mask = cv2.GaussianBlur(mask, (self.mask_blur * 2 + 1, self.mask_blur * 2 + 1), 0)
-
-        return Image.fromarray(mask)
+    def _create_face_mask(self, image_shape, bbox, landmarks=None):
+        # the mask is rasterized and feathered only within the face region, then expanded to the full frame
+        return create_face_mask(image_shape, bbox, landmarks, self.mask_blur)
 
     def generate(self, image, face_bbox, face_landmarks=None, output_size=(896, 896), save_mask_path=None):
         self._load_pipeline()
@@ -170,7 +177,7 @@ class StableDiffusionAnonymizer:
             scaled_landmarks[:, 0] *= scale_x
             scaled_landmarks[:, 1] *= scale_y
 
-        mask = self._create_face_mask(np.array(pil_image), scaled_bbox, scaled_landmarks)
+        mask = self._create_face_mask((pil_image.height, pil_image.width), scaled_bbox, scaled_landmarks)
         if mask.size != pil_image.size:
             mask = mask.resize(pil_image.size, Image.LANCZOS)
 
@@ -187,9 +194,10 @@ class StableDiffusionAnonymizer:
                 preprocessor = self._preprocessors.get(ctrl_type)
 
                 if preprocessor is not None:
-                    control_image = preprocessor(pil_image)
-                    if control_image.size != pil_image.size:
-                        control_image = control_image.resize(pil_image.size, Image.LANCZOS)
+                    crop_box = None
+                    if ctrl_config.get('crop_to_mask', False):
+                        crop_box = mask_crop_box(mask, self.conditioning_crop_margin)
+                    control_image = preprocessor(pil_image, crop_box=crop_box)
 
                     if save_mask_path is not None:
                         debug_path = Path(save_mask_path).parent / f"controlnet_{ctrl_type}.png"
@@ -198,34 +206,31 @@ class StableDiffusionAnonymizer:
                     control_images.append(control_image)
                     controlnet_scales.append(ctrl_config.get('weight', 1.0))
 
-        generator = torch.Generator(device=self.device).manual_seed(self.seed)
-
         base_steps = int(self.steps * self.refiner_switch_at) if self.use_refiner else self.steps
 
+        pipeline_kwargs = dict(
+            prompt=self.prompt,
+            negative_prompt=self.negative_prompt,
+            image=pil_image,
+            mask_image=mask,
+            num_inference_steps=base_steps,
+            strength=self.denoising_strength,
+            guidance_scale=self.cfg_scale,
+        )
         if len(control_images) > 0:
-            output = self._pipeline(
-                prompt=self.prompt,
-                negative_prompt=self.negative_prompt,
-                image=pil_image,
-                mask_image=mask,
-                control_image=control_images,
-                controlnet_conditioning_scale=controlnet_scales,
-                num_inference_steps=base_steps,
-                strength=self.denoising_strength,
-                guidance_scale=self.cfg_scale,
-                generator=generator,
-            ).images[0]
-        else:
-            output = self._pipeline(
-                prompt=self.prompt,
-                negative_prompt=self.negative_prompt,
-                image=pil_image,
-                mask_image=mask,
-                num_inference_steps=base_steps,
-                strength=self.denoising_strength,
-                guidance_scale=self.cfg_scale,
-                generator=generator,
-            ).images[0]
+            pipeline_kwargs['control_image'] = control_images
+            pipeline_kwargs['controlnet_conditioning_scale'] = controlnet_scales
+
+        output = self._run_base_pipeline(pipeline_kwargs, use_bf16=self.use_bf16)
+
+        if self.device == "cpu":
+            process_logger.info(
+                f"Base pass: {self._step_latency_tracker.mean_latency:.2f} s/step "
+                f"({len(self._step_latency_tracker.step_latencies)} steps, bf16={self.use_bf16})"
+            )
+
+        if self.use_bf16 and self.cpu_execution['validate_bf16']:
+            output = self._validate_bf16_output(output, pipeline_kwargs)
 
         if self.use_refiner and self._refiner is not None:
             output = self._refiner.refine(
@@ -239,6 +244,40 @@ class StableDiffusionAnonymizer:
 
         return output
 
+    def _run_base_pipeline(self, pipeline_kwargs, use_bf16):
+        generator = torch.Generator(device=self.device).manual_seed(self.seed)
+
+        self._step_latency_tracker.start()
+        with cpu_autocast(use_bf16):
+            output = self._pipeline(
+                **pipeline_kwargs,
+                generator=generator,
+                callback_on_step_end=self._step_latency_tracker,
+            ).images[0]
+
+        return output
+
+    def _validate_bf16_output(self, bf16_output, pipeline_kwargs):
+        """
+        Re-run the base pass in fp32 and compare it with the bf16 output. If the quality drops below the configured
+        PSNR tolerance, bf16 autocast is disabled for this anonymizer and the fp32 output is used instead.
+        """
+        fp32_output = self._run_base_pipeline(pipeline_kwargs, use_bf16=False)
+        psnr = peak_signal_to_noise_ratio(fp32_output, bf16_output)
+        min_psnr = self.cpu_execution['bf16_min_psnr']
+
+        if psnr < min_psnr:
+            process_logger.warning(
+                f"bf16 output PSNR {psnr:.2f} dB is below tolerance {min_psnr:.2f} dB, falling back to fp32"
+            )
+            self.use_bf16 = False
+            if self._refiner is not None:
+                self._refiner.use_bf16 = False
+            return fp32_output
+
+        process_logger.info(f"bf16 output PSNR vs fp32: {psnr:.2f} dB (tolerance {min_psnr:.2f} dB)")
+        return bf16_output
+
     def unload(self):
         if self._pipeline is not None:
             del self._pipeline
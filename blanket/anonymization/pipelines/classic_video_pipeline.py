@@ -0,0 +1,193 @@
+"""Fast non-generative video anonymization (black box, Gaussian blur, pixelation) with threaded decode/encode."""
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import cv2
+
+from blanket.anonymization.methods.black_box import BlackBoxAnonymizer
+from blanket.anonymization.methods.gaussian_blur import GaussianBlurAnonymizer
+from blanket.anonymization.methods.pixelation import PixelationAnonymizer
+from blanket.constants.enums.anonymization_enums import AnonymizationMethod
+from blanket.constants.enums.detection_enums import FaceDetectorModule
+from blanket.core.detectors.detector_factory import DetectorFactory
+from blanket.core.objects.primitives import VideoPrimitive
+from blanket.settings.logging_settings import LoggingSettings, RateLimitedProgress, get_process_logger
+
+classic_anonymizers = {
+    AnonymizationMethod.BLACK_BOX: BlackBoxAnonymizer,
+    AnonymizationMethod.GAUSSIAN: GaussianBlurAnonymizer,
+    AnonymizationMethod.PIXELATION: PixelationAnonymizer,
+}
+
+_END_OF_STREAM = None
+
+process_logger = get_process_logger()
+
+
+class ClassicVideoPipeline:
+    """
+    Pipeline anonymizing whole videos with the classic (non-generative) methods. Frames are decoded and encoded in
+    background threads, faces are detected in batches and the anonymizers overwrite the face regions in place.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = "output",
+        anonymization_method: str = AnonymizationMethod.GAUSSIAN,
+        face_detector_type: str = "yolo",
+        detection_batch_size: int = 16,
+        queue_size: int = 64,
+        clockwise_rotation_index: int = 0,
+        anonymizer_parameters: Optional[Dict[str, Any]] = None,
+        logging_settings: Optional[LoggingSettings] = None,
+    ):
+        self.output_dir = Path(output_dir)
+        self.anonymization_method = AnonymizationMethod(anonymization_method)
+        if self.anonymization_method not in classic_anonymizers:
+            raise ValueError(
+                f"Unsupported classic anonymization method: {anonymization_method}. "
+                f"Available methods: {[method.value for method in classic_anonymizers]}"
+            )
+
+        self.face_detector_type = face_detector_type
+        self.detection_batch_size = detection_batch_size
+        self.queue_size = queue_size
+        self.clockwise_rotation_index = clockwise_rotation_index
+        # extra keyword arguments of the anonymizer, e.g. kernel_to_face_ratio / blocks_per_face
+        self.anonymizer_parameters = anonymizer_parameters or {}
+        # per-frame JSON-lines results and frames without detections, None -> not logged
+        self.logging_settings = logging_settings
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        self._anonymizer = classic_anonymizers[self.anonymization_method]()
+        self._thread_exception: Optional[BaseException] = None
+        self._stop_decoding = threading.Event()
+
+    def _decode_frames(self, video: VideoPrimitive, decoded_batches: queue.Queue) -> None:
+        """Decoder thread: read frames sequentially into pooled batches and pass them on (bounded queue)."""
+        try:
+            for batch in video.iter_frame_batches(self.detection_batch_size):
+                if self._stop_decoding.is_set():
+                    batch.release()
+                    break
+                decoded_batches.put(batch)
+        except BaseException as e:
+            self._thread_exception = e
+        finally:
+            decoded_batches.put(_END_OF_STREAM)
+
+    def _encode_frames(self, video_writer: cv2.VideoWriter, anonymized_batches: queue.Queue) -> None:
+        """Encoder thread: rotate frames back to the original orientation, write them and return the batches."""
+        try:
+            while (batch := anonymized_batches.get()) is not _END_OF_STREAM:
+                with batch, batch.rotated(-self.clockwise_rotation_index) as original_batch:
+                    for frame in original_batch:
+                        video_writer.write(frame)
+        except BaseException as e:
+            self._thread_exception = e
+            # keep draining so that the main thread never blocks on a full queue
+            while (batch := anonymized_batches.get()) is not _END_OF_STREAM:
+                batch.release()
+
+    def _log_frame(self, frame_number: int, detections: list) -> None:
+        """Log the per-frame result (and a frame without detections) if logging settings are given."""
+        if self.logging_settings is None:
+            return
+        if len(detections) == 0:
+            self.logging_settings.log_frame_without_detection(frame_number)
+        self.logging_settings.log_frame_result(frame_number, faces=len(detections))
+
+    def run(self, video_path: str) -> Dict[str, Any]:
+        start_time = time.time()
+        video_path = Path(video_path)
+
+        if not video_path.exists():
+            return {"success": False, "error": f"Video not found: {video_path}"}
+
+        process_logger.info(f"Processing video: {video_path} ({self.anonymization_method.value})")
+
+        self._thread_exception = None
+        self._stop_decoding.clear()
+        face_detector = DetectorFactory.create_face_detector(FaceDetectorModule(self.face_detector_type))
+
+        # frames are decoded in the pipeline's own decoder thread and used only once -> no prefetch and no cache
+        video = VideoPrimitive(
+            video_path, clockwise_rotation_index=self.clockwise_rotation_index, frame_cache_size=0, prefetch_frames=0
+        )
+        with video:
+            fps, width, height, total_frames = video.fps, video.width, video.height, video.total_frames
+            process_logger.info(f"Video info: {width}x{height} @ {fps:.2f} FPS, {total_frames} frames")
+
+            output_video_path = self.output_dir / f"{video_path.stem}_{self.anonymization_method.value}.mp4"
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            video_writer = cv2.VideoWriter(str(output_video_path), fourcc, fps, (width, height))
+
+            # queue_size counts frames, the queues hold whole batches
+            batch_queue_size = max(1, self.queue_size // self.detection_batch_size)
+            decoded_batches = queue.Queue(maxsize=batch_queue_size)
+            anonymized_batches = queue.Queue(maxsize=batch_queue_size)
+            decoder = threading.Thread(target=self._decode_frames, args=(video, decoded_batches), daemon=True)
+            encoder = threading.Thread(target=self._encode_frames, args=(video_writer, anonymized_batches), daemon=True)
+            decoder.start()
+            encoder.start()
+
+            frame_count, total_faces = 0, 0
+            processing_start_time = time.time()
+            progress = RateLimitedProgress(process_logger, total_frames, "Frame", "frames")
+            end_of_stream = False
+
+            try:
+                while (batch := decoded_batches.get()) is not _END_OF_STREAM:
+                    # the frames are views into the batch buffer, the anonymizers overwrite them in place
+                    frames = list(batch)
+                    detections_per_frame = face_detector.detect_batch(frames)
+
+                    for frame, frame_index, detections in zip(frames, batch.frame_indices, detections_per_frame):
+                        self._anonymizer.anonymize(frame, detections, in_place=True, **self.anonymizer_parameters)
+                        total_faces += len(detections)
+                        self._log_frame(int(frame_index), detections)
+
+                    frame_count += len(batch)
+                    anonymized_batches.put(batch)
+                    progress.update(frame_count)
+                end_of_stream = True
+            finally:
+                anonymized_batches.put(_END_OF_STREAM)
+                encoder.join()
+                video_writer.release()
+
+                # unblock and stop the decoder (it may be waiting on a full queue if processing failed)
+                self._stop_decoding.set()
+                while not end_of_stream:
+                    batch = decoded_batches.get()
+                    if batch is _END_OF_STREAM:
+                        end_of_stream = True
+                    else:
+                        batch.release()
+                decoder.join()
+
+        if self._thread_exception is not None:
+            raise RuntimeError(f"Video decoding/encoding failed: {self._thread_exception}") from self._thread_exception
+
+        elapsed_total = time.time() - start_time
+        elapsed_processing = time.time() - processing_start_time
+        avg_fps = frame_count / elapsed_processing if elapsed_processing > 0 else 0
+
+        process_logger.info("Processing complete!")
+        process_logger.info(f"  Frames processed: {frame_count} ({total_faces} faces)")
+        process_logger.info(f"  Processing time: {elapsed_processing:.2f}s ({avg_fps:.2f} FPS)")
+        process_logger.info(f"  Output video: {output_video_path}")
+
+        return {
+            "success": True,
+            "output_video": str(output_video_path),
+            "frames_processed": frame_count,
+            "faces_anonymized": total_faces,
+            "time_elapsed": elapsed_total,
+            "processing_time": elapsed_processing,
+            "avg_fps": avg_fps,
+        }
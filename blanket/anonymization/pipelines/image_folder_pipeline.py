@@ -0,0 +1,264 @@
+"""Parallel, resumable anonymization of image folders with the classic methods."""
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import cv2
+import numpy as np
+
+from blanket.anonymization.methods.black_box import BlackBoxAnonymizer
+from blanket.anonymization.methods.gaussian_blur import GaussianBlurAnonymizer
+from blanket.anonymization.methods.pixelation import PixelationAnonymizer
+from blanket.constants.enums.anonymization_enums import ImageOutputMode
+from blanket.core.detectors.base_detectors import BaseFaceDetector
+from blanket.settings.logging_settings import RateLimitedProgress, get_process_logger
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+MANIFEST_FILENAME = "manifest.jsonl"
+
+process_logger = get_process_logger()
+
+
+def draw_detections(image: np.ndarray, detections: list) -> np.ndarray:
+    """
+    Draw detection bounding boxes into the image (in place).
+    Args:
+        image (np.ndarray): BGR image.
+        detections (list): List of FaceDetection objects.
+    Returns:
+        np.ndarray: The same image.
+    """
+    for det in detections:
+        x, y, w, h = det.left_top_width_height
+        cv2.rectangle(image, (int(x), int(y)), (int(x + w), int(y + h)), (0, 255, 0), 2)
+    return image
+
+
+class ImageFolderPipeline:
+    """
+    Anonymize all images of a folder with the black box, gaussian blur and pixelation methods. Images are decoded
+    and encoded by a thread pool while faces are detected in batches. Images whose outputs are newer than the input
+    are skipped, every processed image is appended to a JSON-lines manifest with its timings.
+    """
+
+    def __init__(
+        self,
+        face_detector: BaseFaceDetector,
+        output_folder: str,
+        output_mode: str = ImageOutputMode.MOSAIC,
+        io_workers: int = 8,
+        detection_batch_size: int = 16,
+        skip_up_to_date: bool = True,
+    ):
+        self.face_detector = face_detector
+        self.output_folder = Path(output_folder)
+        self.output_mode = ImageOutputMode(output_mode)
+        self.io_workers = io_workers
+        self.detection_batch_size = detection_batch_size
+        self.skip_up_to_date = skip_up_to_date
+
+        self.anonymizers = {
+            "black_box": BlackBoxAnonymizer(),
+            "gaussian_blur": GaussianBlurAnonymizer(),
+            "pixelation": PixelationAnonymizer(),
+        }
+
+        self._manifest_lock = threading.Lock()
+
+    def output_paths(self, image_path: Path) -> list[Path]:
+        """
+        Get the output paths of an input image.
+        Args:
+            image_path (Path): Input image path.
+        Returns:
+            list[Path]: Output paths (one for the mosaic, one per method otherwise).
+        """
+        if self.output_mode == ImageOutputMode.MOSAIC:
+            return [self.output_folder / image_path.name]
+        return [self.output_folder / method_name / image_path.name for method_name in self.anonymizers]
+
+    def _is_up_to_date(self, image_entry: os.DirEntry) -> bool:
+        """Check that all outputs exist and are newer than the input image."""
+        input_mtime = image_entry.stat().st_mtime
+        for output_path in self.output_paths(Path(image_entry.path)):
+            try:
+                if output_path.stat().st_mtime < input_mtime:
+                    return False
+            except FileNotFoundError:
+                return False
+        return True
+
+    def _pending_images(self, input_folder: Path) -> tuple[list[Path], int]:
+        """
+        List input images that need processing (scandir returns cached stat information, no extra syscalls).
+        Returns:
+            tuple: (sorted image paths to process, number of skipped up-to-date images)
+        """
+        pending, skipped = [], 0
+        with os.scandir(input_folder) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                if self.skip_up_to_date and self._is_up_to_date(entry):
+                    skipped += 1
+                    continue
+                pending.append(Path(entry.path))
+        return sorted(pending), skipped
+
+    @staticmethod
+    def _read_image(image_path: Path) -> tuple[Path, Optional[np.ndarray], float]:
+        start_time = time.perf_counter()
+        image = cv2.imread(str(image_path))
+        return image_path, image, time.perf_counter() - start_time
+
+    def _decoded_images(self, executor: ThreadPoolExecutor, image_paths: list[Path]) -> Iterator[tuple]:
+        """Decode images in the pool, keeping a bounded number of decoded images ahead of the detector."""
+        prefetch = max(self.detection_batch_size * 2, self.io_workers)
+        futures: deque[Future] = deque()
+        image_paths_iterator = iter(image_paths)
+
+        for image_path in image_paths_iterator:
+            futures.append(executor.submit(self._read_image, image_path))
+            if len(futures) >= prefetch:
+                break
+
+        while futures:
+            yield futures.popleft().result()
+            next_image_path = next(image_paths_iterator, None)
+            if next_image_path is not None:
+                futures.append(executor.submit(self._read_image, next_image_path))
+
+    def _anonymize(self, image: np.ndarray, detections: list) -> list[np.ndarray]:
+        """
+        Create the output images, anonymizers write directly into the (mosaic) output buffers.
+        Returns:
+            list[np.ndarray]: Output images in the order of output_paths.
+        """
+        if self.output_mode == ImageOutputMode.SEPARATE:
+            return [
+                anonymizer.anonymize(image, detections, in_place=False) for anonymizer in self.anonymizers.values()
+            ]
+
+        height, width = image.shape[:2]
+        mosaic = np.empty((2 * height, 2 * width, 3), dtype=np.uint8)
+        quadrants = {
+            "visualization": mosaic[:height, :width],
+            "black_box": mosaic[:height, width:],
+            "gaussian_blur": mosaic[height:, :width],
+            "pixelation": mosaic[height:, width:],
+        }
+        for quadrant in quadrants.values():
+            quadrant[:] = image
+
+        draw_detections(quadrants["visualization"], detections)
+        for method_name, anonymizer in self.anonymizers.items():
+            anonymizer.anonymize(quadrants[method_name], detections, in_place=True)
+
+        return [mosaic]
+
+    def _write_outputs(self, output_images: list[np.ndarray], output_paths: list[Path]) -> float:
+        start_time = time.perf_counter()
+        for output_image, output_path in zip(output_images, output_paths):
+            if not cv2.imwrite(str(output_path), output_image):
+                raise RuntimeError(f"Failed to write {output_path}")
+        return time.perf_counter() - start_time
+
+    def _append_manifest_record(self, manifest_file, record: Dict[str, Any], write_future: Future) -> None:
+        """Finish the manifest record once the outputs are written (runs in the writing thread)."""
+        exception = write_future.exception()
+        if exception is None:
+            record["write_seconds"] = round(write_future.result(), 6)
+        else:
+            record["error"] = str(exception)
+
+        with self._manifest_lock:
+            manifest_file.write(json.dumps(record) + "\n")
+
+    def run(self, input_folder: str) -> Dict[str, Any]:
+        input_folder = Path(input_folder)
+        start_time = time.time()
+
+        self.output_folder.mkdir(parents=True, exist_ok=True)
+        if self.output_mode == ImageOutputMode.SEPARATE:
+            for method_name in self.anonymizers:
+                (self.output_folder / method_name).mkdir(exist_ok=True)
+
+        image_paths, skipped = self._pending_images(input_folder)
+        process_logger.info(f"Found {len(image_paths)} images to process ({skipped} up to date, skipped)")
+        progress = RateLimitedProgress(process_logger, len(image_paths), "Anonymized", "images")
+
+        processed, failed, anonymized = 0, 0, 0
+        pending_writes: deque[Future] = deque()
+        max_pending_writes = max(self.detection_batch_size * 2, self.io_workers)
+
+        executor = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="image_io")
+        # the executor is shut down (all writes and manifest callbacks finished) before the manifest is closed
+        with open(self.output_folder / MANIFEST_FILENAME, "a") as manifest_file, executor:
+            decoded_images = self._decoded_images(executor, image_paths)
+
+            while True:
+                batch = [decoded for _, decoded in zip(range(self.detection_batch_size), decoded_images)]
+                if len(batch) == 0:
+                    break
+
+                for image_path, image, _ in batch:
+                    if image is None:
+                        process_logger.warning(f"Failed to load {image_path}")
+                        failed += 1
+                batch = [decoded for decoded in batch if decoded[1] is not None]
+                if len(batch) == 0:
+                    continue
+
+                detection_start_time = time.perf_counter()
+                detections_per_image = self.face_detector.detect_batch([image for _, image, _ in batch])
+                detection_seconds = (time.perf_counter() - detection_start_time) / len(batch)
+
+                for (image_path, image, read_seconds), detections in zip(batch, detections_per_image):
+                    anonymization_start_time = time.perf_counter()
+                    output_images = self._anonymize(image, detections)
+                    output_paths = self.output_paths(image_path)
+
+                    record = {
+                        "input": str(image_path),
+                        "outputs": [str(output_path) for output_path in output_paths],
+                        "faces": len(detections),
+                        "read_seconds": round(read_seconds, 6),
+                        "detection_seconds": round(detection_seconds, 6),
+                        "anonymization_seconds": round(time.perf_counter() - anonymization_start_time, 6),
+                    }
+
+                    write_future = executor.submit(self._write_outputs, output_images, output_paths)
+                    write_future.add_done_callback(
+                        lambda done_future, record=record: self._append_manifest_record(
+                            manifest_file, record, done_future
+                        )
+                    )
+                    pending_writes.append(write_future)
+                    anonymized += 1
+
+                # bound the number of anonymized-but-not-written images held in memory
+                while len(pending_writes) > max_pending_writes:
+                    written = pending_writes.popleft().exception() is None
+                    processed, failed = processed + written, failed + (not written)
+
+                progress.update(anonymized)
+
+            while pending_writes:
+                written = pending_writes.popleft().exception() is None
+                processed, failed = processed + written, failed + (not written)
+
+        elapsed = time.time() - start_time
+        process_logger.info(f"Done: {processed} processed, {skipped} skipped, {failed} failed in {elapsed:.2f}s")
+
+        return {
+            "processed": processed,
+            "skipped": skipped,
+            "failed": failed,
+            "time_elapsed": elapsed,
+            "manifest": str(self.output_folder / MANIFEST_FILENAME),
+        }
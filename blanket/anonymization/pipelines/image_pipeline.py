@@ -3,12 +3,12 @@ import numpy as np
 from pathlib import Path
 from PIL import Image
 import yaml
-import torch
 import gc
 
-from blanket.anonymization.methods.stable_diffusion import StableDiffusionAnonymizer
+from blanket.constants.enums.anonymization_enums import IdentityGenerationBackend
 from blanket.core.detectors.detector_factory import DetectorFactory
 from blanket.constants.enums.detection_enums import FaceDetectorModule, FacialLandmarksDetectorModule
+from blanket.core.startup_profiler import startup_profiler
 
 
 def generate_synthetic_identity(image, output_dir, device=None, identity_config_path=None, save_debug=False):
@@ -23,6 +23,7 @@ def generate_synthetic_identity(image, output_dir, device=None, identity_config_
 
     use_poisson = config.get('use_poisson_blending', False)
     poisson_mode = config.get('poisson_blend_mode', 'NORMAL')
+    backend = IdentityGenerationBackend(config.get('identity_generation_backend', 'diffusers'))
 
     face_detector = DetectorFactory.create_face_detector(FaceDetectorModule.YOLO)
     face_detections = face_detector.detect(image)
@@ -39,14 +40,27 @@ def generate_synthetic_identity(image, output_dir, device=None, identity_config_
 
     orig_h, orig_w = image.shape[:2]
 
-    # free memory
+    # detectors stay cached in DetectorFactory for the next call unless memory is needed for the diffusion models
     del face_detector
     del landmarks_detector
-    gc.collect()
-    if torch.cuda.is_available():
-        torch.cuda.empty_cache()
+    if config.get('release_detectors_before_generation', False):
+        import torch
 
-    anonymizer = StableDiffusionAnonymizer(config_path=identity_config_path, device=device)
+        DetectorFactory.release_detectors()
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    # torch and diffusers are imported only when a local identity generation is actually needed
+    with startup_profiler.section(f"model load: {backend.value}"):
+        if backend == IdentityGenerationBackend.SDWEBUI:
+            from blanket.anonymization.methods.sdwebui import SDWebUIAnonymizer
+
+            anonymizer = SDWebUIAnonymizer()
+        else:
+            from blanket.anonymization.methods.stable_diffusion import StableDiffusionAnonymizer
+
+            anonymizer = StableDiffusionAnonymizer(config_path=identity_config_path, device=device)
 
     mask_path = None
     if save_debug:
@@ -5,7 +5,11 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 import time
 
-from blanket.anonymization.pipelines.image_pipeline import generate_synthetic_identity
+from blanket.core.objects.primitives import VideoPrimitive
+from blanket.core.startup_profiler import startup_profiler
+from blanket.settings.logging_settings import LoggingSettings, RateLimitedProgress, get_process_logger
+
+process_logger = get_process_logger()
 
 
 class VideoPipeline:
@@ -22,6 +26,7 @@ class VideoPipeline:
         identity_timestamp: Optional[float] = None,
         save_frames: bool = False,
         debug: bool = False,
+        logging_settings: Optional[LoggingSettings] = None,
     ):
         self.output_dir = Path(output_dir)
         self.debug_dir = Path(debug_dir) if debug_dir else None
@@ -32,6 +37,8 @@ class VideoPipeline:
         self.identity_timestamp = identity_timestamp if identity_timestamp is not None else 0.0
         self.save_frames = save_frames
         self.debug = debug
+        # per-frame JSON-lines results and frames without detections, None -> not logged
+        self.logging_settings = logging_settings
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
         if self.debug_dir:
@@ -51,30 +58,25 @@ class VideoPipeline:
 
         from blanket.anonymization.methods.facefusion import FaceFusionDirectAnonymizer
         config_path = Path(__file__).parent.parent.parent / "configs" / "module_parameters" / "facefusion_parameters.yaml"
-        self._anonymizer = FaceFusionDirectAnonymizer(
-            synthetic_face_path=identity_path,
-            config_path=str(config_path)
-        )
+        with startup_profiler.section("model load: facefusion"):
+            self._anonymizer = FaceFusionDirectAnonymizer(
+                synthetic_face_path=identity_path,
+                config_path=str(config_path)
+            )
 
         return self._anonymizer
 
     def _extract_identity_frame(self, video_path: str) -> np.ndarray:
         """Extract identity frame from video at specified timestamp."""
-        print(f"Extracting identity frame at {self.identity_timestamp}s...")
-
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            raise RuntimeError(f"Failed to open video: {video_path}")
+        process_logger.info(f"Extracting identity frame at {self.identity_timestamp}s...")
 
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_number = int(self.identity_timestamp * fps)
-
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-        ret, frame = cap.read()
-        cap.release()
-
-        if not ret:
-            raise RuntimeError(f"Failed to extract frame at {self.identity_timestamp}s")
+        # seeks to the nearest keyframe using the (cached) keyframe index and decodes forward from there
+        with VideoPrimitive(Path(video_path), frame_cache_size=0, prefetch_frames=0) as video:
+            frame_number = int(self.identity_timestamp * video.fps)
+            try:
+                frame = video.load_frame_as_array(frame_number)
+            except (IndexError, RuntimeError) as e:
+                raise RuntimeError(f"Failed to extract frame at {self.identity_timestamp}s") from e
 
         return frame
 
@@ -85,15 +87,18 @@ class VideoPipeline:
         if not video_path.exists():
             return {"success": False, "error": f"Video not found: {video_path}"}
 
-        print(f"Processing video: {video_path}")
+        process_logger.info(f"Processing video: {video_path}")
 
         if self.identity_image_path:
             identity_path = self.identity_image_path
-            print(f"Using custom identity: {identity_path}")
+            process_logger.info(f"Using custom identity: {identity_path}")
         else:
-            print("Generating synthetic identity...")
+            process_logger.info("Generating synthetic identity...")
             identity_frame = self._extract_identity_frame(str(video_path))
 
+            # imports the detectors and the diffusion framework, skipped when the identity is given
+            from blanket.anonymization.pipelines.image_pipeline import generate_synthetic_identity
+
             identity_path, mask_path = generate_synthetic_identity(
                 image=identity_frame,
                 output_dir=str(self.output_dir),
@@ -101,9 +106,10 @@ class VideoPipeline:
                 save_debug=self.debug_dir is not None,
             )
 
-            print(f"Saved synthetic identity: {identity_path}")
+            process_logger.info(f"Saved synthetic identity: {identity_path}")
 
         anonymizer = self._get_anonymizer(identity_path)
+        from blanket.anonymization.methods.facefusion import NoFacesDetectedException
 
         cap = cv2.VideoCapture(str(video_path))
         if not cap.isOpened():
@@ -114,7 +120,7 @@ class VideoPipeline:
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
 
-        print(f"Video info: {width}x{height} @ {fps:.2f} FPS, {total_frames} frames")
+        process_logger.info(f"Video info: {width}x{height} @ {fps:.2f} FPS, {total_frames} frames")
 
         output_video_path = self.output_dir / f"{video_path.stem}_anonymized.mp4"
         fourcc = cv2.VideoWriter_fourcc(*'mp4v')
@@ -123,7 +129,8 @@ class VideoPipeline:
         frame_count = 0
         last_successful_frame = None
         processing_start_time = time.time()
-        print("Processing frames...")
+        process_logger.info("Processing frames...")
+        progress = RateLimitedProgress(process_logger, total_frames, "Frame", "frames")
 
         while True:
             ret, frame = cap.read()
@@ -132,14 +139,8 @@ class VideoPipeline:
 
             frame_count += 1
 
-            if frame_count % 30 == 0 or frame_count == 1:
-                elapsed_processing = time.time() - processing_start_time
-                current_fps = frame_count / elapsed_processing if elapsed_processing > 0 else 0
-                progress = (frame_count / total_frames * 100) if total_frames > 0 else 0
-                eta_seconds = (total_frames - frame_count) / current_fps if current_fps > 0 else 0
-                eta_min = int(eta_seconds // 60)
-                eta_sec = int(eta_seconds % 60)
-                print(f"  Frame {frame_count}/{total_frames} ({progress:.1f}%) | {current_fps:.2f} FPS | ETA: {eta_min}m {eta_sec}s")
+            progress.update(frame_count)
+            frame_start_time = time.perf_counter()
 
             try:
                 if self.debug:
@@ -159,8 +160,26 @@ class VideoPipeline:
 
                 out.write(anonymized_frame)
 
+                if self.logging_settings is not None:
+                    self.logging_settings.log_frame_result(
+                        frame_count - 1,
+                        faces=len(bounding_boxes),
+                        fallback=False,
+                        processing_time=round(time.perf_counter() - frame_start_time, 4),
+                    )
+
             except Exception as e:
-                print(f"  Warning: Failed to process frame {frame_count}: {e}")
+                process_logger.warning(f"  Failed to process frame {frame_count}: {e}")
+                if self.logging_settings is not None:
+                    if isinstance(e, NoFacesDetectedException):
+                        self.logging_settings.log_frame_without_detection(frame_count - 1)
+                    self.logging_settings.log_frame_result(
+                        frame_count - 1,
+                        faces=0,
+                        fallback=True,
+                        error=str(e),
+                        processing_time=round(time.perf_counter() - frame_start_time, 4),
+                    )
                 if self.debug and hasattr(e, 'debug_image') and e.debug_image is not None:
                     debug_path = self.debug_frames_dir / f"debug_{frame_count:06d}.jpg"
                     cv2.imwrite(str(debug_path), e.debug_image)
@@ -170,7 +189,7 @@ class VideoPipeline:
                 else:
                     # first frame detection fail fallback
                     fallback_frame = np.zeros_like(frame)
-                    print(f"    Using black frame (no face detected yet)")
+                    process_logger.warning("    Using black frame (no face detected yet)")
 
                 out.write(fallback_frame)
 
@@ -185,11 +204,11 @@ class VideoPipeline:
         elapsed_processing = time.time() - processing_start_time
         avg_fps = frame_count / elapsed_processing if elapsed_processing > 0 else 0
 
-        print(f"\nProcessing complete!")
-        print(f"  Frames processed: {frame_count}")
-        print(f"  Processing time: {elapsed_processing:.2f}s ({avg_fps:.2f} FPS)")
-        print(f"  Total time: {elapsed_total:.2f}s")
-        print(f"  Output video: {output_video_path}")
+        process_logger.info("Processing complete!")
+        process_logger.info(f"  Frames processed: {frame_count}")
+        process_logger.info(f"  Processing time: {elapsed_processing:.2f}s ({avg_fps:.2f} FPS)")
+        process_logger.info(f"  Total time: {elapsed_total:.2f}s")
+        process_logger.info(f"  Output video: {output_video_path}")
 
         return {
             "success": True,
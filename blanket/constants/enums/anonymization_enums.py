@@ -10,6 +10,16 @@ class AnonymizationMethod(str, Enum):
     STABLE_DIFFUSION_CONDITIONED_FACEFUSION = "stable_diffusion_conditioned_facefusion"
 
 
+class IdentityGenerationBackend(str, Enum):
+    DIFFUSERS = "diffusers"
+    SDWEBUI = "sdwebui"
+
+
+class ImageOutputMode(str, Enum):
+    MOSAIC = "mosaic"  # one 2x2 image: detections, black box / gaussian blur, pixelation
+    SEPARATE = "separate"  # one image per anonymization method in a subfolder named after the method
+
+
 class MatchingMethod(str, Enum):
     IOU = "intersection_over_union"
     DISTANCE = "distance"
@@ -3,6 +3,7 @@ from enum import Enum
 
 class FaceDetectorModule(str, Enum):
     YOLO = "yolo"
+    YOLO_ONNX = "yolo_onnx"
     # ... additional FaceDetectorModules
 
 
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class EvaluationMetric(str, Enum):
+    IDENTITY_CONSISTENCY = "identity_consistency"  # identity switches and embedding similarity
+    DETECTION_ACCURACY = "detection_accuracy"  # redetection rate and incorrect redetections
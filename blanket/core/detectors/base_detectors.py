@@ -32,6 +32,17 @@ class BaseFaceDetector(ABC):
         """
         pass
 
+    def detect_batch(self, images_bgr: list[np.ndarray]) -> list[list[FaceDetection]]:
+        """
+        Detect faces in multiple images. Default implementation calls detect for each image, subclasses with native
+        batching support should override it.
+        Args:
+            images_bgr (list[np.ndarray]): Images in BGR format.
+        Returns:
+            list[list[FaceDetection]]: List of detected faces for each image.
+        """
+        return [self.detect(image_bgr) for image_bgr in images_bgr]
+
 
 class BaseFacialLandmarksDetector(ABC):
     def __init__(self, settings: FacialLandmarksDetectorSettings):
@@ -54,4 +65,33 @@ class BaseFacialLandmarksDetector(ABC):
         """
         pass
 
-    # TODO - add support for simultaneous detection of facial landmarks on multiple face detections
+    def detect_many(
+        self, image_bgr: np.ndarray, face_detections: list[FaceDetection]
+    ) -> list[FacialLandmarksDetection]:
+        """
+        Detect facial landmarks for all given faces in one image. Default implementation calls detect for each face,
+        subclasses with native batching support should override it.
+        Args:
+            image_bgr (np.ndarray): Image in BGR format.
+            face_detections (list[FaceDetection]): Detected face bounding boxes.
+        Returns:
+            list[FacialLandmarksDetection]: Detected facial landmarks for each face.
+        """
+        return [self.detect(image_bgr, face_detection) for face_detection in face_detections]
+
+    def detect_batch(
+        self, images_bgr: list[np.ndarray], face_detections_per_image: list[list[FaceDetection]]
+    ) -> list[list[FacialLandmarksDetection]]:
+        """
+        Detect facial landmarks for all given faces in multiple images. Default implementation calls detect_many for
+        each image.
+        Args:
+            images_bgr (list[np.ndarray]): Images in BGR format.
+            face_detections_per_image (list[list[FaceDetection]]): Detected face bounding boxes for each image.
+        Returns:
+            list[list[FacialLandmarksDetection]]: Detected facial landmarks for each face in each image.
+        """
+        return [
+            self.detect_many(image_bgr, face_detections)
+            for image_bgr, face_detections in zip(images_bgr, face_detections_per_image)
+        ]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+MEGABYTE = 1024**2
+
+
+def settings_content_hash(settings: Any) -> str:
+    """
+    Hash the resolved content of a settings dataclass (independent of the YAML formatting and file location).
+    Args:
+        settings: Settings dataclass instance.
+    Returns:
+        str: Hex digest of the settings content.
+    """
+    settings_content = json.dumps(asdict(settings), sort_keys=True, default=str)
+    return hashlib.blake2b(settings_content.encode(), digest_size=16).hexdigest()
+
+
+def estimate_detector_memory(settings: Any) -> int:
+    """
+    Estimate the memory held by a detector: 'estimated_memory_mb' from extra parameters if given, otherwise the size
+    of the model weights file on disk.
+    Args:
+        settings: Detector settings with model_path and extra_parameters.
+    Returns:
+        int: Estimated memory in bytes (0 if unknown).
+    """
+    estimated_memory_mb = settings.extra_parameters.get("estimated_memory_mb")
+    if estimated_memory_mb is not None:
+        return int(estimated_memory_mb * MEGABYTE)
+
+    model_path = Path(settings.model_path) if settings.model_path else None
+    if model_path is not None and model_path.is_file():
+        return model_path.stat().st_size
+    return 0
+
+
+class DetectorCache:
+    """
+    Process-wide LRU cache of detector instances keyed by (module, settings content hash), so that loaded model
+    weights are shared by all callers. With a memory budget, least recently used detectors are dropped once the
+    estimated memory of the cached detectors exceeds it.
+    """
+
+    def __init__(self, memory_budget_mb: Optional[float] = None):
+        self.memory_budget_mb = memory_budget_mb
+        self._entries: OrderedDict[tuple[Enum, str], tuple[Any, int]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get_or_create(self, module: Enum, settings: Any, create_detector: Callable[[Any], Any]) -> Any:
+        """
+        Return the cached detector for the module and settings, creating it on a miss.
+        Args:
+            module (Enum): Detector module.
+            settings: Resolved detector settings.
+            create_detector (Callable): Constructor called with the settings on a cache miss.
+        Returns:
+            Detector instance.
+        """
+        key = (module, settings_content_hash(settings))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+
+            detector = create_detector(settings)
+            self._entries[key] = (detector, estimate_detector_memory(settings))
+            self._enforce_memory_budget()
+            return detector
+
+    def release(self, module: Optional[Enum] = None) -> int:
+        """
+        Drop cached detectors so that their weights can be garbage collected once no caller holds them.
+        Args:
+            module (Optional[Enum]): Release only detectors of this module, all detectors if None.
+        Returns:
+            int: Number of released detectors.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if module is None or key[0] == module]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def set_memory_budget(self, memory_budget_mb: Optional[float]) -> None:
+        """
+        Set the memory budget (None disables it) and evict detectors exceeding it.
+        Args:
+            memory_budget_mb (Optional[float]): Budget in megabytes.
+        """
+        with self._lock:
+            self.memory_budget_mb = memory_budget_mb
+            self._enforce_memory_budget()
+
+    @property
+    def memory_usage(self) -> int:
+        """Estimated memory of all cached detectors in bytes."""
+        with self._lock:
+            return sum(memory for _, memory in self._entries.values())
+
+    def _enforce_memory_budget(self) -> None:
+        # the most recently used detector is always kept, even if it alone exceeds the budget
+        if self.memory_budget_mb is None:
+            return
+        while len(self._entries) > 1 and self.memory_usage > self.memory_budget_mb * MEGABYTE:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# shared by all DetectorFactory calls in the process
+detector_cache = DetectorCache()
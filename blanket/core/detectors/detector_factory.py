@@ -1,45 +1,103 @@
 from __future__ import annotations
 
+import importlib
+from functools import lru_cache
 from pathlib import Path
-from typing import Type, TypeVar
+from typing import Optional, TypeVar
 
 from blanket.constants.enums.detection_enums import FaceDetectorModule, FacialLandmarksDetectorModule
 from blanket.core.detectors.base_detectors import BaseFaceDetector, BaseFacialLandmarksDetector
-from blanket.core.detectors.face_detectors.yolo_detector import YOLOFaceDetector
+from blanket.core.detectors.detector_cache import detector_cache
+from blanket.core.startup_profiler import startup_profiler
 from blanket.settings.config_loader import create_settings_with_extras_from_config_file
 from blanket.settings.individual_modules_settings.face_detector_settings import FaceDetectorSettings
 from blanket.settings.individual_modules_settings.facial_landmarks_detector_settings import (
     FacialLandmarksDetectorSettings,
 )
-from blanket.core.detectors.facial_landmarks_detectors.spiga_detector import SPIGAFacialLandmarksDetector
 
+DetectorSettings = TypeVar("DetectorSettings", FaceDetectorSettings, FacialLandmarksDetectorSettings)
 
-face_detector_parameters_folder = Path("blanket/configs/detector_parameters/face_detector_parameters")
+repository_root = Path(__file__).parent.parent.parent.parent
+detector_parameters_folder = Path(__file__).parent.parent.parent / "configs" / "detector_parameters"
 
-face_detector_registry: dict[FaceDetectorModule, tuple[Type[BaseFaceDetector], Path]] = {
-    FaceDetectorModule.YOLO: (YOLOFaceDetector, Path("yolo_parameters.yaml")),
+face_detector_parameters_folder = detector_parameters_folder / "face_detector_parameters"
+
+# detector classes are given as "module:ClassName" and imported on first use, so that the frameworks of a detector
+# (torch, ultralytics, SPIGA) are imported only when the detector is actually created
+face_detector_registry: dict[FaceDetectorModule, tuple[str, Path]] = {
+    FaceDetectorModule.YOLO: (
+        "blanket.core.detectors.face_detectors.yolo_detector:YOLOFaceDetector",
+        Path("yolo_parameters.yaml"),
+    ),
+    # same weights and parameters, inference through ONNX Runtime (exported on first use)
+    FaceDetectorModule.YOLO_ONNX: (
+        "blanket.core.detectors.face_detectors.yolo_onnx_detector:YOLOONNXFaceDetector",
+        Path("yolo_parameters.yaml"),
+    ),
     # ... additional face detectors
 }
 
 
-facial_landmarks_detector_parameters_folder = Path(
-    "blanket/configs/detector_parameters/facial_landmarks_detector_parameters"
-)
+facial_landmarks_detector_parameters_folder = detector_parameters_folder / "facial_landmarks_detector_parameters"
 
-facial_landmarks_detector_registry: dict[
-    FacialLandmarksDetectorModule, tuple[Type[BaseFacialLandmarksDetector], Path]
-] = {
-    FacialLandmarksDetectorModule.SPIGA: (SPIGAFacialLandmarksDetector, Path("spiga_parameters.yaml")),
+facial_landmarks_detector_registry: dict[FacialLandmarksDetectorModule, tuple[str, Path]] = {
+    FacialLandmarksDetectorModule.SPIGA: (
+        "blanket.core.detectors.facial_landmarks_detectors.spiga_detector:SPIGAFacialLandmarksDetector",
+        Path("spiga_parameters.yaml"),
+    ),
 }
 
 
+@lru_cache(maxsize=None)
+def load_detector_class(class_path: str) -> type:
+    """
+    Import a detector class given as "module:ClassName".
+    Args:
+        class_path (str): Module path and class name separated by a colon.
+    Returns:
+        type: The detector class.
+    """
+    module_name, _, class_name = class_path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _create_detector(
+    module: FaceDetectorModule | FacialLandmarksDetectorModule,
+    detector_class: type,
+    detector_parameters: DetectorSettings,
+    use_cache: bool,
+) -> BaseFaceDetector | BaseFacialLandmarksDetector:
+    """Construct the detector (through the process-wide cache if use_cache), timed as a model load section."""
+    with startup_profiler.section(f"model load: {module.value}"):
+        if not use_cache:
+            return detector_class(detector_parameters)
+        return detector_cache.get_or_create(module, detector_parameters, detector_class)
+
+
+def _resolve_model_path(detector_parameters: DetectorSettings) -> DetectorSettings:
+    """
+    Resolve a relative model path against the repository root when it does not exist relative to the working
+    directory, so that detectors can be created from any working directory.
+    Args:
+        detector_parameters (DetectorSettings): Loaded detector settings.
+    Returns:
+        DetectorSettings: The same settings with a resolved model path.
+    """
+    model_path = Path(detector_parameters.model_path)
+    if detector_parameters.model_path and not model_path.is_absolute() and not model_path.exists():
+        detector_parameters.model_path = str(repository_root / model_path)
+    return detector_parameters
+
+
 class DetectorFactory:
     @staticmethod
-    def create_face_detector(module: FaceDetectorModule) -> BaseFaceDetector:
+    def create_face_detector(module: FaceDetectorModule, use_cache: bool = True) -> BaseFaceDetector:
         """
-        Create a face detector instance for the given module.
+        Create a face detector instance for the given module. Instances are shared process-wide per (module, config
+        content), so repeated calls don't reload the model weights.
         Args:
             module (FaceDetectorModule): Enum value for face detector type.
+            use_cache (bool): If False, always construct a new (uncached) detector.
         Returns:
             BaseFaceDetector: Instantiated face detector.
         Raises:
@@ -48,22 +106,29 @@ class DetectorFactory:
         module_registry_entry = face_detector_registry.get(module)
 
         if module_registry_entry is not None:
-            face_detector_class, parameters_filename = module_registry_entry
-            detector_parameters = create_settings_with_extras_from_config_file(
-                face_detector_parameters_folder / parameters_filename, FaceDetectorSettings
+            face_detector_class_path, parameters_filename = module_registry_entry
+            detector_parameters = _resolve_model_path(
+                create_settings_with_extras_from_config_file(
+                    face_detector_parameters_folder / parameters_filename, FaceDetectorSettings
+                )
             )
-            return face_detector_class(detector_parameters)
+            face_detector_class = load_detector_class(face_detector_class_path)
+            return _create_detector(module, face_detector_class, detector_parameters, use_cache)
         else:
             raise ValueError(
                 f"Unknown detector module: {module}. " f"Available modules: {list(face_detector_registry.keys())}"
             )
 
     @staticmethod
-    def create_facial_landmarks_detector(module: FacialLandmarksDetectorModule) -> BaseFacialLandmarksDetector:
+    def create_facial_landmarks_detector(
+        module: FacialLandmarksDetectorModule, use_cache: bool = True
+    ) -> BaseFacialLandmarksDetector:
         """
-        Create a facial landmarks detector instance for the given module.
+        Create a facial landmarks detector instance for the given module. Instances are shared process-wide per
+        (module, config content), so repeated calls don't reload the model weights.
         Args:
             module (FacialLandmarksDetectorModule): Enum value for facial landmarks detector type.
+            use_cache (bool): If False, always construct a new (uncached) detector.
         Returns:
             BaseFacialLandmarksDetector: Instantiated facial landmarks detector.
         Raises:
@@ -72,13 +137,36 @@ class DetectorFactory:
         module_registry_entry = facial_landmarks_detector_registry.get(module)
 
         if module_registry_entry is not None:
-            facial_landmarks_detector_class, parameters_filename = module_registry_entry
-            detector_parameters = create_settings_with_extras_from_config_file(
-                facial_landmarks_detector_parameters_folder / parameters_filename, FacialLandmarksDetectorSettings
+            facial_landmarks_detector_class_path, parameters_filename = module_registry_entry
+            detector_parameters = _resolve_model_path(
+                create_settings_with_extras_from_config_file(
+                    facial_landmarks_detector_parameters_folder / parameters_filename, FacialLandmarksDetectorSettings
+                )
             )
-            return facial_landmarks_detector_class(detector_parameters)
+            facial_landmarks_detector_class = load_detector_class(facial_landmarks_detector_class_path)
+            return _create_detector(module, facial_landmarks_detector_class, detector_parameters, use_cache)
         else:
             raise ValueError(
                 f"Unknown detector module: {module}. "
                 f"Available modules: {list(facial_landmarks_detector_registry.keys())}"
             )
+
+    @staticmethod
+    def release_detectors(module: Optional[FaceDetectorModule | FacialLandmarksDetectorModule] = None) -> int:
+        """
+        Release cached detectors (their weights are freed once no caller holds a reference).
+        Args:
+            module (Optional[FaceDetectorModule | FacialLandmarksDetectorModule]): Module to release, all if None.
+        Returns:
+            int: Number of released detectors.
+        """
+        return detector_cache.release(module)
+
+    @staticmethod
+    def set_memory_budget(memory_budget_mb: Optional[float]) -> None:
+        """
+        Limit the estimated memory of cached detectors, least recently used detectors are released first.
+        Args:
+            memory_budget_mb (Optional[float]): Budget in megabytes, None for no limit.
+        """
+        detector_cache.set_memory_budget(memory_budget_mb)
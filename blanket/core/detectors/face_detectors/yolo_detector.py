@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import numpy as np
+import torch
 import ultralytics
 
 from blanket.core.detectors.base_detectors import BaseFaceDetector
@@ -18,6 +19,7 @@ class YOLOFaceDetector(BaseFaceDetector):
         super().__init__(settings)
 
         self._detection_model = ultralytics.YOLO(settings.model_path)
+        self._batch_size = int(settings.extra_parameters.get("detection_batch_size", 16))
 
     def detect(self, image_bgr: np.ndarray) -> list[FaceDetection]:
         """
@@ -27,17 +29,50 @@ class YOLOFaceDetector(BaseFaceDetector):
         Returns:
             list[FaceDetection]: List of detected faces.
         """
-        pred = self._detection_model(
-            image_bgr,
-            conf=self.settings.minimum_confidence,
-            imgsz=self.settings.extra_parameters["detection_image_size"],
-            verbose=False,
-        )[0]
+        return self.detect_batch([image_bgr])[0]
 
-        xywhs = ultralytics.utils.ops.xyxy2ltwh(pred.boxes.xyxy)
-        confidences = pred.boxes.conf
+    def detect_batch(self, images_bgr: list[np.ndarray]) -> list[list[FaceDetection]]:
+        """
+        Detect faces in multiple images using batched YOLO inference (in chunks of detection_batch_size images).
+        Boxes and confidences of each chunk are moved to host memory in a single transfer.
+        Args:
+            images_bgr (list[np.ndarray]): Images in BGR format.
+        Returns:
+            list[list[FaceDetection]]: List of detected faces for each image.
+        """
+        detections: list[list[FaceDetection]] = []
+
+        for chunk_start in range(0, len(images_bgr), self._batch_size):
+            predictions = self._detection_model(
+                list(images_bgr[chunk_start : chunk_start + self._batch_size]),
+                conf=self.settings.minimum_confidence,
+                imgsz=self.settings.extra_parameters["detection_image_size"],
+                verbose=False,
+            )
+            detections.extend(self._predictions_to_detections(predictions))
+
+        return detections
+
+    @staticmethod
+    def _predictions_to_detections(predictions: list) -> list[list[FaceDetection]]:
+        """
+        Convert ultralytics results of one batch to FaceDetection lists.
+        Args:
+            predictions (list): Ultralytics Results, one per image.
+        Returns:
+            list[list[FaceDetection]]: List of detected faces for each image.
+        """
+        detection_counts = [len(prediction.boxes) for prediction in predictions]
+        if sum(detection_counts) == 0:
+            return [[] for _ in predictions]
+
+        # [left, top, right, bottom, confidence] of all boxes in the batch, one device -> host transfer
+        boxes = torch.cat(
+            [torch.cat([prediction.boxes.xyxy, prediction.boxes.conf[:, None]], dim=1) for prediction in predictions]
+        )
+        boxes = boxes.cpu().numpy()
 
         return [
-            FaceDetection.from_left_top_width_height(ltwh.cpu().numpy(), conf.cpu().item())
-            for ltwh, conf in zip(xywhs, confidences)
+            [FaceDetection(box[:4], float(box[4])) for box in image_boxes]
+            for image_boxes in np.split(boxes, np.cumsum(detection_counts)[:-1])
         ]
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from blanket.core.detectors.base_detectors import BaseFaceDetector
+from blanket.core.objects.detections import FaceDetection
+from blanket.settings.individual_modules_settings.face_detector_settings import FaceDetectorSettings
+
+LETTERBOX_PAD_VALUE = 114  # same padding color as ultralytics
+
+
+def export_yolo_to_onnx(model_path: Path, image_size: int) -> Path:
+    """
+    Export an ultralytics YOLO checkpoint to ONNX with dynamic batch and image size (requires ultralytics/torch).
+    Args:
+        model_path (Path): Path to the .pt checkpoint.
+        image_size (int): Detection image size used for tracing.
+    Returns:
+        Path: Path to the exported .onnx model (next to the checkpoint).
+    """
+    import ultralytics
+
+    return Path(ultralytics.YOLO(str(model_path)).export(format="onnx", imgsz=image_size, dynamic=True))
+
+
+def letterbox(image_bgr: np.ndarray, image_size: int) -> tuple[np.ndarray, float, np.ndarray]:
+    """
+    Resize an image keeping its aspect ratio and pad it to a square (ultralytics style letterbox).
+    Args:
+        image_bgr (np.ndarray): Image in BGR format.
+        image_size (int): Side of the square network input.
+    Returns:
+        tuple: (letterboxed image (image_size, image_size, 3), scale gain, [pad_left, pad_top])
+    """
+    height, width = image_bgr.shape[:2]
+    gain = min(image_size / height, image_size / width)
+    resized_width, resized_height = int(round(width * gain)), int(round(height * gain))
+
+    pad_left = (image_size - resized_width) // 2
+    pad_top = (image_size - resized_height) // 2
+
+    letterboxed = np.full((image_size, image_size, 3), LETTERBOX_PAD_VALUE, dtype=np.uint8)
+    letterboxed[pad_top : pad_top + resized_height, pad_left : pad_left + resized_width] = cv2.resize(
+        image_bgr, (resized_width, resized_height), interpolation=cv2.INTER_LINEAR
+    )
+
+    return letterboxed, gain, np.asarray([pad_left, pad_top], dtype=np.float32)
+
+
+def non_maximum_suppression(boxes_ltrb: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """
+    Greedy non-maximum suppression, each iteration suppresses all boxes overlapping the best one at once.
+    Args:
+        boxes_ltrb (np.ndarray): Boxes with shape (N, 4) in [left, top, right, bottom] format.
+        scores (np.ndarray): Scores with shape (N,).
+        iou_threshold (float): Boxes with IoU above this threshold are suppressed.
+    Returns:
+        np.ndarray: Indices of the kept boxes sorted by decreasing score.
+    """
+    areas = np.prod(np.maximum(0, boxes_ltrb[:, 2:] - boxes_ltrb[:, :2]), axis=1)
+    order = np.argsort(-scores)
+    keep = []
+
+    while len(order) > 0:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+
+        intersection_left_top = np.maximum(boxes_ltrb[best, :2], boxes_ltrb[rest, :2])
+        intersection_right_bottom = np.minimum(boxes_ltrb[best, 2:], boxes_ltrb[rest, 2:])
+        intersection_area = np.prod(np.maximum(0, intersection_right_bottom - intersection_left_top), axis=1)
+        union_area = areas[best] + areas[rest] - intersection_area
+        iou = np.divide(intersection_area, union_area, out=np.zeros_like(intersection_area), where=union_area > 0)
+
+        order = rest[iou <= iou_threshold]
+
+    return np.asarray(keep, dtype=np.int64)
+
+
+class YOLOONNXFaceDetector(BaseFaceDetector):
+    """YOLO face detector running an ONNX export of the model through the FaceFusion ONNX Runtime machinery."""
+
+    def __init__(self, settings: FaceDetectorSettings):
+        """
+        Initialize ONNX YOLO face detector with given settings. If the ONNX model does not exist yet, it is exported
+        from the ultralytics checkpoint at settings.model_path.
+        Args:
+            settings (FaceDetectorSettings): Settings for YOLO detector.
+        """
+        super().__init__(settings)
+
+        from facefusion.inference_manager import create_inference_session
+
+        self._image_size = int(settings.extra_parameters["detection_image_size"])
+        self._batch_size = int(settings.extra_parameters.get("detection_batch_size", 16))
+        self._nms_iou_threshold = float(settings.extra_parameters.get("nms_iou_threshold", 0.7))
+        self._max_detections = int(settings.extra_parameters.get("max_detections", 300))
+
+        onnx_model_path = settings.extra_parameters.get("onnx_model_path")
+        onnx_model_path = Path(onnx_model_path) if onnx_model_path else Path(settings.model_path).with_suffix(".onnx")
+        if not onnx_model_path.is_file():
+            onnx_model_path = export_yolo_to_onnx(Path(settings.model_path), self._image_size)
+
+        self._session = create_inference_session(
+            str(onnx_model_path),
+            settings.extra_parameters.get("execution_device_id", 0),
+            settings.extra_parameters.get("execution_providers", ["cpu"]),
+            # e.g. {"intra_op_thread_count": 2, "graph_optimization_level": "all"}, unset keys use FaceFusion's state
+            settings.extra_parameters.get("inference_session_options"),
+        )
+        self._input_name = self._session.get_inputs()[0].name
+        # exported with dynamic=True -> symbolic batch dimension, otherwise the model only accepts single images
+        self._supports_batching = not isinstance(self._session.get_inputs()[0].shape[0], int)
+
+    def detect(self, image_bgr: np.ndarray) -> list[FaceDetection]:
+        """
+        Detect faces in an image using the ONNX YOLO model.
+        Args:
+            image_bgr (np.ndarray): Image in BGR format.
+        Returns:
+            list[FaceDetection]: List of detected faces.
+        """
+        return self.detect_batch([image_bgr])[0]
+
+    def detect_batch(self, images_bgr: list[np.ndarray]) -> list[list[FaceDetection]]:
+        """
+        Detect faces in multiple images, letterboxed images are stacked into batches of detection_batch_size.
+        Args:
+            images_bgr (list[np.ndarray]): Images in BGR format.
+        Returns:
+            list[list[FaceDetection]]: List of detected faces for each image.
+        """
+        batch_size = self._batch_size if self._supports_batching else 1
+        detections: list[list[FaceDetection]] = []
+
+        for chunk_start in range(0, len(images_bgr), batch_size):
+            chunk = images_bgr[chunk_start : chunk_start + batch_size]
+            letterboxed_images, gains, pads = zip(*[letterbox(image_bgr, self._image_size) for image_bgr in chunk])
+
+            # BGR -> RGB, HWC -> CHW, [0, 255] -> [0, 1]
+            network_input = np.ascontiguousarray(np.stack(letterboxed_images)[..., ::-1].transpose(0, 3, 1, 2))
+            network_input = network_input.astype(np.float32) / 255.0
+
+            predictions = self._session.run(None, {self._input_name: network_input})[0]
+
+            for prediction, gain, pad, image_bgr in zip(predictions, gains, pads, chunk):
+                detections.append(self._decode_prediction(prediction, gain, pad, image_bgr.shape))
+
+        return detections
+
+    def _decode_prediction(
+        self, prediction: np.ndarray, gain: float, pad: np.ndarray, image_shape: tuple[int, ...]
+    ) -> list[FaceDetection]:
+        """
+        Decode raw YOLO output of one image (4 box values + class scores for each anchor), filter it by confidence,
+        apply NMS and map the boxes back to the original image coordinates.
+        Args:
+            prediction (np.ndarray): Raw output with shape (4 + num_classes, num_anchors).
+            gain (float): Letterbox scale gain.
+            pad (np.ndarray): Letterbox [pad_left, pad_top].
+            image_shape (tuple): Shape of the original image.
+        Returns:
+            list[FaceDetection]: List of detected faces.
+        """
+        prediction = prediction.T
+        scores = prediction[:, 4:].max(axis=1)
+        candidates = scores > self.settings.minimum_confidence
+        if not np.any(candidates):
+            return []
+
+        center_xy, width_height = prediction[candidates, :2], prediction[candidates, 2:4]
+        scores = scores[candidates]
+        boxes_ltrb = np.concatenate([center_xy - width_height / 2, center_xy + width_height / 2], axis=1)
+
+        keep = non_maximum_suppression(boxes_ltrb, scores, self._nms_iou_threshold)[: self._max_detections]
+        boxes_ltrb, scores = boxes_ltrb[keep], scores[keep]
+
+        boxes_ltrb = (boxes_ltrb - np.tile(pad, 2)) / gain
+        boxes_ltrb = np.clip(boxes_ltrb, 0, np.asarray([image_shape[1], image_shape[0]] * 2))
+
+        return [FaceDetection(box, float(score)) for box, score in zip(boxes_ltrb, scores)]
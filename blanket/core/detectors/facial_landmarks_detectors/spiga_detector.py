@@ -4,7 +4,7 @@ import cv2
 import numpy as np
 
 from blanket.core.detectors.base_detectors import BaseFacialLandmarksDetector
-from blanket.core.geometry import SO3
+from blanket.core.geometry import SO3, SO3Batch
 from blanket.core.objects.detections import FaceDetection, FacialLandmarksDetection
 from blanket.settings.individual_modules_settings.facial_landmarks_detector_settings import (
     FacialLandmarksDetectorSettings,
@@ -46,13 +46,86 @@ class SPIGAFacialLandmarksDetector(BaseFacialLandmarksDetector):
         Returns:
             FacialLandmarksDetection: Detected facial landmarks.
         """
-        features = self._processor.inference(image_bgr, [face_detection.left_top_width_height])
-        landmarks = np.array(features["landmarks"][0])
-        headpose_ea_deg = np.array(features["headpose"][0])[:3]
-        orientation_ea_deg = np.array([-(headpose_ea_deg[1]), headpose_ea_deg[0], -(headpose_ea_deg[2])])
-        orientation_ea_rad = orientation_ea_deg / 180 * np.pi
-        orientation_so3 = SO3.from_euler_angles(orientation_ea_rad, "yzx")
+        return self.detect_many(image_bgr, [face_detection])[0]
+
+    def detect_many(
+        self, image_bgr: np.ndarray, face_detections: list[FaceDetection]
+    ) -> list[FacialLandmarksDetection]:
+        """
+        Detect facial landmarks for all given faces in one image with a single SPIGA forward pass.
+        Args:
+            image_bgr (np.ndarray): Image in BGR format.
+            face_detections (list[FaceDetection]): Detected face bounding boxes.
+        Returns:
+            list[FacialLandmarksDetection]: Detected facial landmarks for each face.
+        """
+        return self.detect_batch([image_bgr], [face_detections])[0]
+
+    def detect_batch(
+        self, images_bgr: list[np.ndarray], face_detections_per_image: list[list[FaceDetection]]
+    ) -> list[list[FacialLandmarksDetection]]:
+        """
+        Detect facial landmarks for all faces in multiple images. Face crops of all images are stacked into one batch
+        and processed by a single SPIGA forward pass.
+        Args:
+            images_bgr (list[np.ndarray]): Images in BGR format.
+            face_detections_per_image (list[list[FaceDetection]]): Detected face bounding boxes for each image.
+        Returns:
+            list[list[FacialLandmarksDetection]]: Detected facial landmarks for each face in each image.
+        """
+        import torch
+
+        crop_images, crop_bboxes, bboxes = [], [], []
+        detection_counts = [len(face_detections) for face_detections in face_detections_per_image]
+
+        for image_bgr, face_detections in zip(images_bgr, face_detections_per_image):
+            for face_detection in face_detections:
+                bbox = face_detection.left_top_width_height
+                # SPIGA's own pretreat deep-copies the whole frame for each face, the transforms don't modify it
+                sample_crop = self._processor.transforms({"image": image_bgr, "bbox": bbox.copy()})
+                crop_images.append(sample_crop["image"])
+                crop_bboxes.append(sample_crop["bbox"])
+                bboxes.append(bbox)
+
+        if len(bboxes) == 0:
+            return [[] for _ in face_detections_per_image]
+
+        batch_images = self._processor._data2device(torch.tensor(np.array(crop_images), dtype=torch.float))
+        batch_model3d = self._processor.model3d.unsqueeze(0).repeat(len(bboxes), 1, 1)
+        batch_cam_matrix = self._processor.cam_matrix.unsqueeze(0).repeat(len(bboxes), 1, 1)
+
+        with torch.no_grad():
+            outputs = self._processor.net_forward([batch_images, batch_model3d, batch_cam_matrix])
+        features = self._processor.postreatment(outputs, crop_bboxes, bboxes)
+
+        landmarks = np.asarray(features["landmarks"]).astype(int)
+        orientations = self._headposes_to_orientations(np.asarray(features["headpose"])[:, :3])
+
+        landmarks_detections = [
+            FacialLandmarksDetection(face_landmarks, orientation=orientation)
+            for face_landmarks, orientation in zip(landmarks, orientations)
+        ]
+        split_ends = np.cumsum(detection_counts)
+
+        return [
+            landmarks_detections[split_end - detection_count : split_end]
+            for split_end, detection_count in zip(split_ends, detection_counts)
+        ]
+
+    @staticmethod
+    def _headposes_to_orientations(headposes_ea_deg: np.ndarray) -> list[SO3]:
+        """
+        Convert SPIGA head-pose Euler angles (degrees) of multiple faces to SO3 orientations.
+        Args:
+            headposes_ea_deg (np.ndarray): Euler angles with shape (N, 3).
+        Returns:
+            list[SO3]: Orientation of each face.
+        """
+        orientations_ea_deg = np.stack(
+            [-headposes_ea_deg[:, 1], headposes_ea_deg[:, 0], -headposes_ea_deg[:, 2]], axis=1
+        )
+        orientations_ea_rad = orientations_ea_deg / 180 * np.pi
         # order based on https://euclideanspace.com/maths/geometry/rotations/conversions/eulerToMatrix/index.htm
         # which is used in the original SPIGA function (maybe could use that one instead)
-
-        return FacialLandmarksDetection(landmarks.astype(int), orientation=orientation_so3)
+        # one vectorized conversion, the SO3 objects are views into the batch matrices
+        return SO3Batch.from_euler_angles(orientations_ea_rad, "yzx").to_so3s()
@@ -341,3 +341,403 @@ class SO3:
             str: Representation string.
         """
         return f"SO3(rot={self.rot}"
+
+
+def axis_rotation_matrices(angles: np.ndarray, axis_index: int) -> np.ndarray:
+    """
+    Compute rotation matrices around one coordinate axis for multiple angles.
+
+    Args:
+        angles (np.ndarray): Rotation angles in radians with shape (N,).
+        axis_index (int): Axis index (0=x, 1=y, 2=z).
+    Returns:
+        np.ndarray: Rotation matrices with shape (N, 3, 3).
+    """
+
+    angles = np.asarray(angles, dtype=np.float64)
+    cos, sin = np.cos(angles), np.sin(angles)
+    first, second = [index for index in range(3) if index != axis_index]
+
+    rot = np.zeros((len(angles), 3, 3))
+    rot[:, axis_index, axis_index] = 1
+    rot[:, first, first] = cos
+    rot[:, second, second] = cos
+    # right-handed rotation: for the y-axis the (z, x) plane is used, so the sign of sin flips
+    sign = -1 if axis_index == 1 else 1
+    rot[:, first, second] = -sign * sin
+    rot[:, second, first] = sign * sin
+
+    return rot
+
+
+def euler_angles_to_matrices(angles: np.ndarray, seq: list[str] | str) -> np.ndarray:
+    """
+    Compute rotation matrices from multiple sets of Euler angles (same convention as SO3.from_euler_angles).
+
+    Args:
+        angles (np.ndarray): Array of angles with shape (N, len(seq)).
+        seq (list[str] | str): Sequence of axes (e.g. 'xyz').
+    Returns:
+        np.ndarray: Rotation matrices with shape (N, 3, 3).
+    """
+
+    angles = np.asarray(angles, dtype=np.float64)
+    assert angles.ndim == 2 and angles.shape[1] == len(seq)
+
+    axes = "xyz"
+    rot = np.broadcast_to(np.eye(3), (len(angles), 3, 3))
+
+    for angle_index, axis in enumerate(seq):
+        if axis not in axes:
+            raise ValueError(f'Unknown axis "{axis}" in seq:"{seq}" (accepting only x, y, z)')
+        rot = rot @ axis_rotation_matrices(angles[:, angle_index], axes.index(axis))
+
+    return rot
+
+
+class SO3Batch:
+    """
+    This class represents N SO3 rotations internally represented by an (N, 3, 3) array of rotation matrices. All
+    operations are vectorized, which makes it suitable for head-pose time series of whole videos.
+    """
+
+    def __init__(self, rotation_matrices: np.ndarray | None = None) -> None:
+        """
+        Initialize SO3Batch rotation object.
+
+        Args:
+            rotation_matrices (np.ndarray | None): (N, 3, 3) rotation matrices. If None, initializes as empty batch.
+        """
+
+        self.rot: np.ndarray = np.asarray(rotation_matrices) if rotation_matrices is not None else np.zeros((0, 3, 3))
+        assert self.rot.ndim == 3 and self.rot.shape[1:] == (3, 3)
+
+    @staticmethod
+    def identity(size: int) -> SO3Batch:
+        """
+        Create a batch of identity rotations.
+
+        Args:
+            size (int): Number of rotations.
+        Returns:
+            SO3Batch: Rotation batch.
+        """
+
+        return SO3Batch(np.tile(np.eye(3), (size, 1, 1)))
+
+    @staticmethod
+    def from_so3s(rotations: list[SO3]) -> SO3Batch:
+        """
+        Stack single rotations into a batch.
+
+        Args:
+            rotations (list[SO3]): Rotation objects.
+        Returns:
+            SO3Batch: Rotation batch.
+        """
+
+        return SO3Batch(np.stack([rotation.rot for rotation in rotations])) if rotations else SO3Batch()
+
+    def to_so3s(self) -> list[SO3]:
+        """
+        Split the batch into single rotations (their matrices are views into the batch).
+
+        Returns:
+            list[SO3]: Rotation objects.
+        """
+
+        return [SO3(rot) for rot in self.rot]
+
+    def __len__(self) -> int:
+        return len(self.rot)
+
+    def __getitem__(self, index: int | slice | np.ndarray) -> SO3 | SO3Batch:
+        """
+        Get a single rotation (integer index) or a sub-batch (slice, index or boolean array).
+
+        Args:
+            index (int | slice | np.ndarray): Index.
+        Returns:
+            SO3 | SO3Batch: Selected rotation(s).
+        """
+
+        if isinstance(index, (int, np.integer)):
+            return SO3(self.rot[index])
+        return SO3Batch(self.rot[index])
+
+    @staticmethod
+    def exp(rot_vectors: np.ndarray) -> SO3Batch:
+        """
+        Compute rotations from rotation vectors (vectorized exponential map).
+
+        Args:
+            rot_vectors (np.ndarray): Rotation vectors with shape (N, 3).
+        Returns:
+            SO3Batch: Rotation batch.
+        """
+
+        v = np.asarray(rot_vectors, dtype=np.float64)
+        assert v.ndim == 2 and v.shape[1] == 3
+
+        angles = np.linalg.norm(v, axis=1)
+        # sin(angle / 2) / angle, well-defined (-> 1/2) for zero angles
+        vector_scale = 0.5 * np.sinc(angles / (2 * np.pi))
+        quaternions = np.concatenate([v * vector_scale[:, None], np.cos(angles / 2)[:, None]], axis=1)
+        return SO3Batch.from_quaternions(quaternions)
+
+    def log(self) -> np.ndarray:
+        """
+        Compute rotation vectors of the rotations (vectorized logarithmic map).
+
+        Returns:
+            np.ndarray: Rotation vectors with shape (N, 3).
+        """
+
+        quaternions = self.to_quaternions()
+        vector_norms = np.linalg.norm(quaternions[:, :3], axis=1)
+        angles = 2 * np.arctan2(vector_norms, quaternions[:, 3])
+        # angle / sin(angle / 2) -> 2 for zero angles (w >= 0, so w is close to 1 there)
+        scale = np.where(vector_norms > 1e-12, angles / np.maximum(vector_norms, 1e-12), 2 / quaternions[:, 3])
+        return quaternions[:, :3] * scale[:, None]
+
+    def __mul__(self, other: SO3Batch | SO3) -> SO3Batch:
+        """
+        Compose rotations element-wise (a single rotation or a batch of size 1 is broadcast).
+
+        Args:
+            other (SO3Batch | SO3): Other rotation(s).
+        Returns:
+            SO3Batch: Composed rotations.
+        """
+
+        return SO3Batch(self.rot @ other.rot)
+
+    def inverse(self) -> SO3Batch:
+        """
+        Return inverse of the rotations.
+
+        Returns:
+            SO3Batch: Inverse rotations.
+        """
+
+        return SO3Batch(np.transpose(self.rot, (0, 2, 1)))
+
+    def act(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Rotate vectors, either one vector by all rotations or one vector per rotation.
+
+        Args:
+            vectors (np.ndarray): Vector (3,) or vectors (N, 3).
+        Returns:
+            np.ndarray: Rotated vectors with shape (N, 3).
+        """
+
+        v = np.asarray(vectors)
+        assert v.shape[-1] == 3
+        return np.einsum("nij,nj->ni", self.rot, np.broadcast_to(v, (len(self), 3)))
+
+    def geodesic_distance(self, other: SO3Batch | SO3) -> np.ndarray:
+        """
+        Compute angles of the relative rotations between this and other rotations (element-wise).
+
+        Args:
+            other (SO3Batch | SO3): Other rotation(s).
+        Returns:
+            np.ndarray: Angles in radians with shape (N,), in range [0, pi].
+        """
+
+        return np.linalg.norm((self.inverse() * other).log(), axis=1)
+
+    @staticmethod
+    def from_quaternions(quaternions: np.ndarray) -> SO3Batch:
+        """
+        Compute rotations from quaternions in a form [qx, qy, qz, qw] (normalized on the way).
+
+        Args:
+            quaternions (np.ndarray): Quaternions with shape (N, 4).
+        Returns:
+            SO3Batch: Rotation batch.
+        """
+
+        q = np.asarray(quaternions, dtype=np.float64)
+        assert q.ndim == 2 and q.shape[1] == 4
+        x, y, z, w = (q / np.linalg.norm(q, axis=1, keepdims=True)).T
+
+        rot = np.empty((len(q), 3, 3))
+        rot[:, 0, 0] = 1 - 2 * (y * y + z * z)
+        rot[:, 0, 1] = 2 * (x * y - z * w)
+        rot[:, 0, 2] = 2 * (x * z + y * w)
+        rot[:, 1, 0] = 2 * (x * y + z * w)
+        rot[:, 1, 1] = 1 - 2 * (x * x + z * z)
+        rot[:, 1, 2] = 2 * (y * z - x * w)
+        rot[:, 2, 0] = 2 * (x * z - y * w)
+        rot[:, 2, 1] = 2 * (y * z + x * w)
+        rot[:, 2, 2] = 1 - 2 * (x * x + y * y)
+        return SO3Batch(rot)
+
+    def to_quaternions(self) -> np.ndarray:
+        """
+        Compute quaternions [qx, qy, qz, qw] of the rotations with qw >= 0 (same convention as SO3.to_quaternion).
+
+        Returns:
+            np.ndarray: Quaternions with shape (N, 4).
+        """
+
+        rot = self.rot
+        diagonal = np.stack([rot[:, 0, 0], rot[:, 1, 1], rot[:, 2, 2]], axis=1)
+        trace = diagonal.sum(axis=1)
+        # the largest of (w, x, y, z) is computed from the diagonal, the others from off-diagonal elements
+        # (numerically stable for all angles)
+        case = np.argmax(np.concatenate([trace[:, None], diagonal], axis=1), axis=1)
+        quaternions = np.empty((len(rot), 4))
+
+        w_case = case == 0
+        s = 2 * np.sqrt(np.maximum(1 + trace[w_case], 1e-12))
+        r = rot[w_case]
+        quaternions[w_case] = np.stack(
+            [(r[:, 2, 1] - r[:, 1, 2]) / s, (r[:, 0, 2] - r[:, 2, 0]) / s, (r[:, 1, 0] - r[:, 0, 1]) / s, s / 4],
+            axis=1,
+        )
+
+        for axis_index in range(3):
+            axis_case = case == axis_index + 1
+            first, second = [index for index in range(3) if index != axis_index]
+            r = rot[axis_case]
+            s = 2 * np.sqrt(
+                np.maximum(1 + r[:, axis_index, axis_index] - r[:, first, first] - r[:, second, second], 1e-12)
+            )
+            axis_quaternions = np.empty((len(r), 4))
+            axis_quaternions[:, axis_index] = s / 4
+            axis_quaternions[:, first] = (r[:, first, axis_index] + r[:, axis_index, first]) / s
+            axis_quaternions[:, second] = (r[:, second, axis_index] + r[:, axis_index, second]) / s
+            axis_quaternions[:, 3] = (r[:, second, first] - r[:, first, second]) / s
+            # (second, first) is a cyclic successor of the axis only for the y-axis, flip the sign there
+            if axis_index == 1:
+                axis_quaternions[:, 3] *= -1
+            quaternions[axis_case] = axis_quaternions
+
+        quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+        return np.where(quaternions[:, 3:] < 0, -quaternions, quaternions)
+
+    @staticmethod
+    def from_euler_angles(angles: np.ndarray, seq: list[str] | str) -> SO3Batch:
+        """
+        Compute rotations from multiple sets of Euler angles (same convention as SO3.from_euler_angles).
+
+        Args:
+            angles (np.ndarray): Array of angles with shape (N, len(seq)).
+            seq (list[str] | str): Sequence of axes (e.g. 'xyz').
+        Returns:
+            SO3Batch: Rotation batch.
+        """
+
+        return SO3Batch(euler_angles_to_matrices(angles, seq))
+
+    def to_euler_angles_zyx(self) -> np.ndarray:
+        """
+        Compute Euler angles (ZYX convention) of the rotations (same convention as SO3.to_euler_angles_zyx).
+
+        Returns:
+            np.ndarray: Euler angles [z, y, x] with shape (N, 3).
+        """
+
+        rot = np.real(self.rot)
+        gimbal_lock = (rot[:, 0, 0] == 0) & (rot[:, 1, 0] == 0)
+
+        x_rot = np.where(gimbal_lock, np.arctan2(rot[:, 0, 1], rot[:, 1, 1]), np.arctan2(rot[:, 2, 1], rot[:, 2, 2]))
+        y_rot = np.where(
+            gimbal_lock, np.pi / 2, np.arctan2(-rot[:, 2, 0], np.sqrt(rot[:, 0, 0] ** 2 + rot[:, 1, 0] ** 2))
+        )
+        z_rot = np.where(gimbal_lock, 0, np.arctan2(rot[:, 1, 0], rot[:, 0, 0]))
+
+        return np.stack([z_rot, y_rot, x_rot], axis=1)
+
+    @property
+    def x_axes(self) -> np.ndarray:
+        return self.rot[:, :, 0]
+
+    @property
+    def y_axes(self) -> np.ndarray:
+        return self.rot[:, :, 1]
+
+    @property
+    def z_axes(self) -> np.ndarray:
+        return self.rot[:, :, 2]
+
+    def slerp(self, other: SO3Batch | SO3, fractions: float | np.ndarray) -> SO3Batch:
+        """
+        Spherical linear interpolation between this and other rotations (element-wise).
+
+        Args:
+            other (SO3Batch | SO3): Target rotation(s).
+            fractions (float | np.ndarray): Interpolation fraction (scalar or (N,)), 0 gives self and 1 gives other.
+        Returns:
+            SO3Batch: Interpolated rotations.
+        """
+
+        relative_rot_vectors = (self.inverse() * other).log()
+        fractions = np.broadcast_to(np.asarray(fractions, dtype=np.float64), (len(relative_rot_vectors),))
+        return self * SO3Batch.exp(relative_rot_vectors * fractions[:, None])
+
+    def interpolate_track(self, times: np.ndarray, query_times: np.ndarray) -> SO3Batch:
+        """
+        Interpolate a rotation track (e.g. head-pose of one face over video frames) at other times with slerp between
+        the neighbouring samples, which fills gaps of missing detections. Query times outside the track are clamped
+        to the first/last rotation.
+
+        Args:
+            times (np.ndarray): Increasing times (e.g. frame indices) of the rotations with shape (N,).
+            query_times (np.ndarray): Times to interpolate at with shape (M,).
+        Returns:
+            SO3Batch: Interpolated rotations with shape (M, 3, 3).
+        """
+
+        times = np.asarray(times, dtype=np.float64)
+        query_times = np.asarray(query_times, dtype=np.float64)
+        assert times.shape == (len(self),) and len(self) > 0
+
+        if len(self) == 1:
+            return SO3Batch(np.broadcast_to(self.rot, (len(query_times), 3, 3)).copy())
+
+        query_times = np.clip(query_times, times[0], times[-1])
+        next_indices = np.clip(np.searchsorted(times, query_times, side="right"), 1, len(times) - 1)
+        previous_indices = next_indices - 1
+        fractions = (query_times - times[previous_indices]) / (times[next_indices] - times[previous_indices])
+
+        return self[previous_indices].slerp(self[next_indices], fractions)
+
+    def smoothed(self, sigma: float) -> SO3Batch:
+        """
+        Smooth a rotation track with a Gaussian window (normalized weighted average of sign-aligned quaternions,
+        a close approximation of the rotation mean for nearby rotations).
+
+        Args:
+            sigma (float): Standard deviation of the Gaussian window in samples.
+        Returns:
+            SO3Batch: Smoothed rotations.
+        """
+
+        if sigma <= 0 or len(self) < 2:
+            return SO3Batch(self.rot.copy())
+
+        quaternions = self.to_quaternions()
+        # q and -q are the same rotation, make the track continuous so that neighbours are averaged correctly
+        neighbour_signs = np.sign(np.sum(quaternions[1:] * quaternions[:-1], axis=1))
+        neighbour_signs[neighbour_signs == 0] = 1
+        quaternions *= np.concatenate([[1.0], np.cumprod(neighbour_signs)])[:, None]
+
+        radius = int(np.ceil(3 * sigma))
+        offsets = np.arange(-radius, radius + 1)
+        window = np.exp(-0.5 * (offsets / sigma) ** 2)
+        padded = np.pad(quaternions, ((radius, radius), (0, 0)), mode="edge")
+        smoothed = np.stack([np.convolve(padded[:, component], window, mode="valid") for component in range(4)], axis=1)
+
+        return SO3Batch.from_quaternions(smoothed)
+
+    def __repr__(self):
+        """
+        String representation of SO3Batch object.
+        Returns:
+            str: Representation string.
+        """
+        return f"SO3Batch(size={len(self)})"
@@ -0,0 +1,351 @@
+"""Columnar (structure-of-arrays) storage of face detections of whole videos."""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from blanket.core.geometry import SO3Batch
+from blanket.core.objects.detections import FaceDetection, FacialLandmarksDetection
+
+NO_TRACK_ID = -1
+
+
+def pairwise_intersection_over_union(first_ltrb: np.ndarray, second_ltrb: np.ndarray) -> np.ndarray:
+    """
+    Compute Intersection over Union (IoU) of all pairs of bounding boxes.
+    Args:
+        first_ltrb (np.ndarray): Boxes (N, 4) in [left, top, right, bottom] format
+        second_ltrb (np.ndarray): Boxes (M, 4) in [left, top, right, bottom] format
+    Returns:
+        np.ndarray: IoU values (N, M)
+    """
+    first_ltrb = np.asarray(first_ltrb, dtype=np.float64).reshape(-1, 4)
+    second_ltrb = np.asarray(second_ltrb, dtype=np.float64).reshape(-1, 4)
+
+    intersection_left_top = np.maximum(first_ltrb[:, None, :2], second_ltrb[None, :, :2])
+    intersection_right_bottom = np.minimum(first_ltrb[:, None, 2:], second_ltrb[None, :, 2:])
+    intersection_area = np.prod(np.maximum(0, intersection_right_bottom - intersection_left_top), axis=2)
+
+    first_area = np.prod(first_ltrb[:, 2:] - first_ltrb[:, :2], axis=1)
+    second_area = np.prod(second_ltrb[:, 2:] - second_ltrb[:, :2], axis=1)
+    union_area = first_area[:, None] + second_area[None, :] - intersection_area
+
+    return np.divide(intersection_area, union_area, out=np.zeros_like(intersection_area), where=union_area > 0)
+
+
+@dataclass
+class DetectionTable:
+    """
+    Face detections of many frames stored as contiguous column arrays (one row per detection) instead of one
+    FaceDetection object per face. Rows are sorted by frame index so that the detections of one frame are a
+    contiguous slice. Missing values are NaN (confidence, landmarks, orientation) or NO_TRACK_ID (track id).
+    """
+
+    frame_indices: np.ndarray  # (N,) int64
+    track_ids: np.ndarray  # (N,) int64
+    left_top_right_bottom: np.ndarray  # (N, 4) int32
+    confidences: np.ndarray  # (N,) float32
+    landmarks: Optional[np.ndarray] = None  # (N, num_landmarks, 2) float32
+    orientation_quaternions: Optional[np.ndarray] = None  # (N, 4) float64, [qx, qy, qz, qw]
+
+    @staticmethod
+    def empty(num_landmarks: Optional[int] = None, with_orientations: bool = False) -> DetectionTable:
+        """
+        Create a table without rows.
+        Args:
+            num_landmarks (Optional[int]): Number of landmarks per face, None for a table without landmarks
+            with_orientations (bool): If True, the table has the orientation column
+        Returns:
+            DetectionTable: Empty table
+        """
+        return DetectionTable(
+            np.zeros(0, dtype=np.int64),
+            np.zeros(0, dtype=np.int64),
+            np.zeros((0, 4), dtype=np.int32),
+            np.zeros(0, dtype=np.float32),
+            np.zeros((0, num_landmarks, 2), dtype=np.float32) if num_landmarks is not None else None,
+            np.zeros((0, 4), dtype=np.float64) if with_orientations else None,
+        )
+
+    @staticmethod
+    def from_detections(
+        detections_per_frame: list[list[FaceDetection]],
+        frame_indices: Optional[list[int]] = None,
+        track_ids_per_frame: Optional[list[list[int]]] = None,
+    ) -> DetectionTable:
+        """
+        Create table from per-frame lists of detections (as returned by detect_batch).
+        Args:
+            detections_per_frame (list[list[FaceDetection]]): Detections of each frame
+            frame_indices (Optional[list[int]]): Frame index of each list, positions in the list if None
+            track_ids_per_frame (Optional[list[list[int]]]): Track id of each detection
+        Returns:
+            DetectionTable: Table with one row per detection
+        """
+        if frame_indices is None:
+            frame_indices = range(len(detections_per_frame))
+
+        detections = [detection for frame_detections in detections_per_frame for detection in frame_detections]
+        counts = [len(frame_detections) for frame_detections in detections_per_frame]
+        num_rows = len(detections)
+
+        landmarks_detections = [detection.landmarks for detection in detections if detection.landmarks is not None]
+        num_landmarks = len(landmarks_detections[0].landmarks) if landmarks_detections else None
+        with_orientations = any(landmarks.orientation is not None for landmarks in landmarks_detections)
+        table = DetectionTable(
+            np.repeat(np.asarray(frame_indices, dtype=np.int64), counts),
+            np.full(num_rows, NO_TRACK_ID, dtype=np.int64),
+            np.asarray([detection.left_top_right_bottom for detection in detections], dtype=np.int32).reshape(-1, 4),
+            np.asarray(
+                [np.nan if detection.confidence is None else detection.confidence for detection in detections],
+                dtype=np.float32,
+            ),
+            np.full((num_rows, num_landmarks, 2), np.nan, dtype=np.float32) if num_landmarks is not None else None,
+            np.full((num_rows, 4), np.nan, dtype=np.float64) if with_orientations else None,
+        )
+
+        if track_ids_per_frame is not None:
+            table.track_ids[:] = [track_id for frame_track_ids in track_ids_per_frame for track_id in frame_track_ids]
+
+        if num_landmarks is not None:
+            rows = [row for row, detection in enumerate(detections) if detection.landmarks is not None]
+            table.landmarks[rows] = np.stack([landmarks.landmarks for landmarks in landmarks_detections])
+
+        if with_orientations:
+            rows, rotation_matrices = [], []
+            for row, detection in enumerate(detections):
+                if detection.landmarks is not None and detection.landmarks.orientation is not None:
+                    rows.append(row)
+                    rotation_matrices.append(detection.landmarks.orientation.rot)
+            table.orientation_quaternions[rows] = SO3Batch(np.stack(rotation_matrices)).to_quaternions()
+
+        return table.sorted_by_frame()
+
+    @staticmethod
+    def concatenate(tables: list[DetectionTable]) -> DetectionTable:
+        """
+        Concatenate tables (e.g. per-chunk tables of a video) into one table sorted by frame index.
+        Args:
+            tables (list[DetectionTable]): Tables with the same optional columns
+        Returns:
+            DetectionTable: Concatenated table
+        """
+        if len(tables) == 0:
+            return DetectionTable.empty()
+
+        columns = {}
+        for column in fields(DetectionTable):
+            values = [getattr(table, column.name) for table in tables]
+            if any(value is None for value in values):
+                if not all(value is None for value in values):
+                    raise ValueError(f"Column {column.name} is missing in some of the concatenated tables")
+                columns[column.name] = None
+            else:
+                columns[column.name] = np.concatenate(values)
+
+        return DetectionTable(**columns).sorted_by_frame()
+
+    def __len__(self) -> int:
+        return len(self.frame_indices)
+
+    def select(self, rows: Union[slice, np.ndarray]) -> DetectionTable:
+        """
+        Select rows of the table (a slice gives views of the columns, index/boolean arrays give copies).
+        Args:
+            rows (Union[slice, np.ndarray]): Slice, indices or boolean mask of the rows
+        Returns:
+            DetectionTable: Table with the selected rows
+        """
+        return DetectionTable(
+            **{
+                column.name: None if getattr(self, column.name) is None else getattr(self, column.name)[rows]
+                for column in fields(DetectionTable)
+            }
+        )
+
+    def sorted_by_frame(self) -> DetectionTable:
+        """
+        Get the table with rows sorted by frame index (stable, so the order within a frame is kept).
+        Returns:
+            DetectionTable: Sorted table (self if already sorted)
+        """
+        if np.all(self.frame_indices[1:] >= self.frame_indices[:-1]):
+            return self
+        return self.select(np.argsort(self.frame_indices, kind="stable"))
+
+    def frame_rows(self, frame_index: int) -> slice:
+        """
+        Get rows of the detections of one frame (binary search, the table is sorted by frame index).
+        Args:
+            frame_index (int): Frame index
+        Returns:
+            slice: Row slice (empty if the frame has no detections)
+        """
+        start = int(np.searchsorted(self.frame_indices, frame_index, side="left"))
+        end = int(np.searchsorted(self.frame_indices, frame_index, side="right"))
+        return slice(start, end)
+
+    def frame(self, frame_index: int) -> DetectionTable:
+        """
+        Get detections of one frame as a table of views.
+        Args:
+            frame_index (int): Frame index
+        Returns:
+            DetectionTable: Detections of the frame
+        """
+        return self.select(self.frame_rows(frame_index))
+
+    def track(self, track_id: int) -> DetectionTable:
+        """
+        Get detections of one track sorted by frame index.
+        Args:
+            track_id (int): Track id
+        Returns:
+            DetectionTable: Detections of the track
+        """
+        return self.select(np.flatnonzero(self.track_ids == track_id))
+
+    @property
+    def unique_frame_indices(self) -> np.ndarray:
+        """Get indices of the frames with at least one detection."""
+        return np.unique(self.frame_indices)
+
+    @property
+    def left_top_width_height(self) -> np.ndarray:
+        """
+        Get bounding boxes in left, top, width, height format.
+        Returns:
+            np.ndarray: (N, 4) [left, top, width, height]
+        """
+        return np.concatenate([self.left_top_right_bottom[:, :2], self.widths_heights], axis=1)
+
+    @property
+    def widths_heights(self) -> np.ndarray:
+        """Get widths and heights (N, 2) of the bounding boxes."""
+        return self.left_top_right_bottom[:, 2:] - self.left_top_right_bottom[:, :2]
+
+    @property
+    def areas(self) -> np.ndarray:
+        """Get areas (N,) of the bounding boxes in pixels."""
+        widths_heights = self.widths_heights.astype(np.int64)
+        return widths_heights[:, 0] * widths_heights[:, 1]
+
+    @property
+    def centers(self) -> np.ndarray:
+        """Get centers (N, 2) [x, y] of the bounding boxes (rounded down as FaceDetection.center)."""
+        return (self.left_top_right_bottom[:, :2] + self.left_top_right_bottom[:, 2:]) // 2
+
+    def intersection_over_union(self, other: DetectionTable) -> np.ndarray:
+        """
+        Compute IoU of all pairs of rows of this and other table.
+        Args:
+            other (DetectionTable): Other detections (e.g. of the same frame in another video)
+        Returns:
+            np.ndarray: IoU values (len(self), len(other))
+        """
+        return pairwise_intersection_over_union(self.left_top_right_bottom, other.left_top_right_bottom)
+
+    def center_distances(self, other: DetectionTable) -> np.ndarray:
+        """
+        Compute Euclidean distances between centers of all pairs of rows of this and other table.
+        Args:
+            other (DetectionTable): Other detections
+        Returns:
+            np.ndarray: Distances in pixels (len(self), len(other))
+        """
+        return np.linalg.norm(self.centers[:, None, :] - other.centers[None, :, :], axis=2)
+
+    def orientations(self) -> tuple[np.ndarray, SO3Batch]:
+        """
+        Get the known orientations as one rotation batch.
+        Returns:
+            tuple: (rows with an orientation, SO3Batch of their orientations)
+        """
+        if self.orientation_quaternions is None:
+            return np.zeros(0, dtype=np.int64), SO3Batch()
+        rows = np.flatnonzero(~np.isnan(self.orientation_quaternions[:, 3]))
+        return rows, SO3Batch.from_quaternions(self.orientation_quaternions[rows])
+
+    def to_face_detection(self, row: int) -> FaceDetection:
+        """
+        Create FaceDetection of one row (landmarks are views into the table).
+        Args:
+            row (int): Row index
+        Returns:
+            FaceDetection: Detection object
+        """
+        confidence = float(self.confidences[row])
+
+        landmarks = None
+        if self.landmarks is not None and not np.isnan(self.landmarks[row, 0, 0]):
+            orientation = None
+            if self.orientation_quaternions is not None and not np.isnan(self.orientation_quaternions[row, 3]):
+                orientation = SO3Batch.from_quaternions(self.orientation_quaternions[row : row + 1])[0]
+            landmarks = FacialLandmarksDetection(self.landmarks[row], orientation=orientation)
+
+        return FaceDetection(self.left_top_right_bottom[row], None if np.isnan(confidence) else confidence, landmarks)
+
+    def to_face_detections(self) -> list[FaceDetection]:
+        """
+        Create FaceDetection objects of all rows (e.g. of a table returned by frame()).
+        Returns:
+            list[FaceDetection]: Detection objects
+        """
+        return [self.to_face_detection(row) for row in range(len(self))]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save the table. A path with the .npz suffix gives a single compressed archive, any other path a folder with
+        one .npy file per column, which load() memory-maps (instant loading of whole-video tables).
+        Args:
+            path (Union[str, Path]): Output .npz file or folder
+        """
+        path = Path(path)
+        columns = {
+            column.name: getattr(self, column.name)
+            for column in fields(DetectionTable)
+            if getattr(self, column.name) is not None
+        }
+
+        if path.suffix == ".npz":
+            np.savez_compressed(path, **columns)
+            return
+
+        path.mkdir(parents=True, exist_ok=True)
+        for column in fields(DetectionTable):
+            (path / f"{column.name}.npy").unlink(missing_ok=True)
+        for name, values in columns.items():
+            np.save(path / f"{name}.npy", np.ascontiguousarray(values))
+
+    @staticmethod
+    def load(path: Union[str, Path], mmap_mode: Optional[str] = "r") -> DetectionTable:
+        """
+        Load table saved by save().
+        Args:
+            path (Union[str, Path]): .npz file or folder with .npy column files
+            mmap_mode (Optional[str]): Memory-map mode of the .npy columns (None reads them into memory), ignored for
+                .npz archives
+        Returns:
+            DetectionTable: Loaded table
+        """
+        path = Path(path)
+        if path.suffix == ".npz":
+            with np.load(path) as archive:
+                return DetectionTable(**{name: archive[name] for name in archive.files})
+
+        if not path.is_dir():
+            raise FileNotFoundError(f"Detection table {path} doesn't exist")
+        return DetectionTable(
+            **{
+                column.name: np.load(path / f"{column.name}.npy", mmap_mode=mmap_mode)
+                for column in fields(DetectionTable)
+                if (path / f"{column.name}.npy").exists()
+            }
+        )
+
+    def __str__(self):
+        """String representation of DetectionTable."""
+        return f"DetectionTable(rows={len(self)}, frames={len(self.unique_frame_indices)})"
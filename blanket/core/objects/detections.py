@@ -9,6 +9,7 @@ import cv2
 import numpy as np
 
 from blanket.core.geometry import SO3
+from blanket.core.objects.masks import RegionMask
 
 
 @dataclass
@@ -147,6 +148,19 @@ class FaceDetection:
             raise ValueError("Cannot create mask without landmarks")
         return self.landmarks.convex_hull_binary_mask(image_shape)
 
+    def create_region_mask(self, image_shape: tuple[int, ...]) -> RegionMask:
+        """
+        Create a face mask bounded to the face region: the landmarks convex hull if landmarks are available,
+        otherwise the bounding box.
+        Args:
+            image_shape (tuple): Shape of the image (H, W, ...)
+        Returns:
+            RegionMask: Single-channel mask tile with its offset in the image
+        """
+        if self.landmarks is None:
+            return RegionMask.from_box(self.left_top_right_bottom, image_shape)
+        return self.landmarks.convex_hull_region_mask(image_shape)
+
     def __str__(self):
         """String representation of FaceDetection."""
         return f"FaceDetection(ltrb={self.left_top_right_bottom}, confidence={self.confidence})"
@@ -164,7 +178,7 @@ class FacialLandmarksDetection:
     orientation: Optional[SO3] = None
     confidence: Optional[np.ndarray] = None  # per-landmark confidence
 
-    _mask: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _region_mask: Optional[RegionMask] = field(default=None, init=False, repr=False)
 
     def get_specific_landmarks(self, landmark_indices: list[int]) -> np.ndarray:
         """
@@ -191,20 +205,35 @@ class FacialLandmarksDetection:
 
         return landmarks.mean(axis=0)
 
-    def convex_hull_binary_mask(self, image_shape: tuple[int, int, int], force_recompute=False) -> np.ndarray:
+    def convex_hull_region_mask(self, image_shape: tuple[int, ...], force_recompute=False) -> RegionMask:
         """
-        Return a binary mask of the landmarks convex hull (or its cached value).
+        Return a single-channel mask of the landmarks convex hull bounded to the landmarks region (or its cached
+        value).
         Args:
-            image_shape (tuple): Shape of the image (H, W, C)
+            image_shape (tuple): Shape of the image (H, W, ...)
             force_recompute (bool): If True, recompute mask even if cached
         Returns:
-            np.ndarray: Binary mask
+            RegionMask: Mask tile with its offset in the image
         """
-        if not force_recompute and self._mask is not None and self._mask.shape == image_shape:
-            return self._mask
+        if (
+            not force_recompute
+            and self._region_mask is not None
+            and self._region_mask.image_height_width == tuple(image_shape[:2])
+        ):
+            return self._region_mask
 
-        self._mask = np.zeros(image_shape, np.uint8)
-        hull = cv2.convexHull(self.landmarks)
-        cv2.fillConvexPoly(self._mask, hull, color=(255, 255, 255))
+        self._region_mask = RegionMask.from_convex_hull(self.landmarks, image_shape)
+        return self._region_mask
 
-        return self._mask
+    def convex_hull_binary_mask(self, image_shape: tuple[int, int, int], force_recompute=False) -> np.ndarray:
+        """
+        Return a full-frame binary mask of the landmarks convex hull. Prefer convex_hull_region_mask, which does not
+        allocate the full frame.
+        Args:
+            image_shape (tuple): Shape of the image (H, W, C)
+            force_recompute (bool): If True, recompute the (cached) region mask
+        Returns:
+            np.ndarray: Binary mask with the shape of the image
+        """
+        region_mask = self.convex_hull_region_mask(image_shape, force_recompute)
+        return region_mask.to_full_frame(image_shape[2] if len(image_shape) > 2 else 1)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+
+@dataclass
+class RegionMask:
+    """
+    Single-channel mask restricted to a rectangular image region (ROI). Only the mask tile is stored, together with
+    its offset in the image, so memory and processing cost scale with the face size instead of the frame size.
+    """
+
+    tile: np.ndarray  # (height, width) uint8, 0 outside and 255 inside the masked area
+    left_top: np.ndarray  # [left, top] offset of the tile in the image, int32
+    image_height_width: tuple[int, int]  # (H, W) of the image the mask belongs to
+
+    @staticmethod
+    def _clipped_box(
+        left_top_right_bottom: np.ndarray, image_shape: tuple[int, ...], padding: int = 0
+    ) -> np.ndarray:
+        """
+        Enlarge a box by padding on each side and clip it to the image.
+        Args:
+            left_top_right_bottom (np.ndarray): [left, top, right, bottom]
+            image_shape (tuple): Shape of the image (H, W, ...)
+            padding (int): Padding in pixels added on each side
+        Returns:
+            np.ndarray: Clipped [left, top, right, bottom], int32
+        """
+        height, width = image_shape[:2]
+        box = np.round(np.asarray(left_top_right_bottom, dtype=np.float64)).astype(np.int32)
+        box += np.asarray([-padding, -padding, padding, padding], dtype=np.int32)
+        return np.clip(box, 0, np.asarray([width, height, width, height], dtype=np.int32))
+
+    @staticmethod
+    def from_box(left_top_right_bottom: np.ndarray, image_shape: tuple[int, ...], padding: int = 0) -> RegionMask:
+        """
+        Create a mask filling a (padded) bounding box.
+        Args:
+            left_top_right_bottom (np.ndarray): [left, top, right, bottom]
+            image_shape (tuple): Shape of the image (H, W, ...)
+            padding (int): Padding in pixels added on each side
+        Returns:
+            RegionMask: Mask of the box
+        """
+        left, top, right, bottom = RegionMask._clipped_box(left_top_right_bottom, image_shape, padding)
+        tile = np.full((bottom - top, right - left), 255, dtype=np.uint8)
+        return RegionMask(tile, np.asarray([left, top], dtype=np.int32), tuple(image_shape[:2]))
+
+    @staticmethod
+    def from_convex_hull(points: np.ndarray, image_shape: tuple[int, ...], padding: int = 0) -> RegionMask:
+        """
+        Create a mask of the convex hull of points (e.g. facial landmarks), rasterized only within their bounding box.
+        Args:
+            points (np.ndarray): Point coordinates with shape (N, 2) in pixels
+            image_shape (tuple): Shape of the image (H, W, ...)
+            padding (int): Empty margin in pixels kept around the hull (e.g. room for feathering)
+        Returns:
+            RegionMask: Mask of the convex hull
+        """
+        points = np.asarray(points).astype(np.int32)
+        left_top_right_bottom = np.concatenate([points.min(axis=0), points.max(axis=0) + 1])
+        left, top, right, bottom = RegionMask._clipped_box(left_top_right_bottom, image_shape, padding)
+
+        tile = np.zeros((bottom - top, right - left), dtype=np.uint8)
+        hull = cv2.convexHull(points - np.asarray([left, top], dtype=np.int32))
+        cv2.fillConvexPoly(tile, hull, 255)
+
+        return RegionMask(tile, np.asarray([left, top], dtype=np.int32), tuple(image_shape[:2]))
+
+    @property
+    def left(self) -> int:
+        """Get left coordinate of the mask region."""
+        return int(self.left_top[0])
+
+    @property
+    def top(self) -> int:
+        """Get top coordinate of the mask region."""
+        return int(self.left_top[1])
+
+    @property
+    def width(self) -> int:
+        """Get width of the mask region."""
+        return int(self.tile.shape[1])
+
+    @property
+    def height(self) -> int:
+        """Get height of the mask region."""
+        return int(self.tile.shape[0])
+
+    @property
+    def left_top_right_bottom(self) -> np.ndarray:
+        """
+        Get the mask region in left, top, right, bottom format.
+        Returns:
+            np.ndarray: [left, top, right, bottom]
+        """
+        return np.asarray([self.left, self.top, self.left + self.width, self.top + self.height], dtype=np.int32)
+
+    @property
+    def slices(self) -> tuple[slice, slice]:
+        """
+        Get (rows, columns) slices of the mask region, usable to index the image.
+        Returns:
+            tuple[slice, slice]: Row and column slices
+        """
+        return slice(self.top, self.top + self.height), slice(self.left, self.left + self.width)
+
+    def image_roi(self, image: np.ndarray) -> np.ndarray:
+        """
+        Return a view of the image region covered by the mask (writes go to the image).
+        Args:
+            image (np.ndarray): Image with the shape the mask was created for
+        Returns:
+            np.ndarray: View of the region
+        """
+        return image[self.slices]
+
+    def feathered(self, blur_radius: int) -> RegionMask:
+        """
+        Return the mask with Gaussian-blurred edges, equal to blurring the full-frame mask. The region is enlarged by
+        the blur radius (within the image) so that the blur is not cut at the region border. The blurred tile is
+        padded by twice the radius, so the reflected border of GaussianBlur only affects the cropped outer margin
+        (at image edges the reflection matches the full-frame blur).
+        Args:
+            blur_radius (int): Gaussian blur radius in pixels
+        Returns:
+            RegionMask: Feathered mask
+        """
+        if blur_radius <= 0:
+            return self
+
+        left, top, right, bottom = self._clipped_box(self.left_top_right_bottom, self.image_height_width, blur_radius)
+        padded_left, padded_top, padded_right, padded_bottom = self._clipped_box(
+            self.left_top_right_bottom, self.image_height_width, 2 * blur_radius
+        )
+        tile = np.zeros((padded_bottom - padded_top, padded_right - padded_left), dtype=np.uint8)
+        tile_top, tile_left = self.top - padded_top, self.left - padded_left
+        tile[tile_top : tile_top + self.height, tile_left : tile_left + self.width] = self.tile
+
+        kernel_size = blur_radius * 2 + 1
+        cv2.GaussianBlur(tile, (kernel_size, kernel_size), 0, dst=tile)
+        tile_slices = slice(top - padded_top, bottom - padded_top), slice(left - padded_left, right - padded_left)
+        tile = np.ascontiguousarray(tile[tile_slices])
+
+        return RegionMask(tile, np.asarray([left, top], dtype=np.int32), self.image_height_width)
+
+    def to_full_frame(self, channels: int = 1) -> np.ndarray:
+        """
+        Expand the mask to a full-frame array (only for consumers that need it, e.g. inpainting pipelines).
+        Args:
+            channels (int): Number of channels of the output (1 -> (H, W) array)
+        Returns:
+            np.ndarray: Full-frame uint8 mask
+        """
+        full_frame = np.zeros(self.image_height_width, dtype=np.uint8)
+        full_frame[self.slices] = self.tile
+        if channels == 1:
+            return full_frame
+        return np.repeat(full_frame[..., None], channels, axis=2)
+
+    def apply(self, image: np.ndarray, replacement_roi: np.ndarray) -> None:
+        """
+        Write the replacement into the image (in place) where the mask is set. Feathered (non-binary) masks are
+        alpha blended.
+        Args:
+            image (np.ndarray): Image to modify, (H, W, C) uint8
+            replacement_roi (np.ndarray): Replacement pixels for the mask region, (height, width, C) uint8
+        """
+        image_roi = self.image_roi(image)
+        alpha = self.tile[..., None]
+
+        if np.all((self.tile == 0) | (self.tile == 255)):
+            np.copyto(image_roi, replacement_roi, where=alpha > 0)
+            return
+
+        alpha = alpha.astype(np.float32) / 255.0
+        blended = replacement_roi.astype(np.float32) * alpha + image_roi.astype(np.float32) * (1.0 - alpha)
+        np.copyto(image_roi, np.round(blended).astype(np.uint8))
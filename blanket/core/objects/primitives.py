@@ -3,13 +3,17 @@
 #  supported features:
 #      * rotating the primitive for the detection/anonymization/evaluation process and then rotating back before saving
 #      * saving different stages of the detection/anonymization/evaluation process
-#      * batch work on multiple primitives
+#      * batch work on multiple primitives (see FrameBatch)
 
 
 from __future__ import annotations
 
 # from abc import ABC, abstractmethod
+import hashlib
 import os
+import queue
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
@@ -185,19 +189,389 @@ class ImagePrimitive:
             return cv2.rotate(image, cv2.ROTATE_90_COUNTERCLOCKWISE)
 
 
+class FrameBufferPool:
+    """
+    Pool of preallocated contiguous (N, H, W, 3) uint8 frame buffers. Released buffers are reused by later batches of
+    the same shape, so per-batch allocations disappear after warm-up.
+    """
+
+    def __init__(self, max_free_buffers: int = 8):
+        self.max_free_buffers = max_free_buffers
+        self._free_buffers: list[np.ndarray] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, shape: tuple[int, int, int, int]) -> np.ndarray:
+        """
+        Get a buffer of the given shape (reused if available, allocated otherwise). Its content is undefined.
+        Args:
+            shape (tuple): Buffer shape (N, H, W, 3).
+        Returns:
+            np.ndarray: Contiguous uint8 buffer.
+        """
+        with self._lock:
+            for buffer_position, buffer in enumerate(self._free_buffers):
+                if buffer.shape == shape:
+                    return self._free_buffers.pop(buffer_position)
+        return np.empty(shape, dtype=np.uint8)
+
+    def release(self, buffer: np.ndarray) -> None:
+        """
+        Return a buffer to the pool (the oldest free buffer is dropped if the pool is full).
+        Args:
+            buffer (np.ndarray): Buffer previously obtained from acquire.
+        """
+        with self._lock:
+            self._free_buffers.append(buffer)
+            if len(self._free_buffers) > self.max_free_buffers:
+                self._free_buffers.pop(0)
+
+    def clear(self) -> None:
+        """Drop all free buffers."""
+        with self._lock:
+            self._free_buffers.clear()
+
+
+# shared by all FrameBatch instances in the process
+frame_buffer_pool = FrameBufferPool()
+
+_ROTATION_CODES = {1: cv2.ROTATE_90_CLOCKWISE, 2: cv2.ROTATE_180, 3: cv2.ROTATE_90_COUNTERCLOCKWISE}
+
+
+@dataclass
+class FrameBatch:
+    """
+    Batch of equally sized frames stored in one pooled contiguous (capacity, H, W, 3) uint8 buffer, with per-frame
+    metadata arrays. Frames are exposed as zero-copy views; color conversion is done in place and rotation writes
+    into another pooled buffer.
+    """
+
+    buffer: np.ndarray  # (capacity, H, W, 3) uint8, frames [0, size) are valid
+    frame_indices: np.ndarray  # (capacity,) int64, source frame index of each frame (-1 if unknown)
+    clockwise_rotation_indices: np.ndarray  # (capacity,) int8, in how many 90° increments each frame was rotated
+    size: int = 0
+    is_rgb: bool = False  # channel order of the frames (BGR by default)
+    pool: Optional[FrameBufferPool] = field(default=None, repr=False)
+
+    @staticmethod
+    def allocate(
+        capacity: int, height: int, width: int, pool: Optional[FrameBufferPool] = frame_buffer_pool
+    ) -> FrameBatch:
+        """
+        Create an empty batch backed by a (pooled) buffer.
+        Args:
+            capacity (int): Maximal number of frames.
+            height (int): Frame height.
+            width (int): Frame width.
+            pool (Optional[FrameBufferPool]): Pool to take the buffer from and return it to, None to allocate.
+        Returns:
+            FrameBatch: Empty batch.
+        """
+        shape = (capacity, height, width, 3)
+        buffer = pool.acquire(shape) if pool is not None else np.empty(shape, dtype=np.uint8)
+        return FrameBatch(
+            buffer,
+            np.full(capacity, -1, dtype=np.int64),
+            np.zeros(capacity, dtype=np.int8),
+            pool=pool,
+        )
+
+    @property
+    def capacity(self) -> int:
+        """Get maximal number of frames in the batch."""
+        return self.buffer.shape[0]
+
+    @property
+    def height(self) -> int:
+        """Get height of the frames."""
+        return self.buffer.shape[1]
+
+    @property
+    def width(self) -> int:
+        """Get width of the frames."""
+        return self.buffer.shape[2]
+
+    @property
+    def frames(self) -> np.ndarray:
+        """
+        Get the valid frames as one array view.
+        Returns:
+            np.ndarray: View with shape (size, H, W, 3).
+        """
+        return self.buffer[: self.size]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, position: int) -> np.ndarray:
+        """
+        Get a zero-copy view of one frame (writes go to the batch).
+        Args:
+            position (int): Position of the frame in the batch.
+        Returns:
+            np.ndarray: Frame view (H, W, 3).
+        """
+        if position < 0:
+            position += self.size
+        if position < 0 or position >= self.size:
+            raise IndexError(f"Frame position {position} out of range <0, {self.size})")
+        return self.buffer[position]
+
+    def __iter__(self):
+        return iter(self.frames)
+
+    def append(self, image: np.ndarray, frame_index: int = -1, clockwise_rotation_index: int = 0) -> np.ndarray:
+        """
+        Copy a not-rotated image into the next slot of the batch, rotating it on the way (no temporary array).
+        Args:
+            image (np.ndarray): Image in the batch's channel order.
+            frame_index (int): Source frame index.
+            clockwise_rotation_index (int): Number of 90° rotations applied to the image.
+        Returns:
+            np.ndarray: View of the stored frame.
+        """
+        if self.size >= self.capacity:
+            raise ValueError(f"Frame batch is full (capacity {self.capacity})")
+
+        slot = self.buffer[self.size]
+        rotation_code = _ROTATION_CODES.get(clockwise_rotation_index % 4)
+        rotated_shape = image.shape[:2] if rotation_code in (None, cv2.ROTATE_180) else image.shape[1::-1]
+        if tuple(rotated_shape) != (self.height, self.width):
+            raise ValueError(f"Image of shape {image.shape} doesn't fit frames of shape {slot.shape}")
+
+        if rotation_code is None:
+            np.copyto(slot, image)
+        else:
+            cv2.rotate(image, rotation_code, dst=slot)
+
+        self.frame_indices[self.size] = frame_index
+        self.clockwise_rotation_indices[self.size] = clockwise_rotation_index % 4
+        self.size += 1
+        return slot
+
+    def as_image_primitives(self) -> list[ImagePrimitive]:
+        """
+        Wrap the frames as ImagePrimitives sharing the batch memory (modifications are visible in the batch).
+        Returns:
+            list[ImagePrimitive]: One primitive per frame.
+        """
+        if self.is_rgb:
+            raise ValueError("ImagePrimitive stores BGR images, convert the batch to BGR first")
+        return [
+            ImagePrimitive(self.buffer[position], int(self.clockwise_rotation_indices[position]))
+            for position in range(self.size)
+        ]
+
+    def swap_channel_order(self) -> FrameBatch:
+        """
+        Convert all frames between BGR and RGB in place.
+        Returns:
+            FrameBatch: Self.
+        """
+        for frame in self.frames:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+        self.is_rgb = not self.is_rgb
+        return self
+
+    def to_rgb(self) -> FrameBatch:
+        """Convert the frames to RGB in place (no-op if already RGB)."""
+        return self if self.is_rgb else self.swap_channel_order()
+
+    def to_bgr(self) -> FrameBatch:
+        """Convert the frames to BGR in place (no-op if already BGR)."""
+        return self.swap_channel_order() if self.is_rgb else self
+
+    def rotated(self, clockwise_rotation_index: int) -> FrameBatch:
+        """
+        Rotate all frames by 90° increments into a new batch backed by a pooled buffer. For counterclockwise
+        rotation (e.g. rotating back) use negative indices.
+        Args:
+            clockwise_rotation_index (int): Number of 90° rotations.
+        Returns:
+            FrameBatch: Rotated batch (self if no rotation is needed).
+        """
+        rotation_code = _ROTATION_CODES.get(clockwise_rotation_index % 4)
+        if rotation_code is None:
+            return self
+
+        height, width = (self.height, self.width) if rotation_code == cv2.ROTATE_180 else (self.width, self.height)
+        rotated_batch = FrameBatch.allocate(self.capacity, height, width, self.pool)
+        for position in range(self.size):
+            cv2.rotate(self.buffer[position], rotation_code, dst=rotated_batch.buffer[position])
+
+        rotated_batch.size = self.size
+        rotated_batch.is_rgb = self.is_rgb
+        rotated_batch.frame_indices[: self.size] = self.frame_indices[: self.size]
+        rotated_batch.clockwise_rotation_indices[: self.size] = (
+            self.clockwise_rotation_indices[: self.size] + clockwise_rotation_index
+        ) % 4
+        return rotated_batch
+
+    def clear(self) -> None:
+        """Empty the batch, keeping its buffer for the next frames."""
+        self.size = 0
+        self.frame_indices[:] = -1
+        self.clockwise_rotation_indices[:] = 0
+
+    def release(self) -> None:
+        """Return the buffer to the pool. The batch and all views of its frames must not be used afterwards."""
+        if self.pool is not None and self.buffer is not None:
+            self.pool.release(self.buffer)
+        self.buffer = None
+        self.size = 0
+
+    def __enter__(self) -> FrameBatch:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
+
+
+FRAME_INDEX_CACHE_DIR = Path(".cache/frame_index")
+FRAME_INDEX_FILE_SUFFIX = ".frame_index.npz"
+
+
+@dataclass
+class VideoFrameIndex:
+    """Keyframe positions of a video (built once, cached in a cache directory)."""
+
+    keyframe_indices: np.ndarray  # sorted indices of keyframes, int64
+    video_size: int  # size of the indexed video file in bytes (cache validation)
+    video_mtime_ns: int  # modification time of the indexed video file (cache validation)
+
+    @staticmethod
+    def cache_path(video_path: Path, cache_dir: Path) -> Path:
+        """
+        Get path of the file caching the index of a video (named after the video and a hash of its absolute path,
+        so videos with the same name in different directories don't collide).
+        Args:
+            video_path (Path): Path to the video.
+            cache_dir (Path): Directory of the cached indices.
+        Returns:
+            Path: Cache file path.
+        """
+        path_hash = hashlib.sha1(str(video_path.resolve()).encode()).hexdigest()[:16]
+        return cache_dir / f"{video_path.stem}-{path_hash}{FRAME_INDEX_FILE_SUFFIX}"
+
+    @staticmethod
+    def build(video_path: Path) -> Optional[VideoFrameIndex]:
+        """
+        Index a video by demuxing it (packets are read without decoding, so indexing is fast).
+        Args:
+            video_path (Path): Path to the video.
+        Returns:
+            Optional[VideoFrameIndex]: The index, or None if the backend can't read raw packets.
+        """
+        video_capture = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
+        try:
+            if not video_capture.isOpened() or not video_capture.set(cv2.CAP_PROP_FORMAT, -1):
+                return None
+
+            keyframe_indices, packet_count = [], 0
+            while video_capture.grab():
+                if video_capture.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                    keyframe_indices.append(packet_count)
+                packet_count += 1
+        finally:
+            video_capture.release()
+
+        if len(keyframe_indices) == 0 or keyframe_indices[0] != 0:
+            return None
+
+        video_stat = video_path.stat()
+        return VideoFrameIndex(np.asarray(keyframe_indices, dtype=np.int64), video_stat.st_size, video_stat.st_mtime_ns)
+
+    @staticmethod
+    def load_or_build(video_path: Path, cache_dir: Optional[Path] = FRAME_INDEX_CACHE_DIR) -> Optional[VideoFrameIndex]:
+        """
+        Load the index from the cache if it matches the video, otherwise build it and try to cache it.
+        Args:
+            video_path (Path): Path to the video.
+            cache_dir (Optional[Path]): Directory of the cached indices, None to keep the index in memory only.
+        Returns:
+            Optional[VideoFrameIndex]: The index, or None if the video can't be indexed.
+        """
+        if cache_dir is None:
+            return VideoFrameIndex.build(video_path)
+
+        cache_path = VideoFrameIndex.cache_path(video_path, Path(cache_dir))
+        video_stat = video_path.stat()
+
+        if cache_path.is_file():
+            try:
+                with np.load(cache_path) as cached_index:
+                    frame_index = VideoFrameIndex(
+                        cached_index["keyframe_indices"],
+                        int(cached_index["video_size"]),
+                        int(cached_index["video_mtime_ns"]),
+                    )
+                if (frame_index.video_size, frame_index.video_mtime_ns) == (video_stat.st_size, video_stat.st_mtime_ns):
+                    return frame_index
+            except (OSError, KeyError, ValueError):
+                pass  # corrupted or outdated cache file -> rebuild
+
+        frame_index = VideoFrameIndex.build(video_path)
+        if frame_index is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(cache_path, "wb") as cache_file:
+                    np.savez(
+                        cache_file,
+                        keyframe_indices=frame_index.keyframe_indices,
+                        video_size=frame_index.video_size,
+                        video_mtime_ns=frame_index.video_mtime_ns,
+                    )
+            except OSError:
+                pass  # read-only location, the index is kept in memory only
+        return frame_index
+
+    def nearest_keyframe(self, index: int) -> int:
+        """
+        Get the last keyframe at or before a frame.
+        Args:
+            index (int): Frame index.
+        Returns:
+            int: Keyframe index.
+        """
+        return int(self.keyframe_indices[np.searchsorted(self.keyframe_indices, index, side="right") - 1])
+
+
+_END_OF_VIDEO = None
+
+
 @dataclass
 class VideoPrimitive:
-    """Represents a video. Wraps path and frame-level access."""
+    """
+    Represents a video. Wraps path and frame-level access.
+    Random access seeks to the nearest keyframe (from a keyframe index cached across runs) and decodes forward,
+    sequential and near-sequential access never seeks. Recently decoded frames are kept in a small ring buffer and
+    iteration decodes ahead in a background thread.
+    """
 
     path: Path
     clockwise_rotation_index: int = 0
     current_frame_index: int = 0
+    frame_cache_size: int = 8  # number of recently decoded frames kept for repeated access (0 disables the cache)
+    prefetch_frames: int = 8  # number of frames decoded ahead while iterating (0 decodes in the calling thread)
+    use_frame_index: bool = True  # build/load the keyframe index for random access
+    # directory caching the keyframe indices across runs, None keeps the index in memory only
+    frame_index_cache_dir: Optional[Path] = FRAME_INDEX_CACHE_DIR
+    # forward jumps up to this many frames skip the frames in between instead of seeking (OpenCV seeks decode
+    # forward from an earlier position too, so they only pay off for long jumps)
+    max_forward_skip_frames: int = 256
 
     _video_capture: Optional[cv2.VideoCapture] = field(default=None, init=False)
     _total_frames: Optional[int] = field(default=None, init=False)
     _fps: Optional[float] = field(default=None, init=False)
     _width: Optional[int] = field(default=None, init=False)
     _height: Optional[int] = field(default=None, init=False)
+    _next_capture_frame_index: int = field(default=0, init=False)  # index of the frame the next read() returns
+    _frame_index: Optional[VideoFrameIndex] = field(default=None, init=False, repr=False)
+    _frame_index_loaded: bool = field(default=False, init=False, repr=False)
+    _frame_cache: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
+    _capture_lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+    _prefetch_thread: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+    _prefetch_queue: Optional[queue.Queue] = field(default=None, init=False, repr=False)
+    _stop_prefetch: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
 
     def _ensure_video_capture_is_open(self) -> cv2.VideoCapture:
         """
@@ -213,6 +587,18 @@ class VideoPrimitive:
 
         return self._video_capture
 
+    @property
+    def frame_index(self) -> Optional[VideoFrameIndex]:
+        """
+        Get the keyframe index of the video (loaded from the cache or built on first use).
+        Returns:
+            Optional[VideoFrameIndex]: The index, or None if disabled or the video can't be indexed.
+        """
+        if self.use_frame_index and not self._frame_index_loaded:
+            self._frame_index = VideoFrameIndex.load_or_build(Path(self.path), self.frame_index_cache_dir)
+            self._frame_index_loaded = True
+        return self._frame_index
+
     @property
     def total_frames(self) -> int:
         """
@@ -257,26 +643,85 @@ class VideoPrimitive:
             self._height = int(self._ensure_video_capture_is_open().get(cv2.CAP_PROP_FRAME_HEIGHT))
         return self._height
 
-    def load_frame_as_array(self, index: int) -> np.ndarray:
+    def _position_capture(self, video_capture: cv2.VideoCapture, index: int) -> None:
         """
-        Get frame at the specified index as numpy array.
+        Move the capture so that the next read() returns the frame at index. Short forward jumps and jumps within
+        the current group of pictures only skip frames (skipped frames are still decoded by grab()); otherwise the
+        capture seeks to the nearest keyframe and skips forward.
+        Args:
+            video_capture (cv2.VideoCapture): Opened video capture object.
+            index (int): Frame index.
+        """
+        if index == self._next_capture_frame_index:
+            return
+
+        if not (0 < index - self._next_capture_frame_index <= self.max_forward_skip_frames):
+            frame_index = self.frame_index
+            if frame_index is None:
+                video_capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+                self._next_capture_frame_index = index
+                return
+
+            keyframe = frame_index.nearest_keyframe(index)
+            if not (keyframe <= self._next_capture_frame_index < index):
+                # backwards or far past the next keyframe -> seeking is cheaper than decoding the frames in between
+                video_capture.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+                self._next_capture_frame_index = keyframe
+
+        while self._next_capture_frame_index < index:
+            if not video_capture.grab():
+                raise RuntimeError(f"Could not read frame {self._next_capture_frame_index}")
+            self._next_capture_frame_index += 1
+
+    def _decode_frame(self, index: int) -> np.ndarray:
+        """
+        Decode the frame at index (no cache lookup).
         Args:
             index (int): Frame index.
         Returns:
             np.ndarray: Frame image array.
         """
-        video_capture = self._ensure_video_capture_is_open()
+        with self._capture_lock:
+            video_capture = self._ensure_video_capture_is_open()
+            self._position_capture(video_capture, index)
+
+            frame_read_successfully, frame = video_capture.read()
+            self._next_capture_frame_index = index + 1
 
+        if not frame_read_successfully:
+            raise RuntimeError(f"Could not read frame {index}")
+        return frame
+
+    def load_frame_as_array(self, index: int) -> np.ndarray:
+        """
+        Get frame at the specified index as numpy array. Recently loaded frames are served from the ring buffer
+        (the returned array is always a private copy that may be modified).
+        Args:
+            index (int): Frame index.
+        Returns:
+            np.ndarray: Frame image array.
+        """
         # check that index is valid
         if index < 0 or index >= self.total_frames:
             raise IndexError(f"Frame index {index} out of range <0, {self.total_frames})")
 
-        video_capture.set(cv2.CAP_PROP_POS_FRAMES, index)
-        frame_read_successfully, frame = video_capture.read()
+        if self.frame_cache_size <= 0:
+            return self._decode_frame(index)
 
-        if not frame_read_successfully:
-            raise RuntimeError(f"Could not read frame {index}")
-        return frame
+        with self._capture_lock:
+            cached_frame = self._frame_cache.get(index)
+            if cached_frame is not None:
+                self._frame_cache.move_to_end(index)
+                return cached_frame.copy()
+
+        frame = self._decode_frame(index)
+
+        with self._capture_lock:
+            self._frame_cache[index] = frame
+            while len(self._frame_cache) > self.frame_cache_size:
+                self._frame_cache.popitem(last=False)
+
+        return frame.copy()
 
     def get_frame_primitive(self, index: Optional[int] = None) -> ImagePrimitive:
         """
@@ -295,19 +740,86 @@ class VideoPrimitive:
 
         return ImagePrimitive.from_not_rotated_image(frame_bgr, clockwise_rotation_index=self.clockwise_rotation_index)
 
+    def iter_frame_batches(self, batch_size: int, pool: Optional[FrameBufferPool] = frame_buffer_pool):
+        """
+        Decode the video sequentially into batches of rotated frames (each frame is rotated straight into the pooled
+        batch buffer). The yielded batches belong to the consumer, which has to release them.
+        Args:
+            batch_size (int): Maximal number of frames in a batch.
+            pool (Optional[FrameBufferPool]): Pool of the batch buffers, None to allocate.
+        Yields:
+            FrameBatch: Batch of consecutive frames (the last one may be smaller).
+        """
+        if self.clockwise_rotation_index % 2 == 0:
+            height, width = self.height, self.width
+        else:
+            height, width = self.width, self.height
+
+        batch = None
+        try:
+            for index in range(self.total_frames):
+                if batch is None:
+                    batch = FrameBatch.allocate(batch_size, height, width, pool)
+                batch.append(self._decode_frame(index), index, self.clockwise_rotation_index)
+                if len(batch) == batch_size:
+                    full_batch, batch = batch, None
+                    yield full_batch
+            if batch is not None:
+                full_batch, batch = batch, None
+                yield full_batch
+        finally:
+            if batch is not None:
+                batch.release()
+
     def reset_current_frame_index(self) -> None:
         """
         Resets the current frame index to the start (index 0).
         """
         self.current_frame_index = 0
 
+    def _prefetch(self, start_index: int, prefetch_queue: queue.Queue) -> None:
+        """
+        Prefetch thread: decode frames from start_index on into the bounded queue.
+        Args:
+            start_index (int): Index of the first decoded frame.
+            prefetch_queue (queue.Queue): Queue of (index, frame) items, exceptions and the end marker.
+        """
+        try:
+            for index in range(start_index, self.total_frames):
+                if self._stop_prefetch.is_set():
+                    return
+                prefetch_queue.put((index, self._decode_frame(index)))
+        except Exception as e:
+            prefetch_queue.put(e)
+        prefetch_queue.put(_END_OF_VIDEO)
+
+    def _stop_prefetching(self) -> None:
+        """Stop the prefetch thread (if running) and drop prefetched frames."""
+        if self._prefetch_thread is None:
+            return
+
+        self._stop_prefetch.set()
+        while self._prefetch_thread.is_alive():
+            try:
+                self._prefetch_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self._prefetch_thread.join()
+
+        self._prefetch_thread = None
+        self._prefetch_queue = None
+        self._stop_prefetch.clear()
+
     def release(self) -> None:
         """
         Release the video capture handle.
         """
+        self._stop_prefetching()
+        self._frame_cache.clear()
         if self._video_capture is not None:
             self._video_capture.release()
             self._video_capture = None
+            self._next_capture_frame_index = 0
 
     def __enter__(self) -> VideoPrimitive:
         """
@@ -326,19 +838,37 @@ class VideoPrimitive:
 
     def __iter__(self):
         """
-        Iterator protocol: reset frame index and return self.
-        Returns:
-            VideoPrimitive: Self.
+        Iterate over all frames from the start, decoding ahead in a background thread. The thread is stopped when the
+        iteration ends or the iterator is closed or garbage collected (e.g. after breaking out of a for loop).
+        Yields:
+            ImagePrimitive: Next frame.
         """
+        self._stop_prefetching()
         self.reset_current_frame_index()
-        return self
 
-    def __next__(self):
-        """
-        Iterator protocol: return next frame primitive or raise StopIteration.
-        Returns:
-            ImagePrimitive: Next frame.
-        """
-        if self.current_frame_index >= self.total_frames:
-            raise StopIteration
-        return self.get_frame_primitive()
+        if self.prefetch_frames <= 0:
+            while self.current_frame_index < self.total_frames:
+                yield self.get_frame_primitive()
+            return
+
+        prefetch_queue = queue.Queue(maxsize=self.prefetch_frames)
+        prefetch_thread = threading.Thread(
+            target=self._prefetch, args=(self.current_frame_index, prefetch_queue), daemon=True
+        )
+        self._prefetch_queue, self._prefetch_thread = prefetch_queue, prefetch_thread
+        prefetch_thread.start()
+
+        try:
+            while (item := prefetch_queue.get()) is not _END_OF_VIDEO:
+                if isinstance(item, Exception):
+                    raise item
+
+                index, frame_bgr = item
+                self.current_frame_index = index + 1
+                yield ImagePrimitive.from_not_rotated_image(
+                    frame_bgr, clockwise_rotation_index=self.clockwise_rotation_index
+                )
+        finally:
+            # a newer iteration (or release) may have replaced the thread already
+            if self._prefetch_thread is prefetch_thread:
+                self._stop_prefetching()
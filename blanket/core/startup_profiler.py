@@ -0,0 +1,151 @@
+"""Import and model load times of the command line startup (reported with --profile-startup)."""
+from __future__ import annotations
+
+import importlib.abc
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Loader wrapper measuring the module creation and execution time (the original loader is restored after)."""
+
+    def __init__(self, profiler: StartupProfiler, loader: importlib.abc.Loader):
+        self._profiler = profiler
+        self._loader = loader
+
+    def create_module(self, spec):
+        # extension modules are loaded (dlopen) here
+        with self._profiler._timed_import(spec.name):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        with self._profiler._timed_import(module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Meta path finder delegating to the other finders and wrapping the found loaders into _TimedLoader."""
+
+    def __init__(self, profiler: StartupProfiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname: str, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(self._profiler, spec.loader)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Collects the self time of every imported module (time spent importing the module minus its nested imports,
+    so that the times add up) and the duration of named sections such as model loading. Sections are recorded
+    only while the profiler is enabled, so the instrumentation costs nothing in normal runs.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.import_self_seconds: dict[str, float] = defaultdict(float)
+        self.section_seconds: dict[str, float] = defaultdict(float)
+        self._finder = _TimingFinder(self)
+        self._nested_import_seconds = threading.local()
+        self._start_time: Optional[float] = None
+
+    def enable(self) -> None:
+        """Start timing imports (modules imported before this call are not measured) and sections."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._start_time = time.perf_counter()
+        sys.meta_path.insert(0, self._finder)
+
+    def disable(self) -> None:
+        """Stop timing, the collected times are kept."""
+        self.enabled = False
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    @contextmanager
+    def _timed_import(self, module_name: str) -> Iterator[None]:
+        stack = getattr(self._nested_import_seconds, "stack", None)
+        if stack is None:
+            stack = self._nested_import_seconds.stack = []
+
+        stack.append(0.0)
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            nested_seconds = stack.pop()
+            self.import_self_seconds[module_name] += elapsed - nested_seconds
+            if stack:
+                stack[-1] += elapsed
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """
+        Time a named section (e.g. "model load: yolo"), repeated sections are summed.
+        Args:
+            name (str): Section name.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.section_seconds[name] += time.perf_counter() - start_time
+
+    def import_seconds_per_package(self) -> dict[str, float]:
+        """
+        Sum the module import times per top-level package.
+        Returns:
+            dict[str, float]: Import seconds per package, slowest first.
+        """
+        package_seconds: dict[str, float] = defaultdict(float)
+        for module_name, seconds in self.import_self_seconds.items():
+            package_seconds[module_name.partition(".")[0]] += seconds
+        return dict(sorted(package_seconds.items(), key=lambda item: item[1], reverse=True))
+
+    def report(self, max_packages: int = 15) -> str:
+        """
+        Format the collected times.
+        Args:
+            max_packages (int): Number of slowest packages listed.
+        Returns:
+            str: Multi-line report.
+        """
+        package_seconds = self.import_seconds_per_package()
+        lines = ["Startup profile:"]
+        if self._start_time is not None:
+            lines.append(f"  Time since profiling start: {time.perf_counter() - self._start_time:.2f}s")
+
+        lines.append(f"  Imports: {sum(package_seconds.values()):.2f}s ({len(self.import_self_seconds)} modules)")
+        for package_name, seconds in list(package_seconds.items())[:max_packages]:
+            lines.append(f"    {package_name:<32} {seconds:8.3f}s")
+
+        lines.append(f"  Sections: {sum(self.section_seconds.values()):.2f}s")
+        for name, seconds in sorted(self.section_seconds.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"    {name:<32} {seconds:8.3f}s")
+        return "\n".join(lines)
+
+
+startup_profiler = StartupProfiler()
@@ -0,0 +1,365 @@
+"""
+Disk-backed index of face embeddings with exact blocked top-k search, used to check that anonymized faces neither
+match their original subject nor collide with other subjects of the dataset.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from blanket.evaluation.evaluation_engine import RunningStatistics
+
+INDEX_METADATA_FILENAME = "index.json"
+UNKNOWN_IDENTITY = -1
+
+
+def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize embeddings row-wise (cosine similarity becomes a dot product).
+    Args:
+        embeddings (np.ndarray): Embeddings (N, D).
+    Returns:
+        np.ndarray: Normalized float32 embeddings (N, D).
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    return embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+
+@dataclass
+class SearchResult:
+    """Top-k neighbours of each query (sorted by decreasing similarity)."""
+
+    similarities: np.ndarray  # (Q, k) float32, -inf where the index has fewer than k embeddings
+    indices: np.ndarray  # (Q, k) int64, global row indices into the index, -1 where missing
+    identity_ids: np.ndarray  # (Q, k) int64, identity of each neighbour
+    true_identity_similarities: Optional[np.ndarray] = None  # (Q,) best similarity to the query's own identity
+
+
+class EmbeddingIndex:
+    """
+    Normalized embeddings stored as float16 .npy shards in a folder (memory-mapped when searching), each row with an
+    integer identity id (e.g. subject id). Search is an exact blocked matrix multiplication: blocks of index rows are
+    converted to float32 and multiplied with a block of queries in a thread pool, and only the running top-k per
+    query is kept, so memory stays bounded for tens of millions of embeddings.
+    """
+
+    def __init__(self, folder: Union[str, Path], dimension: int = 512, shard_size: int = 262144):
+        """
+        Create a new index or open an existing one (its stored dimension and shard size take precedence).
+        Args:
+            folder (Union[str, Path]): Index folder.
+            dimension (int): Embedding dimension.
+            shard_size (int): Number of embeddings per shard file.
+        """
+        self.folder = Path(folder)
+        self.dimension = dimension
+        self.shard_size = shard_size
+        self._shard_sizes: list[int] = []
+        self._pending_embeddings: list[np.ndarray] = []
+        self._pending_identity_ids: list[np.ndarray] = []
+        self._pending_count = 0
+        self._shards: Optional[list[tuple[np.ndarray, np.ndarray]]] = None
+
+        metadata_path = self.folder / INDEX_METADATA_FILENAME
+        if metadata_path.is_file():
+            metadata = json.loads(metadata_path.read_text())
+            self.dimension = metadata["dimension"]
+            self.shard_size = metadata["shard_size"]
+            self._shard_sizes = metadata["shard_sizes"]
+
+    def __len__(self) -> int:
+        return sum(self._shard_sizes) + self._pending_count
+
+    def _shard_paths(self, shard_number: int) -> tuple[Path, Path]:
+        return (
+            self.folder / f"embeddings_{shard_number:05d}.npy",
+            self.folder / f"identity_ids_{shard_number:05d}.npy",
+        )
+
+    def add(self, embeddings: np.ndarray, identity_ids: Union[int, np.ndarray] = UNKNOWN_IDENTITY) -> None:
+        """
+        Add embeddings (normalized and stored as float16). Full shards are written immediately, the rest on flush().
+        Args:
+            embeddings (np.ndarray): Embeddings (N, D).
+            identity_ids (Union[int, np.ndarray]): Identity of all embeddings or of each embedding (N,).
+        """
+        embeddings = normalize_embeddings(embeddings).reshape(-1, self.dimension)
+        identity_ids = np.broadcast_to(np.asarray(identity_ids, dtype=np.int64), (len(embeddings),))
+
+        self._pending_embeddings.append(embeddings.astype(np.float16))
+        self._pending_identity_ids.append(identity_ids.copy())
+        self._pending_count += len(embeddings)
+
+        while self._pending_count >= self.shard_size:
+            self._write_shard(self.shard_size)
+
+    def _write_shard(self, count: int) -> None:
+        """Write the first count pending embeddings as a new shard."""
+        pending_embeddings = np.concatenate(self._pending_embeddings)
+        pending_identity_ids = np.concatenate(self._pending_identity_ids)
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+        embeddings_path, identity_ids_path = self._shard_paths(len(self._shard_sizes))
+        np.save(embeddings_path, pending_embeddings[:count])
+        np.save(identity_ids_path, pending_identity_ids[:count])
+        self._shard_sizes.append(count)
+
+        self._pending_embeddings = [pending_embeddings[count:]] if count < len(pending_embeddings) else []
+        self._pending_identity_ids = [pending_identity_ids[count:]] if count < len(pending_identity_ids) else []
+        self._pending_count -= count
+        self._shards = None
+        self._save_metadata()
+
+    def _save_metadata(self) -> None:
+        metadata = {"dimension": self.dimension, "shard_size": self.shard_size, "shard_sizes": self._shard_sizes}
+        temporary_path = self.folder / f"{INDEX_METADATA_FILENAME}.tmp"
+        temporary_path.write_text(json.dumps(metadata))
+        os.replace(temporary_path, self.folder / INDEX_METADATA_FILENAME)  # atomic, readers never see partial files
+
+    def flush(self) -> None:
+        """Write pending embeddings as a (possibly smaller) shard."""
+        if self._pending_count > 0:
+            self._write_shard(self._pending_count)
+
+    def _load_shards(self) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Get memory-mapped (embeddings, identity ids) of all shards."""
+        if self._pending_count > 0:
+            self.flush()
+        if self._shards is None:
+            self._shards = [
+                tuple(np.load(path, mmap_mode="r") for path in self._shard_paths(shard_number))
+                for shard_number in range(len(self._shard_sizes))
+            ]
+        return self._shards
+
+    def identity_ids(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Get identities of index rows.
+        Args:
+            indices (np.ndarray): Global row indices (any shape, -1 for missing rows).
+        Returns:
+            np.ndarray: Identity ids (same shape, UNKNOWN_IDENTITY for missing rows).
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        shard_starts = np.concatenate([[0], np.cumsum(self._shard_sizes)])
+        identity_ids = np.full(indices.shape, UNKNOWN_IDENTITY, dtype=np.int64)
+        for shard_number, (_, shard_identity_ids) in enumerate(self._load_shards()):
+            in_shard = (indices >= shard_starts[shard_number]) & (indices < shard_starts[shard_number + 1])
+            identity_ids[in_shard] = shard_identity_ids[indices[in_shard] - shard_starts[shard_number]]
+        return identity_ids
+
+    @staticmethod
+    def _search_block(
+        queries: np.ndarray,
+        block_embeddings: np.ndarray,
+        block_identity_ids: np.ndarray,
+        block_start: int,
+        k: int,
+        query_identity_ids: Optional[np.ndarray],
+    ) -> tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """Top-k (unsorted) of one block of index rows, and the best similarity to each query's own identity."""
+        similarities = queries @ block_embeddings.astype(np.float32).T  # BLAS, releases the GIL
+        block_k = min(k, similarities.shape[1])
+        top_columns = np.argpartition(-similarities, block_k - 1, axis=1)[:, :block_k]
+        top_similarities = np.take_along_axis(similarities, top_columns, axis=1)
+
+        true_identity_similarities = None
+        if query_identity_ids is not None:
+            same_identity = query_identity_ids[:, None] == np.asarray(block_identity_ids)[None, :]
+            true_identity_similarities = np.where(same_identity, similarities, -np.inf).max(axis=1)
+
+        return top_similarities, top_columns.astype(np.int64) + block_start, true_identity_similarities
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        query_identity_ids: Optional[np.ndarray] = None,
+        block_size: int = 16384,
+        query_block_size: int = 1024,
+        num_threads: Optional[int] = None,
+    ) -> SearchResult:
+        """
+        Exact top-k cosine similarity search.
+        Args:
+            queries (np.ndarray): Query embeddings (Q, D).
+            k (int): Number of neighbours.
+            query_identity_ids (Optional[np.ndarray]): True identity of each query (Q,); if given, the best
+                similarity to that identity is computed in the same pass.
+            block_size (int): Number of index rows multiplied at once (memory: query_block_size x block_size floats
+                per thread).
+            query_block_size (int): Number of queries processed at once.
+            num_threads (Optional[int]): Worker threads (default: CPU count).
+        Returns:
+            SearchResult: Neighbours of each query.
+        """
+        queries = normalize_embeddings(queries).reshape(-1, self.dimension)
+        if query_identity_ids is not None:
+            query_identity_ids = np.asarray(query_identity_ids, dtype=np.int64)
+
+        shards = self._load_shards()
+        shard_starts = np.concatenate([[0], np.cumsum(self._shard_sizes)]).astype(np.int64)
+        blocks = [
+            (shard_number, block_start, min(block_start + block_size, shard_size))
+            for shard_number, shard_size in enumerate(self._shard_sizes)
+            for block_start in range(0, shard_size, block_size)
+        ]
+
+        similarities = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+        true_identity_similarities = (
+            np.full(len(queries), -np.inf, dtype=np.float32) if query_identity_ids is not None else None
+        )
+
+        with ThreadPoolExecutor(max_workers=num_threads or os.cpu_count()) as executor:
+            for query_start in range(0, len(queries), query_block_size):
+                query_slice = slice(query_start, query_start + query_block_size)
+                block_queries = queries[query_slice]
+                block_query_identity_ids = query_identity_ids[query_slice] if query_identity_ids is not None else None
+
+                block_results = executor.map(
+                    lambda block: self._search_block(
+                        block_queries,
+                        shards[block[0]][0][block[1] : block[2]],
+                        shards[block[0]][1][block[1] : block[2]],
+                        int(shard_starts[block[0]]) + block[1],
+                        k,
+                        block_query_identity_ids,
+                    ),
+                    blocks,
+                )
+
+                # merge the running top-k with the top-k of each block
+                merged_similarities, merged_indices = [similarities[query_slice]], [indices[query_slice]]
+                for block_similarities, block_indices, block_true_similarities in block_results:
+                    merged_similarities.append(block_similarities)
+                    merged_indices.append(block_indices)
+                    if block_true_similarities is not None:
+                        np.maximum(
+                            true_identity_similarities[query_slice],
+                            block_true_similarities,
+                            out=true_identity_similarities[query_slice],
+                        )
+                    if len(merged_similarities) > 8:
+                        merged_similarities, merged_indices = self._merge_top_k(merged_similarities, merged_indices, k)
+                        merged_similarities, merged_indices = [merged_similarities], [merged_indices]
+
+                similarities[query_slice], indices[query_slice] = self._merge_top_k(
+                    merged_similarities, merged_indices, k
+                )
+
+        return SearchResult(similarities, indices, self.identity_ids(indices), true_identity_similarities)
+
+    @staticmethod
+    def _merge_top_k(
+        similarities: list[np.ndarray], indices: list[np.ndarray], k: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Merge candidate lists into the top-k sorted by decreasing similarity."""
+        similarities, indices = np.concatenate(similarities, axis=1), np.concatenate(indices, axis=1)
+        order = np.argsort(-similarities, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(similarities, order, axis=1), np.take_along_axis(indices, order, axis=1)
+
+
+@dataclass
+class LeakageReport:
+    """De-identification leakage of anonymized faces measured against an index of original faces."""
+
+    queries: int = 0
+    k: int = 0
+    match_threshold: float = 0.0
+    true_identity_rank_1_rate: float = 0.0  # anonymized face is closest to its own original subject (re-identified)
+    true_identity_top_k_rate: float = 0.0  # own original subject among the k nearest identities
+    true_identity_mean_reciprocal_rank: float = 0.0  # ranks beyond k count as 0
+    true_identity_match_rate: float = 0.0  # similarity to the own subject above match_threshold
+    collision_rate: float = 0.0  # nearest other subject (among the k neighbours) above match_threshold
+    original_anonymized_similarity: Optional[Dict[str, Any]] = None  # statistics of paired similarities
+    true_identity_similarity: Optional[Dict[str, Any]] = None
+    nearest_other_identity_similarity: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def identity_ranks(identity_ids: np.ndarray, true_identity_ids: np.ndarray) -> np.ndarray:
+    """
+    Rank of the true identity among the distinct identities of each query's neighbours.
+    Args:
+        identity_ids (np.ndarray): Identities of the sorted neighbours (Q, k).
+        true_identity_ids (np.ndarray): True identity of each query (Q,).
+    Returns:
+        np.ndarray: 1-based ranks (Q,), 0 if the true identity is not among the neighbours.
+    """
+    identity_ids = np.asarray(identity_ids)
+    # a neighbour starts a new identity if no earlier neighbour of the query has the same identity
+    earlier_same_identity = (identity_ids[:, :, None] == identity_ids[:, None, :]) & np.tri(
+        identity_ids.shape[1], k=-1, dtype=bool
+    )
+    first_of_identity = ~earlier_same_identity.any(axis=2) & (identity_ids != UNKNOWN_IDENTITY)
+    distinct_rank = np.cumsum(first_of_identity, axis=1)
+
+    is_true = identity_ids == np.asarray(true_identity_ids)[:, None]
+    found = is_true.any(axis=1)
+    first_true = np.argmax(is_true, axis=1)
+    return np.where(found, distinct_rank[np.arange(len(identity_ids)), first_true], 0)
+
+
+def evaluate_leakage(
+    index: EmbeddingIndex,
+    anonymized_embeddings: np.ndarray,
+    true_identity_ids: np.ndarray,
+    original_embeddings: Optional[np.ndarray] = None,
+    k: int = 10,
+    match_threshold: float = 0.4,
+    **search_parameters,
+) -> LeakageReport:
+    """
+    Measure how much identity the anonymized faces leak: how close each anonymized face is to its own original
+    subject in an index of original faces, and whether it collides with another subject.
+    Args:
+        index (EmbeddingIndex): Index of original face embeddings labelled by subject.
+        anonymized_embeddings (np.ndarray): Embeddings of anonymized faces (Q, D).
+        true_identity_ids (np.ndarray): Original subject of each anonymized face (Q,).
+        original_embeddings (Optional[np.ndarray]): Embedding of the corresponding original face (Q, D), for the
+            paired original-vs-anonymized similarity.
+        k (int): Number of searched neighbours (ranks beyond k are not resolved).
+        match_threshold (float): Cosine similarity above which two faces are considered the same person.
+        search_parameters: Passed to EmbeddingIndex.search (block sizes, threads).
+    Returns:
+        LeakageReport: Leakage metrics.
+    """
+    true_identity_ids = np.asarray(true_identity_ids, dtype=np.int64)
+    result = index.search(anonymized_embeddings, k, query_identity_ids=true_identity_ids, **search_parameters)
+
+    ranks = identity_ranks(result.identity_ids, true_identity_ids)
+    other_identity = (result.identity_ids != true_identity_ids[:, None]) & (result.indices >= 0)
+    nearest_other_similarities = np.where(other_identity, result.similarities, -np.inf).max(axis=1)
+
+    report = LeakageReport(queries=len(true_identity_ids), k=k, match_threshold=match_threshold)
+    if report.queries == 0:
+        return report
+
+    report.true_identity_rank_1_rate = float(np.mean(ranks == 1))
+    report.true_identity_top_k_rate = float(np.mean(ranks > 0))
+    report.true_identity_mean_reciprocal_rank = float(np.mean(np.where(ranks > 0, 1 / np.maximum(ranks, 1), 0)))
+    report.true_identity_match_rate = float(np.mean(result.true_identity_similarities > match_threshold))
+    report.collision_rate = float(np.mean(nearest_other_similarities > match_threshold))
+
+    true_identity_statistics = RunningStatistics()
+    true_identity_statistics.update(result.true_identity_similarities[np.isfinite(result.true_identity_similarities)])
+    report.true_identity_similarity = true_identity_statistics.to_dict()
+    nearest_other_statistics = RunningStatistics()
+    nearest_other_statistics.update(nearest_other_similarities[np.isfinite(nearest_other_similarities)])
+    report.nearest_other_identity_similarity = nearest_other_statistics.to_dict()
+
+    if original_embeddings is not None:
+        paired_statistics = RunningStatistics()
+        paired_statistics.update(
+            np.sum(normalize_embeddings(original_embeddings) * normalize_embeddings(anonymized_embeddings), axis=1)
+        )
+        report.original_anonymized_similarity = paired_statistics.to_dict()
+
+    return report
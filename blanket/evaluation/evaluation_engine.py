@@ -0,0 +1,462 @@
+"""Streaming evaluation of an anonymized video against its original."""
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from blanket.constants.enums.anonymization_enums import MatchingMethod
+from blanket.constants.enums.evaluation_enums import EvaluationMetric
+from blanket.core.detectors.base_detectors import BaseFaceDetector
+from blanket.core.objects.primitives import VideoPrimitive
+from blanket.evaluation.matching import match_detections
+from blanket.settings.evaluation_settings import EvaluationSettings
+from blanket.settings.logging_settings import RateLimitedProgress, get_process_logger
+
+_END_OF_STREAM = None
+
+process_logger = get_process_logger()
+
+
+@dataclass
+class RunningStatistics:
+    """Mean, standard deviation, minimum and maximum of a stream of values in constant memory (Welford)."""
+
+    count: int = 0
+    mean: float = 0.0
+    _sum_of_squared_deviations: float = field(default=0.0, repr=False)
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add values to the statistics.
+        Args:
+            values (np.ndarray): New values (any shape).
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+
+        batch_count, batch_mean = len(values), float(values.mean())
+        total_count = self.count + batch_count
+        delta = batch_mean - self.mean
+        self._sum_of_squared_deviations += (
+            float(((values - batch_mean) ** 2).sum()) + delta**2 * self.count * batch_count / total_count
+        )
+        self.mean += delta * batch_count / total_count
+        self.count = total_count
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+
+    @property
+    def std(self) -> float:
+        """Get population standard deviation of the values."""
+        return float(np.sqrt(self._sum_of_squared_deviations / self.count)) if self.count > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.count == 0:
+            return {"count": 0}
+        return {"count": self.count, "mean": self.mean, "std": self.std, "min": self.minimum, "max": self.maximum}
+
+
+class TrackAssigner:
+    """
+    Assigns track ids to detections of consecutive evaluated frames by IoU matching with the last box of each track.
+    Only tracks seen in the last max_missed_frames + 1 frames are kept, so the memory does not grow with the video.
+    """
+
+    def __init__(self, min_intersection_over_union: float = 0.3, max_missed_frames: int = 0):
+        self.min_intersection_over_union = min_intersection_over_union
+        self.max_missed_frames = max_missed_frames
+        self._track_ids = np.zeros(0, dtype=np.int64)
+        self._track_boxes = np.zeros((0, 4), dtype=np.float64)
+        self._track_missed_frames = np.zeros(0, dtype=np.int64)
+        self._next_track_id = 0
+
+    @property
+    def active_track_ids(self) -> np.ndarray:
+        """Get ids of the tracks that can still be continued."""
+        return self._track_ids
+
+    def update(self, boxes_ltrb: np.ndarray) -> np.ndarray:
+        """
+        Assign track ids to the detections of the next frame.
+        Args:
+            boxes_ltrb (np.ndarray): Boxes (N, 4) in [left, top, right, bottom] format.
+        Returns:
+            np.ndarray: Track id of each box (N,).
+        """
+        boxes_ltrb = np.asarray(boxes_ltrb, dtype=np.float64).reshape(-1, 4)
+        track_rows, box_rows = match_detections(
+            self._track_boxes, boxes_ltrb, min_intersection_over_union=self.min_intersection_over_union
+        )
+
+        track_ids = np.empty(len(boxes_ltrb), dtype=np.int64)
+        track_ids[box_rows] = self._track_ids[track_rows]
+        new_box_rows = np.setdiff1d(np.arange(len(boxes_ltrb)), box_rows)
+        track_ids[new_box_rows] = np.arange(self._next_track_id, self._next_track_id + len(new_box_rows))
+        self._next_track_id += len(new_box_rows)
+
+        self._track_missed_frames += 1
+        self._track_boxes[track_rows] = boxes_ltrb[box_rows]
+        self._track_missed_frames[track_rows] = 0
+        self._track_ids = np.concatenate([self._track_ids, track_ids[new_box_rows]])
+        self._track_boxes = np.concatenate([self._track_boxes, boxes_ltrb[new_box_rows]])
+        self._track_missed_frames = np.concatenate([self._track_missed_frames, np.zeros(len(new_box_rows), np.int64)])
+
+        alive = self._track_missed_frames <= self.max_missed_frames
+        self._track_ids = self._track_ids[alive]
+        self._track_boxes = self._track_boxes[alive]
+        self._track_missed_frames = self._track_missed_frames[alive]
+        return track_ids
+
+
+@dataclass
+class EvaluationReport:
+    """Aggregated results of one evaluated video pair."""
+
+    original_video: str
+    anonymized_video: str
+    evaluated_frames: int = 0
+    original_faces: int = 0
+    anonymized_faces: int = 0
+    redetected_faces: int = 0  # original faces detected at the same place in the anonymized video
+    redetected_faces_with_lookback: int = 0  # also counting redetections in the previous evaluated frames
+    incorrect_redetections: int = 0  # anonymized detections without an original face
+    identity_switches: int = 0  # changes of the anonymized track matched to an original track
+    original_anonymized_similarity: RunningStatistics = field(default_factory=RunningStatistics)
+    anonymized_identity_consistency: RunningStatistics = field(default_factory=RunningStatistics)
+    video_seconds: float = 0.0  # duration of the evaluated part of the video
+    elapsed_seconds: float = 0.0
+
+    @property
+    def redetection_rate(self) -> float:
+        """Get ratio of original faces redetected in the anonymized video."""
+        return self.redetected_faces_with_lookback / self.original_faces if self.original_faces > 0 else 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        """Get evaluated video duration per second of evaluation (> 1 means faster than real time)."""
+        return self.video_seconds / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        report = asdict(self)
+        report["original_anonymized_similarity"] = self.original_anonymized_similarity.to_dict()
+        report["anonymized_identity_consistency"] = self.anonymized_identity_consistency.to_dict()
+        report["redetection_rate"] = self.redetection_rate
+        report["realtime_factor"] = self.realtime_factor
+        return report
+
+
+class StreamingEvaluator:
+    """
+    Evaluates an anonymized video against its original. Both videos are decoded in lockstep by background threads
+    (bounded queues), faces are detected on both streams in one batch per evaluation_batch_size frame pairs and
+    matched with vectorized IoU/center distance. Only per-track state of currently visible faces and running
+    statistics are kept, so the memory does not depend on the video length.
+    """
+
+    def __init__(
+        self,
+        face_detector: BaseFaceDetector,
+        evaluation_settings: EvaluationSettings,
+        face_embedder: Optional[Callable[[np.ndarray, list], np.ndarray]] = None,
+        queue_size: int = 32,
+    ):
+        """
+        Args:
+            face_detector (BaseFaceDetector): Detector used on both videos.
+            evaluation_settings (EvaluationSettings): Sampling, matching and metric settings.
+            face_embedder (Optional[Callable]): Function (image, detections) -> normalized embeddings (N, D), e.g.
+                FaceFusionFaceEmbedder; embedding similarities are skipped if None.
+            queue_size (int): Maximal number of decoded frames waiting per video.
+        """
+        self.face_detector = face_detector
+        self.settings = evaluation_settings
+        self.face_embedder = face_embedder
+        self.queue_size = queue_size
+
+        metrics = {EvaluationMetric(metric) for metric in evaluation_settings.metrics}
+        self.evaluate_redetections = (
+            EvaluationMetric.DETECTION_ACCURACY in metrics and evaluation_settings.evaluate_redetections
+        )
+        self.evaluate_identity = EvaluationMetric.IDENTITY_CONSISTENCY in metrics
+        self.evaluate_identity_switches = self.evaluate_identity and evaluation_settings.evaluate_identity_switches
+
+        self._stop_decoding = threading.Event()
+        self._thread_exception: Optional[BaseException] = None
+
+    def sampled_frame_indices(self, total_frames: int) -> range:
+        """
+        Get indices of the evaluated frames (every evaluation_skipped_frames + 1-th, at most max_evaluated_frames).
+        Args:
+            total_frames (int): Number of frames of the shorter video.
+        Returns:
+            range: Evaluated frame indices.
+        """
+        frame_indices = range(0, total_frames, self.settings.evaluation_skipped_frames + 1)
+        if self.settings.max_evaluated_frames is not None:
+            frame_indices = frame_indices[: self.settings.max_evaluated_frames]
+        return frame_indices
+
+    def _decode_frames(self, video: VideoPrimitive, frame_indices: range, decoded_frames: queue.Queue) -> None:
+        """
+        Decoder thread: read the sampled frames. Skipped frames are still decoded (grab) since the sampled frames
+        depend on them, sampling saves the detection and matching time, not the decoding time.
+        """
+        try:
+            for index in frame_indices:
+                if self._stop_decoding.is_set():
+                    break
+                if not self._put_decoded(decoded_frames, video.load_frame_as_array(index)):
+                    break
+        except BaseException as e:
+            self._thread_exception = e
+        finally:
+            self._put_decoded(decoded_frames, _END_OF_STREAM)
+
+    def _put_decoded(self, decoded_frames: queue.Queue, item: Any) -> bool:
+        """
+        Put an item into a bounded queue, giving up once decoding is stopped (the queue is no longer consumed, so a
+        blocking put could wait forever).
+        Returns:
+            bool: Whether the item was put.
+        """
+        while not self._stop_decoding.is_set():
+            try:
+                decoded_frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _next_batch(self, original_frames: queue.Queue, anonymized_frames: queue.Queue) -> tuple[list[tuple], bool]:
+        """
+        Collect up to evaluation_batch_size frame pairs.
+        Returns:
+            tuple: (frame pairs, whether the end of one of the streams was reached)
+        """
+        batch = []
+        while len(batch) < self.settings.evaluation_batch_size:
+            original_frame, anonymized_frame = original_frames.get(), anonymized_frames.get()
+            if original_frame is _END_OF_STREAM or anonymized_frame is _END_OF_STREAM:
+                return batch, True
+            batch.append((original_frame, anonymized_frame))
+        return batch, False
+
+    def evaluate(self, original_video_path: str, anonymized_video_path: str) -> EvaluationReport:
+        """
+        Evaluate the anonymized video against the original video.
+        Args:
+            original_video_path (str): Path to the original video.
+            anonymized_video_path (str): Path to the anonymized video (same frame count and resolution).
+        Returns:
+            EvaluationReport: Aggregated metrics.
+        """
+        start_time = time.time()
+        report = EvaluationReport(str(original_video_path), str(anonymized_video_path))
+
+        # frames are decoded once by the evaluator's own threads -> no prefetch and no cache
+        original_video = VideoPrimitive(Path(original_video_path), frame_cache_size=0, prefetch_frames=0)
+        anonymized_video = VideoPrimitive(Path(anonymized_video_path), frame_cache_size=0, prefetch_frames=0)
+
+        with original_video, anonymized_video:
+            if (original_video.width, original_video.height) != (anonymized_video.width, anonymized_video.height):
+                raise ValueError(
+                    f"Videos have different resolutions: {original_video.width}x{original_video.height} vs. "
+                    f"{anonymized_video.width}x{anonymized_video.height}"
+                )
+            frame_indices = self.sampled_frame_indices(min(original_video.total_frames, anonymized_video.total_frames))
+            process_logger.info(
+                f"Evaluating {len(frame_indices)} frame pairs of {original_video_path} vs. {anonymized_video_path}"
+            )
+
+            self._stop_decoding.clear()
+            self._thread_exception = None
+            original_frames = queue.Queue(maxsize=self.queue_size)
+            anonymized_frames = queue.Queue(maxsize=self.queue_size)
+            decoders = [
+                threading.Thread(target=self._decode_frames, args=(video, frame_indices, frames), daemon=True)
+                for video, frames in ((original_video, original_frames), (anonymized_video, anonymized_frames))
+            ]
+            for decoder in decoders:
+                decoder.start()
+
+            try:
+                progress = RateLimitedProgress(process_logger, len(frame_indices), "Evaluated", "frames")
+                self._evaluate_stream(original_frames, anonymized_frames, report, progress)
+            finally:
+                # unblock and stop the decoders (they may be waiting on a full queue)
+                self._stop_decoding.set()
+                for frames in (original_frames, anonymized_frames):
+                    while not frames.empty():
+                        frames.get_nowait()
+                for decoder in decoders:
+                    decoder.join()
+
+            if self._thread_exception is not None:
+                raise self._thread_exception
+
+            if report.evaluated_frames > 0:
+                last_evaluated_frame = frame_indices[report.evaluated_frames - 1]
+                report.video_seconds = (last_evaluated_frame + 1) / original_video.fps if original_video.fps else 0.0
+
+        report.elapsed_seconds = time.time() - start_time
+        process_logger.info(
+            f"Evaluated {report.evaluated_frames} frames in {report.elapsed_seconds:.2f}s "
+            f"({report.realtime_factor:.1f}x real time), redetection rate {report.redetection_rate:.3f}, "
+            f"{report.identity_switches} identity switches"
+        )
+        return report
+
+    def _evaluate_stream(
+        self,
+        original_frames: queue.Queue,
+        anonymized_frames: queue.Queue,
+        report: EvaluationReport,
+        progress: RateLimitedProgress,
+    ) -> None:
+        """Consume the decoded frame pairs batch by batch and update the report."""
+        lookback = self.settings.max_frame_detection_lookback
+        original_tracks = TrackAssigner(self.settings.tracking_min_intersection_over_union, lookback)
+        anonymized_tracks = TrackAssigner(self.settings.tracking_min_intersection_over_union, lookback)
+        recent_anonymized_boxes: deque[np.ndarray] = deque(maxlen=lookback)
+        # per original track: id of the matched anonymized track and its last anonymized embedding
+        matched_anonymized_track: Dict[int, int] = {}
+        last_anonymized_embedding: Dict[int, np.ndarray] = {}
+
+        end_of_stream = False
+        while not end_of_stream:
+            batch, end_of_stream = self._next_batch(original_frames, anonymized_frames)
+            if len(batch) == 0:
+                break
+
+            detections = self.face_detector.detect_batch(
+                [original for original, _ in batch] + [anonymized for _, anonymized in batch]
+            )
+            for (original_frame, anonymized_frame), original_detections, anonymized_detections in zip(
+                batch, detections[: len(batch)], detections[len(batch) :]
+            ):
+                original_ltrb = np.asarray([d.left_top_right_bottom for d in original_detections]).reshape(-1, 4)
+                anonymized_ltrb = np.asarray([d.left_top_right_bottom for d in anonymized_detections]).reshape(-1, 4)
+                anonymized_confidences = np.asarray(
+                    [np.nan if d.confidence is None else d.confidence for d in anonymized_detections]
+                )
+
+                original_rows, anonymized_rows = match_detections(
+                    original_ltrb,
+                    anonymized_ltrb,
+                    self.settings.detection_matching_method,
+                    self.settings.min_intersection_over_union,
+                    self.settings.max_detection_center_distance,
+                    anonymized_confidences,
+                )
+
+                report.evaluated_frames += 1
+                report.original_faces += len(original_ltrb)
+                report.anonymized_faces += len(anonymized_ltrb)
+
+                if self.evaluate_redetections:
+                    self._update_redetections(
+                        report, original_ltrb, anonymized_ltrb, original_rows, recent_anonymized_boxes
+                    )
+                recent_anonymized_boxes.append(anonymized_ltrb)
+
+                if not self.evaluate_identity:
+                    continue
+
+                original_track_ids = original_tracks.update(original_ltrb)
+                anonymized_track_ids = anonymized_tracks.update(anonymized_ltrb)
+
+                if self.evaluate_identity_switches:
+                    for original_track_id, anonymized_track_id in zip(
+                        original_track_ids[original_rows], anonymized_track_ids[anonymized_rows]
+                    ):
+                        previous_track_id = matched_anonymized_track.get(int(original_track_id))
+                        if previous_track_id is not None and previous_track_id != anonymized_track_id:
+                            report.identity_switches += 1
+                        matched_anonymized_track[int(original_track_id)] = int(anonymized_track_id)
+
+                if self.face_embedder is not None and len(original_rows) > 0:
+                    self._update_embedding_similarities(
+                        report,
+                        original_frame,
+                        anonymized_frame,
+                        [original_detections[row] for row in original_rows],
+                        [anonymized_detections[row] for row in anonymized_rows],
+                        original_track_ids[original_rows],
+                        last_anonymized_embedding,
+                    )
+
+                # forget finished tracks (bounded memory)
+                active_track_ids = set(original_tracks.active_track_ids.tolist())
+                for track_state in (matched_anonymized_track, last_anonymized_embedding):
+                    for track_id in [track_id for track_id in track_state if track_id not in active_track_ids]:
+                        del track_state[track_id]
+
+            progress.update(report.evaluated_frames)
+
+    def _update_redetections(
+        self,
+        report: EvaluationReport,
+        original_ltrb: np.ndarray,
+        anonymized_ltrb: np.ndarray,
+        original_rows: np.ndarray,
+        recent_anonymized_boxes: deque,
+    ) -> None:
+        """Count redetected original faces (also in the previous evaluated frames) and incorrect redetections."""
+        report.redetected_faces += len(original_rows)
+        redetected = np.zeros(len(original_ltrb), dtype=bool)
+        redetected[original_rows] = True
+
+        # confidences of the previous frames are not kept, the confidence method falls back to the closest detection
+        lookback_matching_method = MatchingMethod(self.settings.detection_matching_method)
+        if lookback_matching_method == MatchingMethod.CONFIDENCE:
+            lookback_matching_method = MatchingMethod.DISTANCE
+
+        for previous_anonymized_ltrb in reversed(recent_anonymized_boxes):
+            if redetected.all():
+                break
+            missing_rows = np.flatnonzero(~redetected)
+            matched_rows, _ = match_detections(
+                original_ltrb[missing_rows],
+                previous_anonymized_ltrb,
+                lookback_matching_method,
+                self.settings.min_intersection_over_union,
+                self.settings.max_detection_center_distance,
+            )
+            redetected[missing_rows[matched_rows]] = True
+
+        report.redetected_faces_with_lookback += int(redetected.sum())
+        if self.settings.evaluate_incorrect_redetections:
+            report.incorrect_redetections += len(anonymized_ltrb) - len(original_rows)
+
+    def _update_embedding_similarities(
+        self,
+        report: EvaluationReport,
+        original_frame: np.ndarray,
+        anonymized_frame: np.ndarray,
+        original_detections: list,
+        anonymized_detections: list,
+        original_track_ids: np.ndarray,
+        last_anonymized_embedding: Dict[int, np.ndarray],
+    ) -> None:
+        """Update similarities original <-> anonymized face and anonymized face <-> previous anonymized face."""
+        original_embeddings = self.face_embedder(original_frame, original_detections)
+        anonymized_embeddings = self.face_embedder(anonymized_frame, anonymized_detections)
+        report.original_anonymized_similarity.update(np.sum(original_embeddings * anonymized_embeddings, axis=1))
+
+        previous_embeddings = [last_anonymized_embedding.get(int(track_id)) for track_id in original_track_ids]
+        continued = [position for position, embedding in enumerate(previous_embeddings) if embedding is not None]
+        if len(continued) > 0:
+            report.anonymized_identity_consistency.update(
+                np.sum(anonymized_embeddings[continued] * np.stack([previous_embeddings[p] for p in continued]), axis=1)
+            )
+
+        for track_id, embedding in zip(original_track_ids, anonymized_embeddings):
+            last_anonymized_embedding[int(track_id)] = embedding
@@ -0,0 +1,81 @@
+"""ArcFace identity embeddings of detected faces (through the FaceFusion face landmarker and recognizer)."""
+from typing import Optional
+
+import numpy as np
+
+# WFLW (SPIGA, 98 points) indices of the 5 alignment points: eye centers, nose tip, mouth corners
+WFLW_LANDMARK_5_INDICES = [96, 97, 54, 76, 82]
+
+
+class FaceFusionFaceEmbedder:
+    """
+    Computes normalized ArcFace embeddings of face boxes. The 5 alignment points are taken from 98-point landmarks
+    if the detection has them, otherwise they are estimated by the FaceFusion 2dfan4 landmarker. All faces of a frame
+    go through the recognizer in one batch.
+    """
+
+    def __init__(self, execution_providers: Optional[list[str]] = None):
+        from facefusion import state_manager
+
+        state_manager.init_item("download_providers", ["github", "huggingface"])
+        state_manager.init_item("log_level", "info")
+        state_manager.init_item("execution_providers", execution_providers or ["cpu"])
+        state_manager.init_item("execution_device_ids", ["0"])
+        state_manager.init_item("execution_thread_count", 4)
+        state_manager.init_item("face_landmarker_model", "2dfan4")
+
+        from facefusion import face_landmarker, face_recognizer
+
+        if not face_landmarker.pre_check() or not face_recognizer.pre_check():
+            raise RuntimeError("FaceFusion landmarker/recognizer models are not available")
+
+        self._batched_recognizer: Optional[bool] = None
+
+    @staticmethod
+    def _landmark_5(image_bgr: np.ndarray, detection) -> np.ndarray:
+        """Get the 5 alignment points of a face (from its landmarks or estimated by the landmarker)."""
+        if detection.landmarks is not None and len(detection.landmarks.landmarks) == 98:
+            return detection.landmarks.landmarks[WFLW_LANDMARK_5_INDICES].astype(np.float32)
+
+        from facefusion.face_helper import convert_to_face_landmark_5
+        from facefusion.face_landmarker import detect_face_landmark
+
+        face_landmark_68, _ = detect_face_landmark(image_bgr, detection.left_top_right_bottom.astype(np.float32), 0)
+        return convert_to_face_landmark_5(face_landmark_68)
+
+    def __call__(self, image_bgr: np.ndarray, detections: list) -> np.ndarray:
+        """
+        Compute embeddings of the detected faces.
+        Args:
+            image_bgr (np.ndarray): BGR image.
+            detections (list): List of FaceDetection objects.
+        Returns:
+            np.ndarray: L2-normalized embeddings (len(detections), 512), float32.
+        """
+        from facefusion import face_recognizer
+        from facefusion.face_helper import warp_face_by_face_landmark_5
+
+        if len(detections) == 0:
+            return np.zeros((0, 512), dtype=np.float32)
+
+        model_options = face_recognizer.get_model_options()
+        crops = []
+        for detection in detections:
+            landmark_5 = self._landmark_5(image_bgr, detection)
+            crop, _ = warp_face_by_face_landmark_5(
+                image_bgr, landmark_5, model_options.get("template"), model_options.get("size")
+            )
+            crops.append(crop[:, :, ::-1].transpose(2, 0, 1))
+        crops = (np.stack(crops).astype(np.float32) / 127.5 - 1).astype(np.float32)
+
+        if self._batched_recognizer is None:
+            batch_dimension = face_recognizer.get_inference_pool().get("face_recognizer").get_inputs()[0].shape[0]
+            self._batched_recognizer = not isinstance(batch_dimension, int)
+
+        if self._batched_recognizer:
+            embeddings = face_recognizer.forward(crops)
+        else:
+            embeddings = np.concatenate([face_recognizer.forward(crop[None]) for crop in crops])
+
+        embeddings = embeddings.reshape(len(detections), -1).astype(np.float32)
+        return embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
@@ -0,0 +1,89 @@
+"""Vectorized matching of face detections (between the original and anonymized frame, and over time)."""
+from typing import Optional
+
+import numpy as np
+
+from blanket.constants.enums.anonymization_enums import MatchingMethod
+from blanket.core.objects.detection_table import pairwise_intersection_over_union
+
+
+def pairwise_center_distance(first_ltrb: np.ndarray, second_ltrb: np.ndarray) -> np.ndarray:
+    """
+    Compute Euclidean distances between centers of all pairs of bounding boxes.
+    Args:
+        first_ltrb (np.ndarray): Boxes (N, 4) in [left, top, right, bottom] format
+        second_ltrb (np.ndarray): Boxes (M, 4) in [left, top, right, bottom] format
+    Returns:
+        np.ndarray: Distances in pixels (N, M)
+    """
+    first_ltrb = np.asarray(first_ltrb, dtype=np.float64).reshape(-1, 4)
+    second_ltrb = np.asarray(second_ltrb, dtype=np.float64).reshape(-1, 4)
+    first_centers = (first_ltrb[:, :2] + first_ltrb[:, 2:]) / 2
+    second_centers = (second_ltrb[:, :2] + second_ltrb[:, 2:]) / 2
+    return np.linalg.norm(first_centers[:, None, :] - second_centers[None, :, :], axis=2)
+
+
+def greedy_assignment(scores: np.ndarray, valid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Greedily assign rows to columns in the order of decreasing score (each row and column is used at most once).
+    Args:
+        scores (np.ndarray): Pair scores (N, M), higher is better
+        valid (np.ndarray): Boolean mask (N, M) of the pairs that may be matched
+    Returns:
+        tuple: (matched row indices, matched column indices)
+    """
+    candidate_rows, candidate_columns = np.nonzero(valid)
+    order = np.argsort(-scores[candidate_rows, candidate_columns], kind="stable")
+
+    used_rows = np.zeros(scores.shape[0], dtype=bool)
+    used_columns = np.zeros(scores.shape[1], dtype=bool)
+    matched_rows, matched_columns = [], []
+    for row, column in zip(candidate_rows[order], candidate_columns[order]):
+        if used_rows[row] or used_columns[column]:
+            continue
+        used_rows[row] = used_columns[column] = True
+        matched_rows.append(row)
+        matched_columns.append(column)
+
+    return np.asarray(matched_rows, dtype=np.int64), np.asarray(matched_columns, dtype=np.int64)
+
+
+def match_detections(
+    first_ltrb: np.ndarray,
+    second_ltrb: np.ndarray,
+    matching_method: str = MatchingMethod.IOU,
+    min_intersection_over_union: float = 0.5,
+    max_detection_center_distance: float = 200,
+    second_confidences: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Match two sets of detections one-to-one.
+    Args:
+        first_ltrb (np.ndarray): Boxes (N, 4) in [left, top, right, bottom] format (e.g. original frame)
+        second_ltrb (np.ndarray): Boxes (M, 4) in [left, top, right, bottom] format (e.g. anonymized frame)
+        matching_method (str): intersection_over_union -> highest IoU above min_intersection_over_union,
+            distance -> closest centers within max_detection_center_distance,
+            confidence -> most confident second detection with center within max_detection_center_distance
+        min_intersection_over_union (float): Minimal IoU of matched boxes
+        max_detection_center_distance (float): Maximal center distance of matched boxes in pixels
+        second_confidences (Optional[np.ndarray]): Confidences (M,) of the second detections (confidence method)
+    Returns:
+        tuple: (matched indices into first_ltrb, matched indices into second_ltrb)
+    """
+    matching_method = MatchingMethod(matching_method)
+    if len(first_ltrb) == 0 or len(second_ltrb) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    if matching_method == MatchingMethod.IOU:
+        scores = pairwise_intersection_over_union(first_ltrb, second_ltrb)
+        return greedy_assignment(scores, scores >= min_intersection_over_union)
+
+    distances = pairwise_center_distance(first_ltrb, second_ltrb)
+    valid = distances <= max_detection_center_distance
+    if matching_method == MatchingMethod.DISTANCE:
+        return greedy_assignment(-distances, valid)
+
+    if second_confidences is None:
+        raise ValueError("Confidence matching requires confidences of the second detections")
+    confidences = np.nan_to_num(np.asarray(second_confidences, dtype=np.float64), nan=0.0)
+    return greedy_assignment(np.broadcast_to(confidences[None, :], distances.shape), valid)
@@ -1,7 +1,9 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 from typing import Literal, Optional
 
+import yaml
+
 
 @dataclass
 class EvaluationSettings:
@@ -11,10 +13,30 @@ class EvaluationSettings:
     max_detection_center_distance: int = 200
 
     evaluate_incorrect_redetections: bool = True
+    evaluate_redetections: bool = True
+    evaluate_identity_switches: bool = True
+    metrics: list[str] = field(default_factory=lambda: ["identity_consistency", "detection_accuracy"])
 
     max_evaluated_frames: Optional[int] = None
     evaluation_skipped_frames: int = 0
 
+    evaluation_batch_size: int = 16
+    tracking_min_intersection_over_union: float = 0.3  # IoU linking detections of consecutive evaluated frames
+
+    @staticmethod
+    def from_config(config_path: Path) -> "EvaluationSettings":
+        """
+        Load evaluation settings from a YAML file, ignoring keys of other settings (e.g. the shared defaults.yaml).
+        Args:
+            config_path (Path): Path to YAML config.
+        Returns:
+            EvaluationSettings: Loaded settings object.
+        """
+        with open(config_path, "r") as f:
+            config = yaml.safe_load(f) or {}
+        field_names = {settings_field.name for settings_field in fields(EvaluationSettings)}
+        return EvaluationSettings(**{key: value for key, value in config.items() if key in field_names})
+
     @property
     def sdwebui_server_url(self):
         """
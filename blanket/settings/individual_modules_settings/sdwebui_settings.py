@@ -3,12 +3,21 @@ from dataclasses import dataclass
 
 @dataclass
 class SDWebUISettings:
-    pass
-    # parameters: SDWebUIParameters
+    ipv4_address: str = "127.0.0.1"
+    port: str = "7861"
 
-    # ipv4_address: str = "127.0.0.1"
-    # port: str = "7861"
+    parameters_path: str = ""  # payload template, empty -> configs/module_parameters/sdwebui_parameters.json
 
-    # @property
-    # def server_url(self):
-    #     return f"http://{self.ipv4_address}:{self.port}"
+    request_timeout: float = 600.0  # seconds, SDXL inpainting with ControlNet can take minutes on busy servers
+    max_retries: int = 3
+    retry_backoff_factor: float = 1.0
+    max_concurrent_requests: int = 4
+
+    @property
+    def server_url(self):
+        """
+        Get the server URL for SDWebUI using stored IP and port.
+        Returns:
+            str: Server URL string.
+        """
+        return f"http://{self.ipv4_address}:{self.port}"
@@ -1,9 +1,16 @@
+import atexit
+import json
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
+import sys
+import threading
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 
 import yaml
 
@@ -11,6 +18,175 @@ PROCESS_LOGGER_NAME = "process_logger"
 ANONYMIZATION_RESULT_LOGGER_NAME = "anonymization_result_logger"
 FRAMES_WITHOUT_DETECTIONS_LOGGER_NAME = "frames_without_detections_logger"
 
+_default_console_listener: Optional[logging.handlers.QueueListener] = None
+_default_console_lock = threading.Lock()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats records as one JSON object per line: time, level, event (the message) and the fields of extra data."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(
+            {
+                "time": round(record.created, 6),
+                "level": record.levelname.lower(),
+                "event": record.getMessage(),
+                **getattr(record, "data", {}),
+            }
+        )
+
+
+class BatchedFileHandler(logging.FileHandler):
+    """
+    File handler that writes records without flushing and flushes only every flush_every_records records or once
+    flush_interval_seconds passed (it runs in the queue listener thread, so file I/O never blocks the logging thread).
+    flush() always writes all buffered records.
+    """
+
+    def __init__(
+        self,
+        filename: Path,
+        mode: str = "a",
+        flush_every_records: int = 256,
+        flush_interval_seconds: float = 1.0,
+    ):
+        super().__init__(filename, mode=mode)
+        self.flush_every_records = flush_every_records
+        self.flush_interval_seconds = flush_interval_seconds
+        self._records_since_flush = 0
+        self._last_flush_time = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write the record to the file buffer, flush when the batch is full or the interval elapsed."""
+        if self.stream is None:
+            if self.mode != "w" or not self._closed:
+                self.stream = self._open()
+        if not self.stream:
+            return
+
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+            return
+
+        self._records_since_flush += 1
+        if self._records_since_flush >= self.flush_every_records:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self) -> None:
+        """Flush if records are buffered and flush_interval_seconds passed since the last flush."""
+        if self._records_since_flush > 0 and time.monotonic() - self._last_flush_time >= self.flush_interval_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered records to the file."""
+        with self.lock:
+            super().flush()
+            self._records_since_flush = 0
+            self._last_flush_time = time.monotonic()
+
+
+class BatchedQueueListener(logging.handlers.QueueListener):
+    """
+    Queue listener that also flushes its BatchedFileHandlers when no record arrived for flush_interval_seconds, so
+    buffered records reach the files even if logging stops.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.SimpleQueue,
+        *handlers: logging.Handler,
+        respect_handler_level: bool = False,
+        flush_interval_seconds: float = 1.0,
+    ):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.flush_interval_seconds = flush_interval_seconds
+
+    def dequeue(self, block: bool) -> Any:
+        """Wait for the next record, flushing the due file handlers whenever the wait times out."""
+        while True:
+            try:
+                return self.queue.get(block, self.flush_interval_seconds)
+            except queue.Empty:
+                if not block:
+                    raise
+                for handler in self.handlers:
+                    if isinstance(handler, BatchedFileHandler):
+                        handler.flush_if_due()
+
+
+class RateLimitedProgress:
+    """Logs progress (count, rate and ETA) at most once per interval, so it can be updated from every frame."""
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        total: Optional[int] = None,
+        description: str = "Processed",
+        unit: str = "frames",
+        interval_seconds: float = 5.0,
+    ):
+        self.logger = logger
+        self.total = total
+        self.description = description
+        self.unit = unit
+        self.interval_seconds = interval_seconds
+        self._start_time = time.monotonic()
+        self._last_log_time = float("-inf")
+
+    def update(self, done: int) -> None:
+        """
+        Report the number of finished items (logged only if the interval elapsed or everything is done).
+        Args:
+            done (int): Number of finished items.
+        """
+        now = time.monotonic()
+        finished = self.total is not None and done >= self.total
+        if now - self._last_log_time < self.interval_seconds and not finished:
+            return
+        self._last_log_time = now
+
+        elapsed = now - self._start_time
+        rate = done / elapsed if elapsed > 0 else 0.0
+        if self.total:
+            eta_seconds = (self.total - done) / rate if rate > 0 else 0.0
+            self.logger.info(
+                f"  {self.description} {done}/{self.total} {self.unit} ({done / self.total * 100:.1f}%) | "
+                f"{rate:.2f} {self.unit}/s | ETA: {int(eta_seconds // 60)}m {int(eta_seconds % 60)}s"
+            )
+        else:
+            self.logger.info(f"  {self.description} {done} {self.unit} | {rate:.2f} {self.unit}/s")
+
+
+def get_process_logger() -> logging.Logger:
+    """
+    Get the process logger. If LoggingSettings didn't configure it, a non-blocking console output (queue handler,
+    plain messages like print) is attached, so pipelines can log without any configuration.
+    Returns:
+        logging.Logger: Process logger.
+    """
+    global _default_console_listener
+
+    process_logger = logging.getLogger(PROCESS_LOGGER_NAME)
+    with _default_console_lock:
+        if not process_logger.handlers:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(logging.Formatter("%(message)s"))
+            log_queue = queue.SimpleQueue()
+            _default_console_listener = logging.handlers.QueueListener(log_queue, console_handler)
+            _default_console_listener.start()
+            atexit.register(_default_console_listener.stop)
+
+            process_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            process_logger.setLevel(logging.INFO)
+            process_logger.propagate = False
+    return process_logger
+
 
 @dataclass
 class LoggingSettings:
@@ -19,26 +195,61 @@ class LoggingSettings:
     process_log_filepath: Path = Path("logs/process_log.txt")
 
     log_anonymization_result: bool = True
-    anonymization_result_log_filepath: Path = Path("logs/anonymization_results.txt")
+    anonymization_result_log_filepath: Path = Path("logs/anonymization_results.jsonl")
 
     log_frames_without_detections: bool = True
-    frames_without_detections_log_filepath: Path = Path("logs/frames_without_detections.txt")
+    frames_without_detections_log_filepath: Path = Path("logs/frames_without_detections.jsonl")
+
+    # file handlers run in a background listener thread and flush in batches
+    flush_every_records: int = 256
+    flush_interval_seconds: float = 1.0
 
     process_logger: logging.Logger = field(init=False)
     anonymization_result_logger: logging.Logger = field(init=False)
     frames_without_detections_logger: logging.Logger = field(init=False)
 
+    _queue_listener: Optional[BatchedQueueListener] = field(default=None, init=False, repr=False)
+
     def __post_init__(self):
         """
-        Initialize loggers after dataclass creation.
+        Initialize loggers after dataclass creation. All loggers put records into one queue, a single listener thread
+        formats them and writes them to the console and files.
         """
-        self._setup_process_logger()
+        log_queue = queue.SimpleQueue()
+        handlers = self._setup_process_logger(log_queue)
         if self.log_anonymization_result:
-            self._setup_result_logger()
+            handlers += self._setup_result_logger(log_queue)
         if self.log_frames_without_detections:
-            self._setup_frames_without_detections_logger()
+            handlers += self._setup_frames_without_detections_logger(log_queue)
+
+        self._queue_listener = BatchedQueueListener(
+            log_queue, *handlers, respect_handler_level=True, flush_interval_seconds=self.flush_interval_seconds
+        )
+        self._queue_listener.start()
+        atexit.register(self.stop)
+
+    @staticmethod
+    def _attach_queue(logger_name: str, log_queue: queue.SimpleQueue, handlers: list[logging.Handler]):
+        """
+        Route a logger into the queue; its handlers are used by the listener only for records of this logger.
+        Returns:
+            list[logging.Handler]: The handlers (for the listener).
+        """
+        logger = logging.getLogger(logger_name)
+        for handler in list(logger.handlers):  # handlers of a previous configuration
+            logger.removeHandler(handler)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.propagate = False  # stops messages from being propagated to ancestor loggers
 
-    def _setup_process_logger(self):
+        for handler in handlers:
+            handler.addFilter(logging.Filter(logger_name))
+        return handlers
+
+    def _batched_file_handler(self, filepath: Path) -> BatchedFileHandler:
+        os.makedirs(Path(filepath).parent, exist_ok=True)
+        return BatchedFileHandler(filepath, "w", self.flush_every_records, self.flush_interval_seconds)
+
+    def _setup_process_logger(self, log_queue: queue.SimpleQueue) -> list[logging.Handler]:
         """
         Set up the process logger for console and file output.
         """
@@ -52,42 +263,35 @@ class LoggingSettings:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(self.process_console_log_level.upper())
         console_handler.setFormatter(console_formatter)
-        self.process_logger.addHandler(console_handler)
 
         # file handler
-        os.makedirs(self.process_log_filepath.parent, exist_ok=True)
-        file_handler = logging.FileHandler(self.process_log_filepath, mode="w")
+        file_handler = self._batched_file_handler(self.process_log_filepath)
         file_handler.setLevel(self.process_file_log_level.upper())
         file_handler.setFormatter(file_formatter)
-        self.process_logger.addHandler(file_handler)
 
-        self.process_logger.propagate = False  # stops messages from being propagated to ancestor loggers
+        return self._attach_queue(PROCESS_LOGGER_NAME, log_queue, [console_handler, file_handler])
 
-    def _setup_result_logger(self):
+    def _setup_result_logger(self, log_queue: queue.SimpleQueue) -> list[logging.Handler]:
         """
-        Set up the logger for anonymization results.
+        Set up the logger for anonymization results (JSON lines).
         """
         self.anonymization_result_logger = logging.getLogger(ANONYMIZATION_RESULT_LOGGER_NAME)
         self.anonymization_result_logger.setLevel(logging.INFO)
 
-        os.makedirs(self.anonymization_result_log_filepath.parent, exist_ok=True)
-        file_handler = logging.FileHandler(self.anonymization_result_log_filepath, mode="w")
-        file_handler.setFormatter(logging.Formatter("%(message)s"))
-        self.anonymization_result_logger.addHandler(file_handler)
-        self.anonymization_result_logger.propagate = False
+        file_handler = self._batched_file_handler(self.anonymization_result_log_filepath)
+        file_handler.setFormatter(JsonLinesFormatter())
+        return self._attach_queue(ANONYMIZATION_RESULT_LOGGER_NAME, log_queue, [file_handler])
 
-    def _setup_frames_without_detections_logger(self):
+    def _setup_frames_without_detections_logger(self, log_queue: queue.SimpleQueue) -> list[logging.Handler]:
         """
-        Set up the logger for frames without detections.
+        Set up the logger for frames without detections (JSON lines).
         """
         self.frames_without_detections_logger = logging.getLogger(FRAMES_WITHOUT_DETECTIONS_LOGGER_NAME)
         self.frames_without_detections_logger.setLevel(logging.INFO)
 
-        os.makedirs(self.frames_without_detections_log_filepath.parent, exist_ok=True)
-        file_handler = logging.FileHandler(self.frames_without_detections_log_filepath, mode="w")
-        file_handler.setFormatter(logging.Formatter("%(message)s"))
-        self.frames_without_detections_logger.addHandler(file_handler)
-        self.frames_without_detections_logger.propagate = False
+        file_handler = self._batched_file_handler(self.frames_without_detections_log_filepath)
+        file_handler.setFormatter(JsonLinesFormatter())
+        return self._attach_queue(FRAMES_WITHOUT_DETECTIONS_LOGGER_NAME, log_queue, [file_handler])
 
     def log_frame_without_detection(self, frame_number: int):
         """
@@ -96,4 +300,25 @@ class LoggingSettings:
             frame_number (int): Frame index.
         """
         if self.log_frames_without_detections:
-            self.frames_without_detections_logger.info(f"Frame {frame_number:06d} - no faces detected.")
+            self.frames_without_detections_logger.info("no_faces_detected", extra={"data": {"frame": frame_number}})
+
+    def log_frame_result(self, frame_number: int, **result: Any):
+        """
+        Log the anonymization result of a frame as one JSON line (e.g. number of faces, timings).
+        Args:
+            frame_number (int): Frame index.
+            result: JSON-serializable result fields.
+        """
+        if self.log_anonymization_result:
+            self.anonymization_result_logger.info("frame_anonymized", extra={"data": {"frame": frame_number, **result}})
+
+    def stop(self):
+        """
+        Process all queued records, flush and close the files (called automatically at exit).
+        """
+        if self._queue_listener is None:
+            return
+        self._queue_listener.stop()
+        for handler in self._queue_listener.handlers:
+            handler.close()
+        self._queue_listener = None
@@ -23,6 +23,10 @@ class MainSettings:
     anonymization_padding_method: str = field(default="ratio")
     anonymization_padding_ratio: float = field(default=0.75)
     anonymization_padding_constant: int = field(default=96)
+    image_output_mode: str = field(default="mosaic")
+    io_workers: int = field(default=8)
+    detection_batch_size: int = field(default=16)
+    skip_up_to_date_outputs: bool = field(default=True)
 
     @staticmethod
     def from_configs(config_path: Path, defaults_path: Path) -> "MainSettings":
@@ -57,4 +61,8 @@ class MainSettings:
             anonymization_padding_method=defaults.get("anonymization_padding_method", "ratio"),
             anonymization_padding_ratio=defaults.get("anonymization_padding_ratio", 0.75),
             anonymization_padding_constant=defaults.get("anonymization_padding_constant", 96),
+            image_output_mode=defaults.get("image_output_mode", "mosaic"),
+            io_workers=defaults.get("io_workers", 8),
+            detection_batch_size=defaults.get("detection_batch_size", 16),
+            skip_up_to_date_outputs=defaults.get("skip_up_to_date_outputs", True),
         )
@@ -85,6 +85,7 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('trim_frame_start', args.get('trim_frame_start'))
 	apply_state_item('trim_frame_end', args.get('trim_frame_end'))
 	apply_state_item('temp_frame_format', args.get('temp_frame_format'))
+	apply_state_item('temp_frame_mode', args.get('temp_frame_mode'))
 	apply_state_item('keep_temp', args.get('keep_temp'))
 	# output creation
 	apply_state_item('output_image_quality', args.get('output_image_quality'))
@@ -112,6 +113,13 @@ def apply_args(args : Args, apply_state_item : ApplyStateItem) -> None:
 	apply_state_item('execution_device_ids', args.get('execution_device_ids'))
 	apply_state_item('execution_providers', args.get('execution_providers'))
 	apply_state_item('execution_thread_count', args.get('execution_thread_count'))
+	apply_state_item('execution_intra_op_thread_count', args.get('execution_intra_op_thread_count'))
+	apply_state_item('execution_inter_op_thread_count', args.get('execution_inter_op_thread_count'))
+	apply_state_item('execution_mode', args.get('execution_mode'))
+	apply_state_item('execution_graph_optimization_level', args.get('execution_graph_optimization_level'))
+	apply_state_item('execution_disable_memory_arena', args.get('execution_disable_memory_arena'))
+	apply_state_item('execution_quantized_models', args.get('execution_quantized_models'))
+	apply_state_item('execution_profiling', args.get('execution_profiling'))
 	# download
 	apply_state_item('download_providers', args.get('download_providers'))
 	apply_state_item('download_scope', args.get('download_scope'))
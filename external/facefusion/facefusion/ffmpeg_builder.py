@@ -235,6 +235,10 @@ def capture_video() -> List[Command]:
 	return [ '-f', 'rawvideo', '-pix_fmt', 'rgb24' ]
 
 
+def set_raw_video(pixel_format : str) -> List[Command]:
+	return [ '-f', 'rawvideo', '-pix_fmt', pixel_format ]
+
+
 def ignore_video_stream() -> List[Command]:
 	return [ '-vn' ]
 
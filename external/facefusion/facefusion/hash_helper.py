@@ -1,14 +1,32 @@
 import os
+import threading
 import zlib
 from typing import Optional
 
-from facefusion.filesystem import get_file_name, is_file
+from facefusion.filesystem import create_directory, get_file_name, is_file, move_file, remove_file
+from facefusion.json import read_json, write_json
+from facefusion.types import HashValidation, HashValidationSet
+
+HASH_CHUNK_SIZE : int = 4 * 1024 * 1024
+HASH_VALIDATION_SET_PATH : str = os.path.join('.caches', 'hash_validations.json')
+HASH_VALIDATION_SET : HashValidationSet = {}
+HASH_VALIDATION_LOCK : threading.Lock = threading.Lock()
 
 
 def create_hash(content : bytes) -> str:
 	return format(zlib.crc32(content), '08x')
 
 
+def create_file_hash(file_path : str) -> str:
+	file_crc = 0
+
+	with open(file_path, 'rb') as file:
+		for file_chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+			file_crc = zlib.crc32(file_chunk, file_crc)
+
+	return format(file_crc, '08x')
+
+
 def validate_hash(validate_path : str) -> bool:
 	hash_path = get_hash_path(validate_path)
 
@@ -16,10 +34,47 @@ def validate_hash(validate_path : str) -> bool:
 		with open(hash_path) as hash_file:
 			hash_content = hash_file.read()
 
-		with open(validate_path, 'rb') as validate_file:
-			validate_content = validate_file.read()
+		return get_file_hash(validate_path) == hash_content
+	return False
+
+
+def get_file_hash(file_path : str) -> str:
+	file_stat = os.stat(file_path)
+	hash_validation_key = os.path.abspath(file_path)
+
+	with HASH_VALIDATION_LOCK:
+		cached_hash_validation = read_hash_validation_set().get(hash_validation_key)
+
+		# the size, modification time and inode identify an unchanged file without reading it
+		if cached_hash_validation and cached_hash_validation.get('size') == file_stat.st_size and cached_hash_validation.get('modified_time') == file_stat.st_mtime_ns and cached_hash_validation.get('inode') == file_stat.st_ino:
+			return cached_hash_validation.get('hash')
+
+		hash_validation : HashValidation =\
+		{
+			'size': file_stat.st_size,
+			'modified_time': file_stat.st_mtime_ns,
+			'inode': file_stat.st_ino,
+			'hash': create_file_hash(file_path)
+		}
+		HASH_VALIDATION_SET[hash_validation_key] = hash_validation
+		write_hash_validation_set(HASH_VALIDATION_SET)
+		return hash_validation.get('hash')
+
+
+def read_hash_validation_set() -> HashValidationSet:
+	if not HASH_VALIDATION_SET:
+		HASH_VALIDATION_SET.update(read_json(HASH_VALIDATION_SET_PATH) or {})
+	return HASH_VALIDATION_SET
+
+
+def write_hash_validation_set(hash_validation_set : HashValidationSet) -> bool:
+	temp_hash_validation_set_path = HASH_VALIDATION_SET_PATH.replace('.json', '.' + str(os.getpid()) + '.temp.json')
 
-		return create_hash(validate_content) == hash_content
+	try:
+		create_directory(os.path.dirname(HASH_VALIDATION_SET_PATH))
+		return write_json(temp_hash_validation_set_path, hash_validation_set) and move_file(temp_hash_validation_set_path, HASH_VALIDATION_SET_PATH)
+	except OSError:
+		remove_file(temp_hash_validation_set_path)
 	return False
 
 
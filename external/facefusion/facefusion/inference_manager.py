@@ -1,18 +1,23 @@
 import importlib
+import os
 import random
 from time import sleep, time
-from typing import List
+from typing import List, Optional
 
-from onnxruntime import InferenceSession
+import onnxruntime
+from onnxruntime import ExecutionMode, GraphOptimizationLevel, InferenceSession, SessionOptions
 
 from facefusion import logger, process_manager, state_manager, translator
 from facefusion.app_context import detect_app_context
 from facefusion.common_helper import is_windows
 from facefusion.execution import create_inference_session_providers, has_execution_provider
 from facefusion.exit_helper import fatal_exit
-from facefusion.filesystem import get_file_name, is_file
+from facefusion.filesystem import create_directory, get_file_name, is_file, move_file, remove_file
+from facefusion.hash_helper import create_hash, get_file_hash, get_hash_path
+from facefusion.inference_profiler import INFERENCE_PROFILE_DIRECTORY_PATH, collect_inference_profiles, get_profile_file_prefix, register_inference_pool
+from facefusion.model_quantizer import resolve_quantized_model_source_set
 from facefusion.time_helper import calculate_end_time
-from facefusion.types import DownloadSet, ExecutionProvider, InferencePool, InferencePoolSet
+from facefusion.types import DownloadSet, ExecutionGraphOptimizationLevel, ExecutionProvider, InferencePool, InferencePoolSet, InferenceSessionOptionSet, InferenceSessionProvider
 
 INFERENCE_POOL_SET : InferencePoolSet =\
 {
@@ -26,8 +31,13 @@ def get_inference_pool(module_name : str, model_names : List[str], model_source_
 		sleep(0.5)
 	execution_device_ids = state_manager.get_item('execution_device_ids')
 	execution_providers = resolve_execution_providers(module_name)
+	inference_session_options = resolve_inference_session_options(module_name)
 	app_context = detect_app_context()
 
+	if state_manager.get_item('execution_quantized_models'):
+		model_names = model_names + [ 'quantized' ]
+		model_source_set = resolve_quantized_model_source_set(model_source_set)
+
 	for execution_device_id in execution_device_ids:
 		inference_context = get_inference_context(module_name, model_names, execution_device_id, execution_providers)
 
@@ -36,19 +46,28 @@ def get_inference_pool(module_name : str, model_names : List[str], model_source_
 		if app_context == 'ui' and INFERENCE_POOL_SET.get('cli').get(inference_context):
 			INFERENCE_POOL_SET['ui'][inference_context] = INFERENCE_POOL_SET.get('cli').get(inference_context)
 		if not INFERENCE_POOL_SET.get(app_context).get(inference_context):
-			INFERENCE_POOL_SET[app_context][inference_context] = create_inference_pool(model_source_set, execution_device_id, execution_providers)
+			if inference_session_options.get('enable_profiling'):
+				inference_session_options['profile_file_prefix'] = get_profile_file_prefix(module_name, execution_device_id)
+			INFERENCE_POOL_SET[app_context][inference_context] = create_inference_pool(model_source_set, execution_device_id, execution_providers, inference_session_options)
+
+			if inference_session_options.get('enable_profiling'):
+				register_inference_pool(module_name, INFERENCE_POOL_SET.get(app_context).get(inference_context))
 
 	current_inference_context = get_inference_context(module_name, model_names, random.choice(execution_device_ids), execution_providers)
 	return INFERENCE_POOL_SET.get(app_context).get(current_inference_context)
 
 
-def create_inference_pool(model_source_set : DownloadSet, execution_device_id : int, execution_providers : List[ExecutionProvider]) -> InferencePool:
+def create_inference_pool(model_source_set : DownloadSet, execution_device_id : int, execution_providers : List[ExecutionProvider], inference_session_options : Optional[InferenceSessionOptionSet] = None) -> InferencePool:
 	inference_pool : InferencePool = {}
 
 	for model_name in model_source_set.keys():
 		model_path = model_source_set.get(model_name).get('path')
 		if is_file(model_path):
-			inference_pool[model_name] = create_inference_session(model_path, execution_device_id, execution_providers)
+			model_session_options = inference_session_options
+
+			if inference_session_options and inference_session_options.get('enable_profiling'):
+				model_session_options = { **inference_session_options, 'profile_file_prefix': inference_session_options.get('profile_file_prefix') + '.' + model_name } #type:ignore[assignment, operator]
+			inference_pool[model_name] = create_inference_session(model_path, execution_device_id, execution_providers, model_session_options)
 
 	return inference_pool
 
@@ -61,19 +80,32 @@ def clear_inference_pool(module_name : str, model_names : List[str]) -> None:
 	if is_windows() and has_execution_provider('directml'):
 		INFERENCE_POOL_SET[app_context].clear()
 
+	if state_manager.get_item('execution_quantized_models'):
+		model_names = model_names + [ 'quantized' ]
+
 	for execution_device_id in execution_device_ids:
 		inference_context = get_inference_context(module_name, model_names, execution_device_id, execution_providers)
 		if INFERENCE_POOL_SET.get(app_context).get(inference_context):
+			collect_inference_profiles(INFERENCE_POOL_SET.get(app_context).get(inference_context))
 			del INFERENCE_POOL_SET[app_context][inference_context]
 
 
-def create_inference_session(model_path : str, execution_device_id : int, execution_providers : List[ExecutionProvider]) -> InferenceSession:
+def create_inference_session(model_path : str, execution_device_id : int, execution_providers : List[ExecutionProvider], inference_session_options : Optional[InferenceSessionOptionSet] = None) -> InferenceSession:
 	model_file_name = get_file_name(model_path)
+	inference_session_options = { **get_inference_session_options(), **(inference_session_options or {}) } #type:ignore[assignment]
 	start_time = time()
 
 	try:
 		inference_session_providers = create_inference_session_providers(execution_device_id, execution_providers)
-		inference_session = InferenceSession(model_path, providers = inference_session_providers)
+		optimized_model_path = resolve_optimized_model_path(model_path, execution_providers, inference_session_options)
+
+		if optimized_model_path:
+			if is_file(optimized_model_path) or save_optimized_model(model_path, optimized_model_path, inference_session_providers, inference_session_options):
+				model_path = optimized_model_path
+			else:
+				logger.debug(translator.get('caching_optimized_model_failed').format(model_name = model_file_name), __name__)
+
+		inference_session = InferenceSession(model_path, sess_options = create_session_options(inference_session_options), providers = inference_session_providers)
 		logger.debug(translator.get('loading_model_succeeded').format(model_name = model_file_name, seconds = calculate_end_time(start_time)), __name__)
 		return inference_session
 
@@ -82,6 +114,95 @@ def create_inference_session(model_path : str, execution_device_id : int, execut
 		fatal_exit(1)
 
 
+def get_inference_session_options() -> InferenceSessionOptionSet:
+	return\
+	{
+		'intra_op_thread_count': state_manager.get_item('execution_intra_op_thread_count') or 0,
+		'inter_op_thread_count': state_manager.get_item('execution_inter_op_thread_count') or 0,
+		'execution_mode': state_manager.get_item('execution_mode') or 'sequential',
+		'graph_optimization_level': state_manager.get_item('execution_graph_optimization_level') or 'all',
+		'disable_memory_arena': bool(state_manager.get_item('execution_disable_memory_arena')),
+		'enable_profiling': bool(state_manager.get_item('execution_profiling'))
+	}
+
+
+def create_session_options(inference_session_options : InferenceSessionOptionSet) -> SessionOptions:
+	session_options = SessionOptions()
+	session_options.intra_op_num_threads = inference_session_options.get('intra_op_thread_count')
+	session_options.inter_op_num_threads = inference_session_options.get('inter_op_thread_count')
+	session_options.graph_optimization_level = resolve_graph_optimization_level(inference_session_options.get('graph_optimization_level'))
+
+	if inference_session_options.get('execution_mode') == 'parallel':
+		session_options.execution_mode = ExecutionMode.ORT_PARALLEL
+	else:
+		session_options.execution_mode = ExecutionMode.ORT_SEQUENTIAL
+
+	if inference_session_options.get('disable_memory_arena'):
+		session_options.enable_cpu_mem_arena = False
+		session_options.enable_mem_pattern = False
+
+	if inference_session_options.get('enable_profiling'):
+		session_options.enable_profiling = True
+		session_options.profile_file_prefix = inference_session_options.get('profile_file_prefix') or os.path.join(INFERENCE_PROFILE_DIRECTORY_PATH, 'inference')
+		create_directory(os.path.dirname(session_options.profile_file_prefix))
+	return session_options
+
+
+def resolve_graph_optimization_level(graph_optimization_level : ExecutionGraphOptimizationLevel) -> GraphOptimizationLevel:
+	if graph_optimization_level == 'disabled':
+		return GraphOptimizationLevel.ORT_DISABLE_ALL
+	if graph_optimization_level == 'basic':
+		return GraphOptimizationLevel.ORT_ENABLE_BASIC
+	if graph_optimization_level == 'extended':
+		return GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+	return GraphOptimizationLevel.ORT_ENABLE_ALL
+
+
+def resolve_cached_graph_optimization_level(graph_optimization_level : ExecutionGraphOptimizationLevel) -> ExecutionGraphOptimizationLevel:
+	# layout optimizations of the all level depend on the cpu and are applied when the cached model is loaded
+	if graph_optimization_level == 'all':
+		return 'extended'
+	return graph_optimization_level
+
+
+def resolve_optimized_model_path(model_path : str, execution_providers : List[ExecutionProvider], inference_session_options : InferenceSessionOptionSet) -> Optional[str]:
+	cached_graph_optimization_level = resolve_cached_graph_optimization_level(inference_session_options.get('graph_optimization_level'))
+
+	# providers compiling their own graphs use their own caches
+	if cached_graph_optimization_level != 'disabled' and set(execution_providers).issubset([ 'cpu', 'cuda' ]):
+		model_hash = get_model_hash(model_path)
+		optimized_model_context = '.'.join([ model_hash, onnxruntime.__version__, cached_graph_optimization_level ] + list(execution_providers))
+		optimized_model_file_name = get_file_name(model_path) + '.' + create_hash(optimized_model_context.encode()) + '.onnx'
+		return os.path.join('.caches', optimized_model_file_name)
+	return None
+
+
+def get_model_hash(model_path : str) -> str:
+	hash_path = get_hash_path(model_path)
+
+	if is_file(hash_path):
+		with open(hash_path) as hash_file:
+			return hash_file.read().strip()
+
+	return get_file_hash(model_path)
+
+
+def save_optimized_model(model_path : str, optimized_model_path : str, inference_session_providers : List[InferenceSessionProvider], inference_session_options : InferenceSessionOptionSet) -> bool:
+	temp_model_path = optimized_model_path.replace('.onnx', '.' + str(os.getpid()) + '.temp.onnx')
+	session_options = create_session_options(inference_session_options)
+	session_options.graph_optimization_level = resolve_graph_optimization_level(resolve_cached_graph_optimization_level(inference_session_options.get('graph_optimization_level')))
+	session_options.optimized_model_filepath = temp_model_path
+	session_options.enable_profiling = False
+
+	try:
+		create_directory(os.path.dirname(optimized_model_path))
+		InferenceSession(model_path, sess_options = session_options, providers = inference_session_providers)
+		return move_file(temp_model_path, optimized_model_path)
+	except Exception:
+		remove_file(temp_model_path)
+		return False
+
+
 def get_inference_context(module_name : str, model_names : List[str], execution_device_id : int, execution_providers : List[ExecutionProvider]) -> str:
 	inference_context = '.'.join([ module_name ] + model_names + [ str(execution_device_id) ] + list(execution_providers))
 	return inference_context
@@ -93,3 +214,12 @@ def resolve_execution_providers(module_name : str) -> List[ExecutionProvider]:
 	if hasattr(module, 'resolve_execution_providers'):
 		return getattr(module, 'resolve_execution_providers')()
 	return state_manager.get_item('execution_providers')
+
+
+def resolve_inference_session_options(module_name : str) -> InferenceSessionOptionSet:
+	module = importlib.import_module(module_name)
+	inference_session_options = get_inference_session_options()
+
+	if hasattr(module, 'resolve_inference_session_options'):
+		inference_session_options.update(getattr(module, 'resolve_inference_session_options')())
+	return inference_session_options
@@ -0,0 +1,140 @@
+import atexit
+import os
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+from facefusion import logger, translator
+from facefusion.filesystem import create_directory
+from facefusion.json import read_json, write_json
+from facefusion.types import InferencePool, InferenceProfile, InferenceProfileOperator, InferenceProfileReport, InferenceProfileSource
+
+INFERENCE_PROFILE_DIRECTORY_PATH : str = '.profiles'
+INFERENCE_PROFILE_POOLS : List[Tuple[str, InferencePool]] = []
+INFERENCE_PROFILE_SOURCES : List[InferenceProfileSource] = []
+
+
+def get_module_label(module_name : str) -> str:
+	module_names = module_name.split('.')
+
+	if module_names[-1] == 'core':
+		return module_names[-2]
+	return module_names[-1]
+
+
+def get_profile_file_prefix(module_name : str, execution_device_id : int) -> str:
+	return os.path.join(INFERENCE_PROFILE_DIRECTORY_PATH, get_module_label(module_name) + '.' + str(execution_device_id))
+
+
+def register_inference_pool(module_name : str, inference_pool : InferencePool) -> None:
+	INFERENCE_PROFILE_POOLS.append((module_name, inference_pool))
+
+
+def collect_inference_profiles(inference_pool : InferencePool) -> None:
+	for module_name, profile_inference_pool in list(INFERENCE_PROFILE_POOLS):
+		if profile_inference_pool is inference_pool:
+			INFERENCE_PROFILE_POOLS.remove((module_name, profile_inference_pool))
+
+			for model_name, inference_session in inference_pool.items():
+				profile_path = inference_session.end_profiling()
+
+				if profile_path:
+					INFERENCE_PROFILE_SOURCES.append(
+					{
+						'module_name': module_name,
+						'model_name': model_name,
+						'profile_path': profile_path
+					})
+
+
+def end_inference_profiling() -> Optional[str]:
+	for _, inference_pool in list(INFERENCE_PROFILE_POOLS):
+		collect_inference_profiles(inference_pool)
+
+	if INFERENCE_PROFILE_SOURCES:
+		inference_profile_report = create_inference_profile_report(INFERENCE_PROFILE_SOURCES)
+		report_path = os.path.join(INFERENCE_PROFILE_DIRECTORY_PATH, 'report.json')
+		INFERENCE_PROFILE_SOURCES.clear()
+
+		for inference_profile in inference_profile_report:
+			logger.info(translator.get('inference_profile_summary').format(module_label = get_module_label(inference_profile.get('module_name')), model_name = inference_profile.get('model_name'), run_count = inference_profile.get('run_count'), run_duration = inference_profile.get('run_duration'), operators = format_inference_profile_operators(inference_profile.get('operators'))), __name__)
+
+		create_directory(INFERENCE_PROFILE_DIRECTORY_PATH)
+		if write_json(report_path, inference_profile_report): #type:ignore[arg-type]
+			logger.info(translator.get('writing_inference_profile_report_succeeded').format(report_path = report_path), __name__)
+			return report_path
+	return None
+
+
+def create_inference_profile_report(inference_profile_sources : List[InferenceProfileSource]) -> InferenceProfileReport:
+	profile_path_set : Dict[Tuple[str, str], List[str]] = {}
+
+	for inference_profile_source in inference_profile_sources:
+		profile_key = (inference_profile_source.get('module_name'), inference_profile_source.get('model_name'))
+		profile_path_set.setdefault(profile_key, []).append(inference_profile_source.get('profile_path'))
+
+	inference_profile_report = [ create_inference_profile(module_name, model_name, profile_paths) for (module_name, model_name), profile_paths in profile_path_set.items() ]
+	return sorted(inference_profile_report, key = lambda inference_profile: inference_profile.get('run_duration'), reverse = True)
+
+
+def create_inference_profile(module_name : str, model_name : str, profile_paths : List[str]) -> InferenceProfile:
+	run_count = 0
+	run_duration = 0
+	operator_durations : Counter[Tuple[str, str]] = Counter()
+	operator_call_counts : Counter[Tuple[str, str]] = Counter()
+	operator_input_shapes : Dict[Tuple[str, str], Counter[str]] = {}
+
+	for profile_path in profile_paths:
+		profile_events = cast(List[Dict[str, Any]], read_json(profile_path) or [])
+
+		for profile_event in profile_events:
+			if profile_event.get('cat') == 'Session' and profile_event.get('name') == 'model_run':
+				run_count += 1
+				run_duration += profile_event.get('dur')
+
+			# kernel events hold the operator type and the input shapes of a single node execution
+			if profile_event.get('cat') == 'Node' and profile_event.get('name').endswith('_kernel_time'):
+				profile_event_args = profile_event.get('args')
+				operator_key = (profile_event_args.get('op_name'), profile_event_args.get('provider'))
+				operator_durations[operator_key] += profile_event.get('dur')
+				operator_call_counts[operator_key] += 1
+				operator_input_shapes.setdefault(operator_key, Counter())[format_input_type_shapes(profile_event_args.get('input_type_shape', []))] += 1
+
+	total_operator_duration = sum(operator_durations.values())
+	inference_profile_operators : List[InferenceProfileOperator] = []
+
+	for operator_key, operator_duration in operator_durations.most_common():
+		op_type, provider = operator_key
+		inference_profile_operators.append(
+		{
+			'op_type': op_type,
+			'provider': provider,
+			'duration': round(operator_duration / 1000, 3),
+			'share': round(operator_duration / max(total_operator_duration, 1), 4),
+			'call_count': operator_call_counts.get(operator_key),
+			'input_shapes': [ input_shape for input_shape, _ in operator_input_shapes.get(operator_key).most_common(3) ]
+		})
+
+	return\
+	{
+		'module_name': module_name,
+		'model_name': model_name,
+		'run_count': run_count,
+		'run_duration': round(run_duration / 1000, 3),
+		'operators': inference_profile_operators
+	}
+
+
+def format_input_type_shapes(input_type_shapes : List[Dict[str, List[Any]]]) -> str:
+	input_shapes = []
+
+	for input_type_shape in input_type_shapes:
+		for input_type, input_shape in input_type_shape.items():
+			input_shapes.append(input_type + '[' + ','.join(map(str, input_shape)) + ']')
+	return ' '.join(input_shapes)
+
+
+def format_inference_profile_operators(inference_profile_operators : List[InferenceProfileOperator], operator_limit : int = 3) -> str:
+	return ', '.join(inference_profile_operator.get('op_type') + ' ' + str(round(inference_profile_operator.get('share') * 100, 1)) + '%' for inference_profile_operator in inference_profile_operators[:operator_limit])
+
+
+atexit.register(end_inference_profiling)
@@ -12,6 +12,9 @@ LOCALS : Locals =\
 		'extracting_frames': 'extracting frames with a resolution of {resolution} and {fps} frames per second',
 		'extracting_frames_succeeded': 'extracting frames succeeded',
 		'extracting_frames_failed': 'extracting frames failed',
+		'streaming_frames': 'streaming frames with a resolution of {resolution} and {fps} frames per second',
+		'streaming_frames_succeeded': 'streaming frames succeeded',
+		'streaming_frames_failed': 'streaming frames failed',
 		'analysing': 'analysing',
 		'extracting': 'extracting',
 		'streaming': 'streaming',
@@ -86,6 +89,11 @@ LOCALS : Locals =\
 		'deleting_corrupt_source': 'deleting corrupt source for {source_file_name}',
 		'loading_model_succeeded': 'loading model {model_name} succeeded in {seconds} seconds',
 		'loading_model_failed': 'loading model {model_name} failed',
+		'caching_optimized_model_failed': 'caching optimized model {model_name} failed',
+		'preprocessing_model_skipped': 'preprocessing model {model_path} for quantization skipped: {exception}',
+		'quantizing_model_failed': 'quantizing model {model_path} failed: {exception}',
+		'inference_profile_summary': '{module_label} {model_name} ran {run_count} times in {run_duration} milliseconds, hottest operators: {operators}',
+		'writing_inference_profile_report_succeeded': 'writing inference profile report to {report_path} succeeded',
 		'time_ago_now': 'just now',
 		'time_ago_minutes': '{minutes} minutes ago',
 		'time_ago_hours': '{hours} hours and {minutes} minutes ago',
@@ -135,6 +143,7 @@ LOCALS : Locals =\
 			'trim_frame_start': 'specify the starting frame of the target video',
 			'trim_frame_end': 'specify the ending frame of the target video',
 			'temp_frame_format': 'specify the temporary resources format',
+			'temp_frame_mode': 'choose to process the video frames through temporary files or stream them through pipes',
 			'keep_temp': 'keep the temporary resources after processing',
 			'output_image_quality': 'specify the image quality which translates to the image compression',
 			'output_image_scale': 'specify the image scale based on the target image',
@@ -160,6 +169,13 @@ LOCALS : Locals =\
 			'execution_device_ids': 'specify the devices used for processing',
 			'execution_providers': 'inference using different providers (choices: {choices}, ...)',
 			'execution_thread_count': 'specify the amount of parallel threads while processing',
+			'execution_intra_op_thread_count': 'specify the amount of threads used within an inference operator (0 uses the runtime default)',
+			'execution_inter_op_thread_count': 'specify the amount of threads running independent inference operators in parallel (0 uses the runtime default)',
+			'execution_mode': 'choose to run the inference operators sequential or parallel',
+			'execution_graph_optimization_level': 'choose the graph optimization level of the inference sessions',
+			'execution_disable_memory_arena': 'disable the memory arena and memory pattern of the inference sessions',
+			'execution_quantized_models': 'use the int8 variants of the models that passed the quantization accuracy gate',
+			'execution_profiling': 'profile the operators of the inference sessions and write a report to the .profiles directory',
 			'video_memory_strategy': 'balance fast processing and low VRAM usage',
 			'system_memory_limit': 'limit the available RAM that can be used while processing',
 			'log_level': 'adjust the message severity displayed in the terminal',
@@ -0,0 +1,180 @@
+import os
+from functools import lru_cache
+from typing import Any, List, Optional
+
+import cv2
+import numpy
+
+import facefusion.choices
+from facefusion import logger, translator
+from facefusion.filesystem import get_file_name, is_file, move_file, remove_file, resolve_relative_path
+from facefusion.hash_helper import create_file_hash, get_hash_path
+from facefusion.json import read_json, write_json
+from facefusion.types import BoundingBox, DownloadSet, Embedding, FaceLandmark68, InferenceInput, QuantizationMetric, QuantizationMode, QuantizedModel, QuantizedModelSet, VisionFrame
+
+QUANTIZED_MODEL_SET_PATH : str = resolve_relative_path('../.assets/models/quantized_models.json')
+
+
+class InferenceInputRecorder:
+	# stands in for an inference session of a pool and keeps copies of the inputs it runs on
+	def __init__(self, inference_session : Any, max_input_count : int) -> None:
+		self.inference_session = inference_session
+		self.max_input_count = max_input_count
+		self.inference_inputs : List[InferenceInput] = []
+
+	def run(self, output_names : Optional[List[str]], input_feed : InferenceInput, *args : Any, **kwargs : Any) -> Any:
+		if len(self.inference_inputs) < self.max_input_count:
+			self.inference_inputs.append({ input_name: numpy.array(input_value) for input_name, input_value in input_feed.items() })
+		return self.inference_session.run(output_names, input_feed, *args, **kwargs)
+
+	def __getattr__(self, name : str) -> Any:
+		return getattr(self.inference_session, name)
+
+
+class InferenceInputReader:
+	# calibration data reader of the onnxruntime quantization (matched by its get_next method)
+	def __init__(self, inference_inputs : List[InferenceInput]) -> None:
+		self.inference_inputs = iter(inference_inputs)
+
+	def get_next(self) -> Optional[InferenceInput]:
+		return next(self.inference_inputs, None)
+
+
+def get_quantized_model_path(model_path : str) -> str:
+	model_directory_path = os.path.dirname(model_path)
+	return os.path.join(model_directory_path, get_file_name(model_path) + '_int8.onnx')
+
+
+@lru_cache()
+def read_quantized_model_set() -> QuantizedModelSet:
+	return read_json(QUANTIZED_MODEL_SET_PATH) or {}
+
+
+def write_quantized_model_set(quantized_model_set : QuantizedModelSet) -> bool:
+	read_quantized_model_set.cache_clear()
+	return write_json(QUANTIZED_MODEL_SET_PATH, quantized_model_set)
+
+
+def register_quantized_model(model_path : str, quantized_model : QuantizedModel) -> bool:
+	quantized_model_set = dict(read_quantized_model_set())
+	quantized_model_set[get_file_name(model_path)] = quantized_model
+	return write_quantized_model_set(quantized_model_set)
+
+
+def resolve_quantized_model_path(model_path : str) -> Optional[str]:
+	quantized_model = read_quantized_model_set().get(get_file_name(model_path))
+
+	if quantized_model and quantized_model.get('passed') and is_file(quantized_model.get('path')):
+		return quantized_model.get('path')
+	return None
+
+
+def resolve_quantized_model_source_set(model_source_set : DownloadSet) -> DownloadSet:
+	quantized_model_source_set : DownloadSet = {}
+
+	for model_name, model_source in model_source_set.items():
+		quantized_model_path = resolve_quantized_model_path(model_source.get('path'))
+
+		if quantized_model_path:
+			quantized_model_source_set[model_name] =\
+			{
+				'url': model_source.get('url'),
+				'path': quantized_model_path
+			}
+		else:
+			quantized_model_source_set[model_name] = model_source
+	return quantized_model_source_set
+
+
+def quantize_model(model_path : str, quantized_model_path : str, quantization_mode : QuantizationMode, calibration_inputs : List[InferenceInput]) -> bool:
+	from onnxruntime.quantization import QuantFormat, QuantType, quantize_dynamic, quantize_static
+	from onnxruntime.quantization.shape_inference import quant_pre_process
+
+	prepared_model_path = quantized_model_path.replace('.onnx', '.prepared.onnx')
+	temp_model_path = quantized_model_path.replace('.onnx', '.' + str(os.getpid()) + '.temp.onnx')
+
+	try:
+		quant_pre_process(model_path, prepared_model_path)
+	except Exception as exception:
+		logger.debug(translator.get('preprocessing_model_skipped').format(model_path = model_path, exception = repr(exception)), __name__)
+		prepared_model_path = model_path
+
+	try:
+		if quantization_mode == 'dynamic':
+			quantize_dynamic(prepared_model_path, temp_model_path, weight_type = QuantType.QInt8)
+		if quantization_mode == 'static':
+			quantize_static(prepared_model_path, temp_model_path, InferenceInputReader(calibration_inputs), quant_format = QuantFormat.QDQ, per_channel = True, activation_type = QuantType.QUInt8, weight_type = QuantType.QInt8)
+	except Exception as exception:
+		logger.error(translator.get('quantizing_model_failed').format(model_path = model_path, exception = repr(exception)), __name__)
+		remove_file(temp_model_path)
+		return False
+	finally:
+		if prepared_model_path != model_path:
+			remove_file(prepared_model_path)
+
+	if move_file(temp_model_path, quantized_model_path):
+		with open(get_hash_path(quantized_model_path), 'w') as hash_file:
+			hash_file.write(create_file_hash(quantized_model_path))
+		return True
+	return False
+
+
+def calculate_intersection_over_union(first_bounding_box : BoundingBox, second_bounding_box : BoundingBox) -> float:
+	intersection_width = max(0.0, min(first_bounding_box[2], second_bounding_box[2]) - max(first_bounding_box[0], second_bounding_box[0]))
+	intersection_height = max(0.0, min(first_bounding_box[3], second_bounding_box[3]) - max(first_bounding_box[1], second_bounding_box[1]))
+	intersection_area = intersection_width * intersection_height
+	first_area = (first_bounding_box[2] - first_bounding_box[0]) * (first_bounding_box[3] - first_bounding_box[1])
+	second_area = (second_bounding_box[2] - second_bounding_box[0]) * (second_bounding_box[3] - second_bounding_box[1])
+	union_area = first_area + second_area - intersection_area
+
+	if union_area > 0:
+		return float(intersection_area / union_area)
+	return 0.0
+
+
+def count_recalled_bounding_boxes(reference_bounding_boxes : List[BoundingBox], bounding_boxes : List[BoundingBox], min_intersection_over_union : float = 0.5) -> int:
+	unmatched_bounding_boxes = list(bounding_boxes)
+	recall_count = 0
+
+	for reference_bounding_box in reference_bounding_boxes:
+		intersection_over_unions = [ calculate_intersection_over_union(reference_bounding_box, bounding_box) for bounding_box in unmatched_bounding_boxes ]
+
+		if intersection_over_unions and max(intersection_over_unions) >= min_intersection_over_union:
+			unmatched_bounding_boxes.pop(int(numpy.argmax(intersection_over_unions)))
+			recall_count += 1
+	return recall_count
+
+
+def calculate_landmark_error(reference_face_landmark_68 : FaceLandmark68, face_landmark_68 : FaceLandmark68, bounding_box : BoundingBox) -> float:
+	bounding_box_size = numpy.sqrt((bounding_box[2] - bounding_box[0]) * (bounding_box[3] - bounding_box[1]))
+	landmark_distances = numpy.linalg.norm(reference_face_landmark_68 - face_landmark_68, axis = 1)
+	return float(numpy.mean(landmark_distances) / max(bounding_box_size, 1.0))
+
+
+def calculate_embedding_cosine(reference_embedding : Embedding, embedding : Embedding) -> float:
+	embedding_norm = numpy.linalg.norm(reference_embedding) * numpy.linalg.norm(embedding)
+	return float(numpy.dot(reference_embedding.ravel(), embedding.ravel()) / max(embedding_norm, 1e-12))
+
+
+def calculate_structural_similarity(reference_vision_frame : VisionFrame, vision_frame : VisionFrame) -> float:
+	reference_vision_frame = cv2.cvtColor(reference_vision_frame, cv2.COLOR_BGR2GRAY).astype(numpy.float64)
+	vision_frame = cv2.cvtColor(vision_frame, cv2.COLOR_BGR2GRAY).astype(numpy.float64)
+	first_constant = (0.01 * 255) ** 2
+	second_constant = (0.03 * 255) ** 2
+
+	reference_mean = cv2.GaussianBlur(reference_vision_frame, (11, 11), 1.5)
+	mean = cv2.GaussianBlur(vision_frame, (11, 11), 1.5)
+	reference_variance = cv2.GaussianBlur(reference_vision_frame ** 2, (11, 11), 1.5) - reference_mean ** 2
+	variance = cv2.GaussianBlur(vision_frame ** 2, (11, 11), 1.5) - mean ** 2
+	covariance = cv2.GaussianBlur(reference_vision_frame * vision_frame, (11, 11), 1.5) - reference_mean * mean
+
+	structural_similarity_map = ((2 * reference_mean * mean + first_constant) * (2 * covariance + second_constant)) / ((reference_mean ** 2 + mean ** 2 + first_constant) * (reference_variance + variance + second_constant))
+	return float(numpy.mean(structural_similarity_map))
+
+
+def is_quantization_passed(quantization_metric : QuantizationMetric, score : float) -> bool:
+	threshold = facefusion.choices.quantization_threshold_set.get(quantization_metric)
+
+	if quantization_metric == 'landmark_error':
+		return score <= threshold
+	return score >= threshold
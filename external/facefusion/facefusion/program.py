@@ -161,8 +161,9 @@ def create_frame_extraction_program() -> ArgumentParser:
 	group_frame_extraction.add_argument('--trim-frame-start', help = translator.get('help.trim_frame_start'), type = int, default = facefusion.config.get_int_value('frame_extraction', 'trim_frame_start'))
 	group_frame_extraction.add_argument('--trim-frame-end', help = translator.get('help.trim_frame_end'), type = int, default = facefusion.config.get_int_value('frame_extraction', 'trim_frame_end'))
 	group_frame_extraction.add_argument('--temp-frame-format', help = translator.get('help.temp_frame_format'), default = config.get_str_value('frame_extraction', 'temp_frame_format', 'png'), choices = facefusion.choices.temp_frame_formats)
+	group_frame_extraction.add_argument('--temp-frame-mode', help = translator.get('help.temp_frame_mode'), default = config.get_str_value('frame_extraction', 'temp_frame_mode', 'disk'), choices = facefusion.choices.temp_frame_modes)
 	group_frame_extraction.add_argument('--keep-temp', help = translator.get('help.keep_temp'), action = 'store_true', default = config.get_bool_value('frame_extraction', 'keep_temp'))
-	job_store.register_step_keys([ 'trim_frame_start', 'trim_frame_end', 'temp_frame_format', 'keep_temp' ])
+	job_store.register_step_keys([ 'trim_frame_start', 'trim_frame_end', 'temp_frame_format', 'temp_frame_mode', 'keep_temp' ])
 	return program
 
 
@@ -237,7 +238,14 @@ def create_execution_program() -> ArgumentParser:
 	group_execution.add_argument('--execution-device-ids', help = translator.get('help.execution_device_ids'), type = int, default = config.get_int_list('execution', 'execution_device_ids', '0'), nargs = '+', metavar = 'EXECUTION_DEVICE_IDS')
 	group_execution.add_argument('--execution-providers', help = translator.get('help.execution_providers').format(choices = ', '.join(available_execution_providers)), default = config.get_str_list('execution', 'execution_providers', get_first(available_execution_providers)), choices = available_execution_providers, nargs = '+', metavar = 'EXECUTION_PROVIDERS')
 	group_execution.add_argument('--execution-thread-count', help = translator.get('help.execution_thread_count'), type = int, default = config.get_int_value('execution', 'execution_thread_count', '8'), choices = facefusion.choices.execution_thread_count_range, metavar = create_int_metavar(facefusion.choices.execution_thread_count_range))
-	job_store.register_job_keys([ 'execution_device_ids', 'execution_providers', 'execution_thread_count' ])
+	group_execution.add_argument('--execution-intra-op-thread-count', help = translator.get('help.execution_intra_op_thread_count'), type = int, default = config.get_int_value('execution', 'execution_intra_op_thread_count', '0'), choices = facefusion.choices.execution_op_thread_count_range, metavar = create_int_metavar(facefusion.choices.execution_op_thread_count_range))
+	group_execution.add_argument('--execution-inter-op-thread-count', help = translator.get('help.execution_inter_op_thread_count'), type = int, default = config.get_int_value('execution', 'execution_inter_op_thread_count', '0'), choices = facefusion.choices.execution_op_thread_count_range, metavar = create_int_metavar(facefusion.choices.execution_op_thread_count_range))
+	group_execution.add_argument('--execution-mode', help = translator.get('help.execution_mode'), default = config.get_str_value('execution', 'execution_mode', 'sequential'), choices = facefusion.choices.execution_modes)
+	group_execution.add_argument('--execution-graph-optimization-level', help = translator.get('help.execution_graph_optimization_level'), default = config.get_str_value('execution', 'execution_graph_optimization_level', 'all'), choices = facefusion.choices.execution_graph_optimization_levels)
+	group_execution.add_argument('--execution-disable-memory-arena', help = translator.get('help.execution_disable_memory_arena'), action = 'store_true', default = config.get_bool_value('execution', 'execution_disable_memory_arena'))
+	group_execution.add_argument('--execution-quantized-models', help = translator.get('help.execution_quantized_models'), action = 'store_true', default = config.get_bool_value('execution', 'execution_quantized_models'))
+	group_execution.add_argument('--execution-profiling', help = translator.get('help.execution_profiling'), action = 'store_true', default = config.get_bool_value('execution', 'execution_profiling'))
+	job_store.register_job_keys([ 'execution_device_ids', 'execution_providers', 'execution_thread_count', 'execution_intra_op_thread_count', 'execution_inter_op_thread_count', 'execution_mode', 'execution_graph_optimization_level', 'execution_disable_memory_arena', 'execution_quantized_models', 'execution_profiling' ])
 	return program
 
 
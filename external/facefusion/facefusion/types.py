@@ -134,6 +134,7 @@ AudioFormat = Literal['flac', 'm4a', 'mp3', 'ogg', 'opus', 'wav']
 ImageFormat = Literal['bmp', 'jpeg', 'png', 'tiff', 'webp']
 VideoFormat = Literal['avi', 'm4v', 'mkv', 'mov', 'mp4', 'mpeg', 'mxf', 'webm', 'wmv']
 TempFrameFormat = Literal['bmp', 'jpeg', 'png', 'tiff']
+TempFrameMode = Literal['disk', 'pipe']
 AudioTypeSet : TypeAlias = Dict[AudioFormat, str]
 ImageTypeSet : TypeAlias = Dict[ImageFormat, str]
 VideoTypeSet : TypeAlias = Dict[VideoFormat, str]
@@ -170,7 +171,57 @@ ModelInitializer : TypeAlias = NDArray[Any]
 ExecutionProvider = Literal['cpu', 'coreml', 'cuda', 'directml', 'openvino', 'migraphx', 'rocm', 'tensorrt']
 ExecutionProviderValue = Literal['CPUExecutionProvider', 'CoreMLExecutionProvider', 'CUDAExecutionProvider', 'DmlExecutionProvider', 'OpenVINOExecutionProvider', 'MIGraphXExecutionProvider', 'ROCMExecutionProvider', 'TensorrtExecutionProvider']
 ExecutionProviderSet : TypeAlias = Dict[ExecutionProvider, ExecutionProviderValue]
+ExecutionMode = Literal['sequential', 'parallel']
+ExecutionGraphOptimizationLevel = Literal['disabled', 'basic', 'extended', 'all']
 InferenceSessionProvider : TypeAlias = Any
+InferenceSessionOptionSet = TypedDict('InferenceSessionOptionSet',
+{
+	'intra_op_thread_count' : int,
+	'inter_op_thread_count' : int,
+	'execution_mode' : ExecutionMode,
+	'graph_optimization_level' : ExecutionGraphOptimizationLevel,
+	'disable_memory_arena' : bool,
+	'enable_profiling' : bool,
+	'profile_file_prefix' : str
+}, total = False)
+InferenceProfileSource = TypedDict('InferenceProfileSource',
+{
+	'module_name' : str,
+	'model_name' : str,
+	'profile_path' : str
+})
+InferenceProfileOperator = TypedDict('InferenceProfileOperator',
+{
+	'op_type' : str,
+	'provider' : str,
+	'duration' : float,
+	'share' : float,
+	'call_count' : int,
+	'input_shapes' : List[str]
+})
+InferenceProfile = TypedDict('InferenceProfile',
+{
+	'module_name' : str,
+	'model_name' : str,
+	'run_count' : int,
+	'run_duration' : float,
+	'operators' : List[InferenceProfileOperator]
+})
+InferenceProfileReport : TypeAlias = List[InferenceProfile]
+QuantizationMode = Literal['dynamic', 'static']
+QuantizationMetric = Literal['detection_recall', 'landmark_error', 'embedding_cosine', 'output_ssim']
+QuantizedModel = TypedDict('QuantizedModel',
+{
+	'path' : str,
+	'mode' : QuantizationMode,
+	'metric' : QuantizationMetric,
+	'score' : float,
+	'threshold' : float,
+	'passed' : bool
+})
+QuantizedModelSet : TypeAlias = Dict[str, QuantizedModel]
+QuantizationThresholdSet : TypeAlias = Dict[QuantizationMetric, float]
+InferenceInput : TypeAlias = Dict[str, NDArray[Any]]
 ValueAndUnit = TypedDict('ValueAndUnit',
 {
 	'value' : int,
@@ -225,6 +276,14 @@ Download = TypedDict('Download',
 	'path' : str
 })
 DownloadSet : TypeAlias = Dict[str, Download]
+HashValidation = TypedDict('HashValidation',
+{
+	'size' : int,
+	'modified_time' : int,
+	'inode' : int,
+	'hash' : str
+})
+HashValidationSet : TypeAlias = Dict[str, HashValidation]
 
 VideoMemoryStrategy = Literal['strict', 'moderate', 'tolerant']
 AppContext = Literal['cli', 'ui']
@@ -300,6 +359,7 @@ StateKey = Literal\
 	'trim_frame_start',
 	'trim_frame_end',
 	'temp_frame_format',
+	'temp_frame_mode',
 	'keep_temp',
 	'output_image_quality',
 	'output_image_scale',
@@ -318,6 +378,13 @@ StateKey = Literal\
 	'execution_device_ids',
 	'execution_providers',
 	'execution_thread_count',
+	'execution_intra_op_thread_count',
+	'execution_inter_op_thread_count',
+	'execution_mode',
+	'execution_graph_optimization_level',
+	'execution_disable_memory_arena',
+	'execution_quantized_models',
+	'execution_profiling',
 	'video_memory_strategy',
 	'system_memory_limit',
 	'log_level',
@@ -370,6 +437,7 @@ State = TypedDict('State',
 	'trim_frame_start' : int,
 	'trim_frame_end' : int,
 	'temp_frame_format' : TempFrameFormat,
+	'temp_frame_mode' : TempFrameMode,
 	'keep_temp' : bool,
 	'output_image_quality' : int,
 	'output_image_scale' : Scale,
@@ -388,6 +456,13 @@ State = TypedDict('State',
 	'execution_device_ids' : List[int],
 	'execution_providers' : List[ExecutionProvider],
 	'execution_thread_count' : int,
+	'execution_intra_op_thread_count' : int,
+	'execution_inter_op_thread_count' : int,
+	'execution_mode' : ExecutionMode,
+	'execution_graph_optimization_level' : ExecutionGraphOptimizationLevel,
+	'execution_disable_memory_arena' : bool,
+	'execution_quantized_models' : bool,
+	'execution_profiling' : bool,
 	'video_memory_strategy' : VideoMemoryStrategy,
 	'system_memory_limit' : int,
 	'log_level' : LogLevel,
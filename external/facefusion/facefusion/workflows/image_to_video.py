@@ -1,5 +1,8 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import subprocess
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from functools import partial
+from typing import Deque, Optional, Tuple
 
 import numpy
 from tqdm import tqdm
@@ -13,8 +16,8 @@ from facefusion.filesystem import filter_audio_paths, is_video
 from facefusion.processors.core import get_processors_modules
 from facefusion.temp_helper import clear_temp_directory, create_temp_directory, move_temp_file, resolve_temp_frame_paths
 from facefusion.time_helper import calculate_end_time
-from facefusion.types import ErrorCode
-from facefusion.vision import conditional_merge_vision_mask, detect_video_resolution, extract_vision_mask, pack_resolution, read_static_image, read_static_images, read_static_video_frame, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, scale_resolution, write_image
+from facefusion.types import ErrorCode, Mask, Resolution, VisionFrame
+from facefusion.vision import conditional_merge_vision_mask, detect_video_resolution, extract_vision_mask, merge_vision_mask, pack_resolution, predict_video_frame_total, read_static_image, read_static_images, read_static_video_frame, restrict_trim_frame, restrict_video_fps, restrict_video_resolution, scale_resolution, write_image
 from facefusion.workflows.core import is_process_stopping
 
 
@@ -28,6 +31,15 @@ def process(start_time : float) -> ErrorCode:
 		restore_audio,
 		partial(finalize_video, start_time)
 	]
+
+	if state_manager.get_item('temp_frame_mode') == 'pipe':
+		tasks =\
+		[
+			setup,
+			stream_frames,
+			restore_audio,
+			partial(finalize_video, start_time)
+		]
 	process_manager.start()
 
 	for task in tasks:
@@ -105,6 +117,99 @@ def process_video() -> ErrorCode:
 	return 0
 
 
+def stream_frames() -> ErrorCode:
+	trim_frame_start, trim_frame_end = restrict_trim_frame(state_manager.get_item('target_path'), state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end'))
+	output_video_resolution = scale_resolution(detect_video_resolution(state_manager.get_item('target_path')), state_manager.get_item('output_video_scale'))
+	temp_video_resolution = restrict_video_resolution(state_manager.get_item('target_path'), output_video_resolution)
+	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
+	stream_frame_total = predict_video_frame_total(state_manager.get_item('target_path'), temp_video_fps, trim_frame_start, trim_frame_end)
+	pixel_format = resolve_pipe_pixel_format()
+	logger.info(translator.get('streaming_frames').format(resolution = pack_resolution(temp_video_resolution), fps = temp_video_fps), __name__)
+
+	frame_reader = ffmpeg.open_frame_reader(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps, trim_frame_start, trim_frame_end, pixel_format)
+	frame_writer = ffmpeg.open_frame_writer(state_manager.get_item('target_path'), temp_video_resolution, temp_video_fps, output_video_resolution, state_manager.get_item('output_video_fps'), pixel_format)
+	frame_number = 0
+	is_stream_broken = False
+
+	with tqdm(total = stream_frame_total, desc = translator.get('processing'), unit = 'frame', ascii = ' =', disable = state_manager.get_item('log_level') in [ 'warn', 'error' ]) as progress:
+		progress.set_postfix(execution_providers = state_manager.get_item('execution_providers'))
+
+		with ThreadPoolExecutor(max_workers = state_manager.get_item('execution_thread_count')) as executor:
+			# frames are written in order, the window bounds the frames held in memory while the workers run ahead
+			futures : Deque[Future[Tuple[VisionFrame, Mask]]] = deque()
+			frame_window_size = state_manager.get_item('execution_thread_count') * 2
+
+			while not is_stream_broken:
+				while len(futures) < frame_window_size:
+					target_vision_frame = read_pipe_frame(frame_reader, temp_video_resolution, pixel_format)
+
+					if target_vision_frame is None:
+						break
+					futures.append(executor.submit(process_vision_frame, target_vision_frame, frame_number))
+					frame_number += 1
+
+				if not futures or is_process_stopping():
+					break
+
+				temp_vision_frame, temp_vision_mask = futures.popleft().result()
+				is_stream_broken = not write_pipe_frame(frame_writer, temp_vision_frame, temp_vision_mask, pixel_format)
+				progress.update()
+
+			for future in futures:
+				future.cancel()
+
+	for processor_module in get_processors_modules(state_manager.get_item('processors')):
+		processor_module.post_process()
+
+	if is_process_stopping():
+		frame_reader.terminate()
+		frame_writer.terminate()
+		return 4
+
+	frame_reader.terminate()
+	frame_reader.wait()
+
+	if not is_stream_broken:
+		frame_writer.stdin.close()
+	frame_writer.wait()
+
+	if frame_number > 0 and not is_stream_broken and frame_writer.returncode == 0:
+		logger.debug(translator.get('streaming_frames_succeeded'), __name__)
+	else:
+		logger.error(translator.get('streaming_frames_failed'), __name__)
+		return 1
+	return 0
+
+
+def resolve_pipe_pixel_format() -> str:
+	if state_manager.get_item('output_video_encoder') == 'libvpx-vp9':
+		return 'bgra'
+	return 'bgr24'
+
+
+def read_pipe_frame(frame_reader : subprocess.Popen[bytes], temp_video_resolution : Resolution, pixel_format : str) -> Optional[VisionFrame]:
+	temp_video_width, temp_video_height = temp_video_resolution
+	channel_total = 4 if pixel_format == 'bgra' else 3
+	frame_buffer = frame_reader.stdout.read(temp_video_width * temp_video_height * channel_total)
+
+	if len(frame_buffer) == temp_video_width * temp_video_height * channel_total:
+		return numpy.frombuffer(frame_buffer, dtype = numpy.uint8).reshape(temp_video_height, temp_video_width, channel_total)
+	return None
+
+
+def write_pipe_frame(frame_writer : subprocess.Popen[bytes], temp_vision_frame : VisionFrame, temp_vision_mask : Mask, pixel_format : str) -> bool:
+	if pixel_format == 'bgra':
+		temp_vision_frame = merge_vision_mask(temp_vision_frame, temp_vision_mask)
+	else:
+		temp_vision_frame = temp_vision_frame[:, :, :3]
+
+	try:
+		frame_writer.stdin.write(numpy.ascontiguousarray(temp_vision_frame).tobytes())
+		return True
+	except (BrokenPipeError, OSError):
+		return False
+
+
 def merge_frames() -> ErrorCode:
 	trim_frame_start, trim_frame_end = restrict_trim_frame(state_manager.get_item('target_path'), state_manager.get_item('trim_frame_start'), state_manager.get_item('trim_frame_end'))
 	output_video_resolution = scale_resolution(detect_video_resolution(state_manager.get_item('target_path')), state_manager.get_item('output_video_scale'))
@@ -153,11 +258,17 @@ def restore_audio() -> ErrorCode:
 
 
 def process_temp_frame(temp_frame_path : str, frame_number : int) -> bool:
+	target_vision_frame = read_static_image(temp_frame_path, 'rgba')
+	temp_vision_frame, temp_vision_mask = process_vision_frame(target_vision_frame, frame_number)
+	temp_vision_frame = conditional_merge_vision_mask(temp_vision_frame, temp_vision_mask)
+	return write_image(temp_frame_path, temp_vision_frame)
+
+
+def process_vision_frame(target_vision_frame : VisionFrame, frame_number : int) -> Tuple[VisionFrame, Mask]:
 	reference_vision_frame = read_static_video_frame(state_manager.get_item('target_path'), state_manager.get_item('reference_frame_number'))
 	source_vision_frames = read_static_images(state_manager.get_item('source_paths'))
 	source_audio_path = get_first(filter_audio_paths(state_manager.get_item('source_paths')))
 	temp_video_fps = restrict_video_fps(state_manager.get_item('target_path'), state_manager.get_item('output_video_fps'))
-	target_vision_frame = read_static_image(temp_frame_path, 'rgba')
 	temp_vision_frame = target_vision_frame.copy()
 	temp_vision_mask = extract_vision_mask(temp_vision_frame)
 
@@ -181,8 +292,7 @@ def process_temp_frame(temp_frame_path : str, frame_number : int) -> bool:
 			'temp_vision_mask': temp_vision_mask
 		})
 
-	temp_vision_frame = conditional_merge_vision_mask(temp_vision_frame, temp_vision_mask)
-	return write_image(temp_frame_path, temp_vision_frame)
+	return temp_vision_frame, temp_vision_mask
 
 
 def finalize_video(start_time : float) -> ErrorCode:
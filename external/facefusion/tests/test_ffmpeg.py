@@ -7,8 +7,8 @@ import pytest
 import facefusion.ffmpeg
 from facefusion import process_manager, state_manager
 from facefusion.download import conditional_download
-from facefusion.ffmpeg import concat_video, extract_frames, merge_video, read_audio_buffer, replace_audio, restore_audio
-from facefusion.filesystem import copy_file
+from facefusion.ffmpeg import concat_video, extract_frames, merge_video, open_frame_reader, open_frame_writer, read_audio_buffer, replace_audio, restore_audio
+from facefusion.filesystem import copy_file, is_file
 from facefusion.temp_helper import clear_temp_directory, create_temp_directory, get_temp_file_path, resolve_temp_frame_paths
 from facefusion.types import EncoderSet
 from .helper import get_test_example_file, get_test_examples_directory, get_test_output_file, prepare_test_output_directory
@@ -116,6 +116,37 @@ def test_merge_video() -> None:
 	state_manager.init_item('output_video_encoder', 'libx264')
 
 
+def test_open_frame_reader() -> None:
+	test_set =\
+	[
+		(get_test_example_file('target-240p-25fps.mp4'), 0, 10, 'bgr24', 3, 12),
+		(get_test_example_file('target-240p-30fps.mp4'), 0, 10, 'bgr24', 3, 10),
+		(get_test_example_file('target-240p-30fps.mp4'), 0, 10, 'bgra', 4, 10)
+	]
+
+	for target_path, trim_frame_start, trim_frame_end, pixel_format, channel_total, frame_total in test_set:
+		frame_reader = open_frame_reader(target_path, (452, 240), 30.0, trim_frame_start, trim_frame_end, pixel_format)
+		frame_buffer = frame_reader.stdout.read()
+
+		assert frame_reader.wait() == 0
+		assert len(frame_buffer) == 452 * 240 * channel_total * frame_total
+
+
+def test_open_frame_writer() -> None:
+	target_path = get_test_example_file('target-240p-25fps.mp4')
+	create_temp_directory(target_path)
+	frame_writer = open_frame_writer(target_path, (452, 240), 25.0, (452, 240), 25.0, 'bgr24')
+
+	for _ in range(10):
+		frame_writer.stdin.write(bytes(452 * 240 * 3))
+	frame_writer.stdin.close()
+
+	assert frame_writer.wait() == 0
+	assert is_file(get_temp_file_path(target_path)) is True
+
+	clear_temp_directory(target_path)
+
+
 def test_concat_video() -> None:
 	output_path = get_test_output_file('test-concat-video.mp4')
 	temp_output_paths =\
@@ -0,0 +1,76 @@
+import os
+import tempfile
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from facefusion import hash_helper
+from facefusion.hash_helper import create_file_hash, create_hash, get_file_hash, get_hash_path, validate_hash
+from facefusion.json import read_json
+from .helper import get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	prepare_test_output_directory()
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> Iterator[None]:
+	hash_validation_set_path = os.path.join(tempfile.mkdtemp(), 'hash_validations.json')
+
+	with patch('facefusion.hash_helper.HASH_VALIDATION_SET_PATH', hash_validation_set_path):
+		hash_helper.HASH_VALIDATION_SET.clear()
+		yield
+	hash_helper.HASH_VALIDATION_SET.clear()
+
+
+def write_test_file(file_path : str, content : bytes) -> None:
+	with open(file_path, 'wb') as file:
+		file.write(content)
+
+	with open(get_hash_path(file_path), 'w') as hash_file:
+		hash_file.write(create_hash(content))
+
+
+def test_create_file_hash() -> None:
+	file_path = get_test_output_file('test-create-file-hash.bin')
+	content = os.urandom(1000)
+	write_test_file(file_path, content)
+
+	with patch('facefusion.hash_helper.HASH_CHUNK_SIZE', 64):
+		assert create_file_hash(file_path) == create_hash(content)
+
+
+def test_validate_hash() -> None:
+	file_path = get_test_output_file('test-validate-hash.bin')
+	write_test_file(file_path, b'test')
+
+	assert validate_hash(file_path) is True
+	assert os.path.abspath(file_path) in read_json(hash_helper.HASH_VALIDATION_SET_PATH)
+
+	with patch('facefusion.hash_helper.create_file_hash') as create_file_hash_mock:
+		assert validate_hash(file_path) is True
+		create_file_hash_mock.assert_not_called()
+
+	hash_helper.HASH_VALIDATION_SET.clear()
+
+	with patch('facefusion.hash_helper.create_file_hash') as create_file_hash_mock:
+		assert validate_hash(file_path) is True
+		create_file_hash_mock.assert_not_called()
+
+	assert validate_hash(get_test_output_file('invalid.bin')) is False
+
+
+def test_validate_hash_of_changed_file() -> None:
+	file_path = get_test_output_file('test-validate-hash-of-changed-file.bin')
+	write_test_file(file_path, b'test')
+
+	assert validate_hash(file_path) is True
+
+	with open(file_path, 'ab') as file:
+		file.write(b'corrupt')
+
+	assert validate_hash(file_path) is False
+	assert get_file_hash(file_path) == create_hash(b'testcorrupt')
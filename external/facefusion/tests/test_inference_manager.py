@@ -1,16 +1,22 @@
 from unittest.mock import patch
 
 import pytest
-from onnxruntime import InferenceSession
+from onnxruntime import ExecutionMode, GraphOptimizationLevel, InferenceSession
 
 from facefusion import content_analyser, state_manager
-from facefusion.inference_manager import INFERENCE_POOL_SET, get_inference_pool
+from facefusion.filesystem import is_file, remove_file
+from facefusion.inference_manager import INFERENCE_POOL_SET, create_inference_session, create_session_options, get_inference_pool, get_inference_session_options, resolve_inference_session_options, resolve_optimized_model_path
 
 
 @pytest.fixture(scope = 'module', autouse = True)
 def before_all() -> None:
 	state_manager.init_item('execution_device_ids', [ 0 ])
 	state_manager.init_item('execution_providers', [ 'cpu' ])
+	state_manager.init_item('execution_intra_op_thread_count', 0)
+	state_manager.init_item('execution_inter_op_thread_count', 0)
+	state_manager.init_item('execution_mode', 'sequential')
+	state_manager.init_item('execution_graph_optimization_level', 'all')
+	state_manager.init_item('execution_disable_memory_arena', False)
 	state_manager.init_item('download_providers', [ 'github' ])
 	content_analyser.pre_check()
 
@@ -30,3 +36,59 @@ def test_get_inference_pool() -> None:
 		assert isinstance(INFERENCE_POOL_SET.get('cli').get('facefusion.content_analyser.nsfw_1.nsfw_2.nsfw_3.0.cpu').get('nsfw_1'), InferenceSession)
 
 	assert INFERENCE_POOL_SET.get('cli').get('facefusion.content_analyser.nsfw_1.nsfw_2.nsfw_3.0.cpu').get('nsfw_1') == INFERENCE_POOL_SET.get('ui').get('facefusion.content_analyser.nsfw_1.nsfw_2.nsfw_3.0.cpu').get('nsfw_1')
+
+
+def test_create_session_options() -> None:
+	session_options = create_session_options(
+	{
+		'intra_op_thread_count': 2,
+		'inter_op_thread_count': 1,
+		'execution_mode': 'parallel',
+		'graph_optimization_level': 'basic',
+		'disable_memory_arena': True
+	})
+
+	assert session_options.intra_op_num_threads == 2
+	assert session_options.inter_op_num_threads == 1
+	assert session_options.execution_mode == ExecutionMode.ORT_PARALLEL
+	assert session_options.graph_optimization_level == GraphOptimizationLevel.ORT_ENABLE_BASIC
+	assert session_options.enable_cpu_mem_arena is False
+	assert session_options.enable_mem_pattern is False
+
+	session_options = create_session_options(get_inference_session_options())
+
+	assert session_options.execution_mode == ExecutionMode.ORT_SEQUENTIAL
+	assert session_options.graph_optimization_level == GraphOptimizationLevel.ORT_ENABLE_ALL
+	assert session_options.enable_cpu_mem_arena is True
+
+
+def test_resolve_inference_session_options() -> None:
+	assert resolve_inference_session_options('facefusion.content_analyser') == get_inference_session_options()
+
+	with patch('facefusion.content_analyser.resolve_inference_session_options', create = True, return_value = { 'intra_op_thread_count': 1 }):
+		inference_session_options = resolve_inference_session_options('facefusion.content_analyser')
+
+		assert inference_session_options.get('intra_op_thread_count') == 1
+		assert inference_session_options.get('graph_optimization_level') == 'all'
+
+
+def test_resolve_optimized_model_path() -> None:
+	_, model_source_set = content_analyser.collect_model_downloads()
+	model_path = model_source_set.get('nsfw_1').get('path')
+
+	assert resolve_optimized_model_path(model_path, [ 'cpu' ], { 'graph_optimization_level': 'all' }) == resolve_optimized_model_path(model_path, [ 'cpu' ], { 'graph_optimization_level': 'extended' })
+	assert resolve_optimized_model_path(model_path, [ 'cpu' ], { 'graph_optimization_level': 'basic' }) != resolve_optimized_model_path(model_path, [ 'cpu' ], { 'graph_optimization_level': 'extended' })
+	assert resolve_optimized_model_path(model_path, [ 'cuda', 'cpu' ], { 'graph_optimization_level': 'all' }) != resolve_optimized_model_path(model_path, [ 'cpu' ], { 'graph_optimization_level': 'all' })
+	assert resolve_optimized_model_path(model_path, [ 'cpu' ], { 'graph_optimization_level': 'disabled' }) is None
+	assert resolve_optimized_model_path(model_path, [ 'tensorrt', 'cpu' ], { 'graph_optimization_level': 'all' }) is None
+
+
+def test_create_inference_session_with_optimized_model() -> None:
+	_, model_source_set = content_analyser.collect_model_downloads()
+	model_path = model_source_set.get('nsfw_1').get('path')
+	optimized_model_path = resolve_optimized_model_path(model_path, [ 'cpu' ], get_inference_session_options())
+	remove_file(optimized_model_path)
+
+	assert isinstance(create_inference_session(model_path, 0, [ 'cpu' ]), InferenceSession)
+	assert is_file(optimized_model_path)
+	assert isinstance(create_inference_session(model_path, 0, [ 'cpu' ]), InferenceSession)
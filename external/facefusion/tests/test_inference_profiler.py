@@ -0,0 +1,91 @@
+import os
+import tempfile
+from typing import List, cast
+from unittest.mock import patch
+
+import numpy
+import onnx
+import pytest
+from onnx import TensorProto, helper, numpy_helper
+
+from facefusion import state_manager
+from facefusion.inference_manager import create_inference_pool
+from facefusion.inference_profiler import INFERENCE_PROFILE_POOLS, collect_inference_profiles, create_inference_profile, end_inference_profiling, format_input_type_shapes, get_module_label, get_profile_file_prefix, register_inference_pool
+from facefusion.json import read_json
+from facefusion.types import InferenceProfileReport, InferenceProfileSource
+from .helper import get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	state_manager.init_item('execution_device_ids', [ 0 ])
+	state_manager.init_item('execution_providers', [ 'cpu' ])
+	state_manager.init_item('execution_graph_optimization_level', 'disabled')
+	prepare_test_output_directory()
+	weight = numpy.random.default_rng(0).standard_normal((8, 3, 3, 3)).astype(numpy.float32)
+	graph = helper.make_graph(
+		[ helper.make_node('Conv', [ 'input', 'weight' ], [ 'convolution' ]), helper.make_node('Relu', [ 'convolution' ], [ 'output' ]) ],
+		'test',
+		[ helper.make_tensor_value_info('input', TensorProto.FLOAT, [ 1, 3, 16, 16 ]) ],
+		[ helper.make_tensor_value_info('output', TensorProto.FLOAT, [ 1, 8, 14, 14 ]) ],
+		[ numpy_helper.from_array(weight, 'weight') ]
+	)
+	model = helper.make_model(graph, opset_imports = [ helper.make_opsetid('', 13) ], ir_version = 8)
+	onnx.save(model, get_test_output_file('test.onnx'))
+
+
+def test_get_module_label() -> None:
+	assert get_module_label('facefusion.face_detector') == 'face_detector'
+	assert get_module_label('facefusion.processors.modules.face_swapper.core') == 'face_swapper'
+
+
+def test_format_input_type_shapes() -> None:
+	assert format_input_type_shapes([ { 'float': [ 1, 3, 16, 16 ] }, { 'float': [ 8, 3, 3, 3 ] } ]) == 'float[1,3,16,16] float[8,3,3,3]'
+	assert format_input_type_shapes([]) == ''
+
+
+def test_end_inference_profiling() -> None:
+	profile_directory_path = tempfile.mkdtemp()
+	module_name = 'facefusion.processors.modules.face_swapper.core'
+
+	with patch('facefusion.inference_profiler.INFERENCE_PROFILE_DIRECTORY_PATH', profile_directory_path):
+		inference_session_options =\
+		{
+			'enable_profiling': True,
+			'profile_file_prefix': get_profile_file_prefix(module_name, 0)
+		}
+		inference_pool = create_inference_pool({ 'face_swapper': { 'url': 'test', 'path': get_test_output_file('test.onnx') } }, 0, [ 'cpu' ], inference_session_options) #type:ignore[arg-type]
+		register_inference_pool(module_name, inference_pool)
+
+		for _ in range(3):
+			inference_pool.get('face_swapper').run(None, { 'input': numpy.zeros((1, 3, 16, 16), numpy.float32) })
+
+		report_path = end_inference_profiling()
+
+	assert report_path == os.path.join(profile_directory_path, 'report.json')
+	assert not INFERENCE_PROFILE_POOLS
+
+	inference_profile_report = cast(InferenceProfileReport, read_json(report_path))
+
+	assert inference_profile_report[0].get('module_name') == module_name
+	assert inference_profile_report[0].get('model_name') == 'face_swapper'
+	assert inference_profile_report[0].get('run_count') == 3
+	assert inference_profile_report[0].get('operators')[0].get('call_count') == 3
+	assert 'float[1,3,16,16]' in inference_profile_report[0].get('operators')[0].get('input_shapes')[0]
+	assert end_inference_profiling() is None
+
+
+def test_create_inference_profile() -> None:
+	profile_directory_path = tempfile.mkdtemp()
+	inference_pool = create_inference_pool({ 'test': { 'url': 'test', 'path': get_test_output_file('test.onnx') } }, 0, [ 'cpu' ], { 'enable_profiling': True, 'profile_file_prefix': os.path.join(profile_directory_path, 'test') }) #type:ignore[arg-type]
+	register_inference_pool('facefusion.face_detector', inference_pool)
+	inference_pool.get('test').run(None, { 'input': numpy.zeros((1, 3, 16, 16), numpy.float32) })
+
+	inference_profile_sources : List[InferenceProfileSource] = []
+
+	with patch('facefusion.inference_profiler.INFERENCE_PROFILE_SOURCES', inference_profile_sources):
+		collect_inference_profiles(inference_pool)
+		inference_profile = create_inference_profile('facefusion.face_detector', 'test', [ inference_profile_sources[0].get('profile_path') ])
+
+	assert inference_profile.get('run_count') == 1
+	assert sum(operator.get('share') for operator in inference_profile.get('operators')) == pytest.approx(1, abs = 0.01)
@@ -0,0 +1,143 @@
+import os
+import tempfile
+from typing import Iterator
+from unittest.mock import patch
+
+import numpy
+import onnx
+import pytest
+from onnx import TensorProto, helper, numpy_helper
+from onnxruntime import InferenceSession
+
+from facefusion.filesystem import is_file
+from facefusion.model_quantizer import InferenceInputRecorder, calculate_embedding_cosine, calculate_landmark_error, calculate_structural_similarity, count_recalled_bounding_boxes, get_quantized_model_path, is_quantization_passed, quantize_model, read_quantized_model_set, register_quantized_model, resolve_quantized_model_path, resolve_quantized_model_source_set
+from .helper import get_test_output_file, prepare_test_output_directory
+
+
+@pytest.fixture(scope = 'module', autouse = True)
+def before_all() -> None:
+	prepare_test_output_directory()
+	weight = numpy.random.default_rng(0).standard_normal((64, 32)).astype(numpy.float32)
+	graph = helper.make_graph(
+		[ helper.make_node('MatMul', [ 'input', 'weight' ], [ 'output' ]) ],
+		'test',
+		[ helper.make_tensor_value_info('input', TensorProto.FLOAT, [ 1, 64 ]) ],
+		[ helper.make_tensor_value_info('output', TensorProto.FLOAT, [ 1, 32 ]) ],
+		[ numpy_helper.from_array(weight, 'weight') ]
+	)
+	model = helper.make_model(graph, opset_imports = [ helper.make_opsetid('', 13) ], ir_version = 8)
+	onnx.save(model, get_test_output_file('test.onnx'))
+
+
+@pytest.fixture(scope = 'function', autouse = True)
+def before_each() -> Iterator[None]:
+	_, quantized_model_set_path = tempfile.mkstemp(suffix = '.json')
+
+	with patch('facefusion.model_quantizer.QUANTIZED_MODEL_SET_PATH', quantized_model_set_path):
+		read_quantized_model_set.cache_clear()
+		yield
+	read_quantized_model_set.cache_clear()
+
+
+def test_get_quantized_model_path() -> None:
+	assert get_quantized_model_path(os.path.join('.assets', 'models', 'yolo_face_8n.onnx')) == os.path.join('.assets', 'models', 'yolo_face_8n_int8.onnx')
+
+
+def test_quantize_model() -> None:
+	model_path = get_test_output_file('test.onnx')
+	quantized_model_path = get_quantized_model_path(model_path)
+	input_frame = numpy.random.default_rng(1).standard_normal((1, 64)).astype(numpy.float32)
+
+	assert quantize_model(model_path, quantized_model_path, 'dynamic', []) is True
+	assert is_file(quantized_model_path)
+
+	output = InferenceSession(model_path).run(None, { 'input': input_frame })[0]
+	quantized_output = InferenceSession(quantized_model_path).run(None, { 'input': input_frame })[0]
+
+	assert calculate_embedding_cosine(output, quantized_output) > 0.99
+	assert quantize_model(get_test_output_file('invalid.onnx'), get_test_output_file('invalid_int8.onnx'), 'dynamic', []) is False
+
+
+def test_quantize_model_logs_failure(caplog : pytest.LogCaptureFixture) -> None:
+	assert quantize_model(get_test_output_file('invalid.onnx'), get_test_output_file('invalid_int8.onnx'), 'dynamic', []) is False
+	assert 'quantizing model ' + get_test_output_file('invalid.onnx') + ' failed' in caplog.text
+
+
+def test_inference_input_recorder() -> None:
+	inference_session = InferenceSession(get_test_output_file('test.onnx'))
+	inference_input_recorder = InferenceInputRecorder(inference_session, 2)
+	input_frame = numpy.zeros((1, 64), numpy.float32)
+
+	for _ in range(3):
+		inference_input_recorder.run(None, { 'input': input_frame })
+
+	assert len(inference_input_recorder.inference_inputs) == 2
+	assert inference_input_recorder.get_inputs()[0].name == 'input'
+
+
+def test_resolve_quantized_model_path() -> None:
+	model_path = get_test_output_file('test.onnx')
+	quantized_model_path = get_quantized_model_path(model_path)
+	quantize_model(model_path, quantized_model_path, 'dynamic', [])
+
+	assert resolve_quantized_model_path(model_path) is None
+
+	register_quantized_model(model_path,
+	{
+		'path': quantized_model_path,
+		'mode': 'dynamic',
+		'metric': 'output_ssim',
+		'score': 0.9,
+		'threshold': 0.95,
+		'passed': False
+	})
+
+	assert resolve_quantized_model_path(model_path) is None
+
+	register_quantized_model(model_path,
+	{
+		'path': quantized_model_path,
+		'mode': 'dynamic',
+		'metric': 'output_ssim',
+		'score': 0.99,
+		'threshold': 0.95,
+		'passed': True
+	})
+
+	assert resolve_quantized_model_path(model_path) == quantized_model_path
+	assert resolve_quantized_model_source_set({ 'test': { 'url': 'test', 'path': model_path }}).get('test').get('path') == quantized_model_path
+	assert resolve_quantized_model_source_set({ 'test': { 'url': 'test', 'path': 'invalid.onnx' }}).get('test').get('path') == 'invalid.onnx'
+
+
+def test_count_recalled_bounding_boxes() -> None:
+	reference_bounding_boxes = [ numpy.array([ 0, 0, 10, 10 ]), numpy.array([ 20, 20, 30, 30 ]) ]
+
+	assert count_recalled_bounding_boxes(reference_bounding_boxes, [ numpy.array([ 0, 0, 10, 11 ]), numpy.array([ 20, 20, 30, 30 ]) ]) == 2
+	assert count_recalled_bounding_boxes(reference_bounding_boxes, [ numpy.array([ 0, 0, 10, 10 ]) ]) == 1
+	assert count_recalled_bounding_boxes(reference_bounding_boxes, [ numpy.array([ 5, 5, 15, 15 ]) ]) == 0
+
+
+def test_calculate_landmark_error() -> None:
+	face_landmark_68 = numpy.random.default_rng(2).uniform(0, 100, (68, 2))
+
+	assert calculate_landmark_error(face_landmark_68, face_landmark_68, numpy.array([ 0, 0, 100, 100 ])) == 0
+	assert calculate_landmark_error(face_landmark_68, face_landmark_68 + [ 1, 0 ], numpy.array([ 0, 0, 100, 100 ])) == pytest.approx(0.01)
+
+
+def test_calculate_embedding_cosine() -> None:
+	assert calculate_embedding_cosine(numpy.array([ 1.0, 0.0 ]), numpy.array([ 2.0, 0.0 ])) == pytest.approx(1)
+	assert calculate_embedding_cosine(numpy.array([ 1.0, 0.0 ]), numpy.array([ 0.0, 1.0 ])) == pytest.approx(0)
+
+
+def test_calculate_structural_similarity() -> None:
+	vision_frame = numpy.random.default_rng(3).integers(0, 255, (64, 64, 3), dtype = numpy.uint8)
+
+	assert calculate_structural_similarity(vision_frame, vision_frame) == pytest.approx(1)
+	assert calculate_structural_similarity(vision_frame, 255 - vision_frame) < 0.5
+
+
+def test_is_quantization_passed() -> None:
+	assert is_quantization_passed('detection_recall', 0.99) is True
+	assert is_quantization_passed('detection_recall', 0.9) is False
+	assert is_quantization_passed('landmark_error', 0.005) is True
+	assert is_quantization_passed('landmark_error', 0.02) is False
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from blanket.constants.enums.detection_enums import FaceDetectorModule
+from blanket.core.detectors.detector_factory import DetectorFactory
+from blanket.evaluation.evaluation_engine import StreamingEvaluator
+from blanket.settings.evaluation_settings import EvaluationSettings
+
+CONFIG_DIR = Path(__file__).parent / "blanket" / "configs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BLANKET anonymization evaluation (original vs. anonymized video)")
+
+    parser.add_argument('original_video_path', help='Path to original video')
+    parser.add_argument('anonymized_video_path', help='Path to anonymized video')
+
+    parser.add_argument(
+        '--face-detector',
+        choices=['yolo', 'yolo_onnx'],
+        default='yolo',
+        help='Face detector used on both videos'
+    )
+
+    parser.add_argument(
+        '--embeddings',
+        action='store_true',
+        help='Compute ArcFace embedding similarities (original vs. anonymized face, anonymized face over time)'
+    )
+
+    parser.add_argument(
+        '--output',
+        help='Path to JSON report (default: print only)'
+    )
+
+    args = parser.parse_args()
+
+    evaluation_settings = EvaluationSettings.from_config(CONFIG_DIR / "defaults.yaml")
+    face_detector = DetectorFactory.create_face_detector(FaceDetectorModule(args.face_detector))
+
+    face_embedder = None
+    if args.embeddings:
+        from blanket.evaluation.face_embeddings import FaceFusionFaceEmbedder
+
+        face_embedder = FaceFusionFaceEmbedder()
+
+    report = StreamingEvaluator(face_detector, evaluation_settings, face_embedder).evaluate(
+        args.original_video_path, args.anonymized_video_path
+    )
+    report_json = json.dumps(report.to_dict(), indent=2)
+    print(report_json)
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(report_json)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
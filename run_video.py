@@ -13,7 +13,14 @@ warnings.filterwarnings("ignore", message=".*config attributes.*were passed.*but
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from blanket.anonymization.pipelines.video_pipeline import VideoPipeline
+from blanket.core.startup_profiler import startup_profiler
+
+CLASSIC_METHODS = ['black_box', 'gaussian_blur', 'pixelation']
+# anonymizer parameters scaling the anonymization strength with the face size
+ADAPTIVE_STRENGTH_PARAMETERS = {
+    'gaussian_blur': {'kernel_to_face_ratio': 0.5},
+    'pixelation': {'blocks_per_face': 8},
+}
 
 
 def main():
@@ -53,7 +60,48 @@ def main():
         help='Save individual frames for manual inspection'
     )
 
+    parser.add_argument(
+        '--method',
+        choices=['hybrid'] + CLASSIC_METHODS,
+        default='hybrid',
+        help='hybrid = synthetic identity + face swap, other methods = fast non-generative anonymization'
+    )
+
+    parser.add_argument(
+        '--face-detector',
+        choices=['yolo', 'yolo_onnx'],
+        default='yolo',
+        help='Face detector used by the non-generative methods'
+    )
+
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=16,
+        help='Number of frames per face detection batch (non-generative methods)'
+    )
+
+    parser.add_argument(
+        '--adaptive-strength',
+        action='store_true',
+        help='Scale blur/pixelation strength with the face size (non-generative methods)'
+    )
+
+    parser.add_argument(
+        '--log-frames',
+        action='store_true',
+        help='Write per-frame results and frames without detections as JSON lines to <output>/logs'
+    )
+
+    parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        help='Report import times per package and model load times at the end of the run'
+    )
+
     args = parser.parse_args()
+    if args.profile_startup:
+        startup_profiler.enable()
 
     # Create output directory based on video name
     video_name = Path(args.video_path).stem
@@ -69,6 +117,7 @@ def main():
     print("=" * 60)
     print(f"Input:  {args.video_path}")
     print(f"Output: {output_dir}")
+    print(f"Method: {args.method}")
     if args.identity:
         print(f"Custom identity: {args.identity}")
     elif args.identity_timestamp is not None:
@@ -78,7 +127,33 @@ def main():
     print("=" * 60)
     print()
 
+    logging_settings = None
+    if args.log_frames:
+        from blanket.settings.logging_settings import LoggingSettings
+
+        log_dir = Path(output_dir) / 'logs'
+        logging_settings = LoggingSettings(
+            process_log_filepath=log_dir / 'process_log.txt',
+            anonymization_result_log_filepath=log_dir / 'anonymization_results.jsonl',
+            frames_without_detections_log_filepath=log_dir / 'frames_without_detections.jsonl',
+        )
+
     try:
+        if args.method in CLASSIC_METHODS:
+            from blanket.anonymization.pipelines.classic_video_pipeline import ClassicVideoPipeline
+
+            result = ClassicVideoPipeline(
+                output_dir=output_dir,
+                anonymization_method=args.method,
+                face_detector_type=args.face_detector,
+                detection_batch_size=args.batch_size,
+                anonymizer_parameters=ADAPTIVE_STRENGTH_PARAMETERS.get(args.method) if args.adaptive_strength else None,
+                logging_settings=logging_settings,
+            ).run(args.video_path)
+            return 0 if result['success'] else 1
+
+        from blanket.anonymization.pipelines.video_pipeline import VideoPipeline
+
         pipeline = VideoPipeline(
             output_dir=output_dir,
             debug_dir=debug_dir,
@@ -89,6 +164,7 @@ def main():
             identity_timestamp=args.identity_timestamp,
             save_frames=args.save_frames,
             debug=args.debug,
+            logging_settings=logging_settings,
         )
 
         result = pipeline.run(
@@ -102,5 +178,11 @@ def main():
         traceback.print_exc()
         return 1
 
+    finally:
+        if logging_settings is not None:
+            logging_settings.stop()
+        if args.profile_startup:
+            print(startup_profiler.report())
+
 if __name__ == '__main__':
     sys.exit(main())
\ No newline at end of file
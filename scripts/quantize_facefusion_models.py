@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Quantize the FaceFusion models used by the anonymizer to INT8 and keep only the variants passing an accuracy gate.
+Calibration inputs are recorded from the real pipeline on frames of the given videos/images, a held-out part of the
+frames compares every INT8 model against its FP32 source (detection recall, landmark error, embedding cosine
+similarity or output SSIM). The results are written to the FaceFusion quantized model manifest, passing variants are
+used when FaceFusion runs with --execution-quantized-models (use_quantized_models in facefusion_parameters.yaml).
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "external" / "facefusion"))
+
+import facefusion.choices as facefusion_choices
+from facefusion import face_analyser, face_detector, face_landmarker, face_recognizer, inference_manager, state_manager
+from facefusion.model_quantizer import (
+    InferenceInputRecorder,
+    calculate_embedding_cosine,
+    calculate_landmark_error,
+    calculate_structural_similarity,
+    count_recalled_bounding_boxes,
+    get_quantized_model_path,
+    is_quantization_passed,
+    quantize_model,
+    register_quantized_model,
+)
+from facefusion.processors.modules.face_enhancer import core as face_enhancer
+from facefusion.processors.modules.face_swapper import core as face_swapper
+
+from blanket.anonymization.methods.facefusion import FaceFusionDirectAnonymizer
+
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".webm"}
+
+# target name -> (module owning the inference pool, key of the model in the pool, accuracy metric)
+QUANTIZATION_TARGETS = {
+    "yolo_face": (face_detector, "yolo_face", "detection_recall"),
+    "2dfan4": (face_landmarker, "2dfan4", "landmark_error"),
+    "arcface": (face_recognizer, "face_recognizer", "embedding_cosine"),
+    "inswapper_128": (face_swapper, "face_swapper", "output_ssim"),
+    "gfpgan_1.4": (face_enhancer, "face_enhancer", "output_ssim"),
+}
+
+
+def read_calibration_frames(paths, frames_per_video):
+    """
+    Read the images and evenly spaced frames of the videos.
+    Args:
+        paths (list[Path]): Image/video files or directories containing them.
+        frames_per_video (int): Number of frames sampled from every video.
+    Returns:
+        list[np.ndarray]: BGR frames.
+    """
+    file_paths = []
+    for path in paths:
+        file_paths += sorted(path.iterdir()) if path.is_dir() else [path]
+
+    frames = []
+    for file_path in file_paths:
+        if file_path.suffix.lower() in VIDEO_EXTENSIONS:
+            capture = cv2.VideoCapture(str(file_path))
+            frame_count = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+            for frame_number in np.linspace(0, max(frame_count - 1, 0), frames_per_video).astype(int):
+                capture.set(cv2.CAP_PROP_POS_FRAMES, int(frame_number))
+                success, frame = capture.read()
+                if success:
+                    frames.append(frame)
+            capture.release()
+        else:
+            frame = cv2.imread(str(file_path))
+            if frame is not None:
+                frames.append(frame)
+    return frames
+
+
+def get_model_path(target_name):
+    if target_name == "yolo_face":
+        return face_detector.collect_model_downloads()[1].get("yolo_face").get("path")
+    if target_name == "2dfan4":
+        return face_landmarker.collect_model_downloads()[1].get("2dfan4").get("path")
+    module, pool_key, _ = QUANTIZATION_TARGETS[target_name]
+    return module.get_model_options().get("sources").get(pool_key).get("path")
+
+
+def crop_face(vision_frame, bounding_box):
+    left, top, right, bottom = np.clip(np.round(bounding_box), 0, None).astype(int)
+    return vision_frame[top:bottom, left:right]
+
+
+def run_pipeline(anonymizer, frames):
+    """Run detection, swap and (if enabled) enhancement on the frames, so that all model inputs are recorded."""
+    for frame in frames:
+        for target_face in face_analyser.get_many_faces([frame]):
+            result_frame = face_swapper.swap_face(anonymizer.source_face, target_face, frame.copy())
+            if anonymizer.enable_face_enhancer:
+                face_enhancer.enhance_face(target_face, result_frame)
+
+
+def record_calibration_inputs(anonymizer, target_names, frames, max_inputs):
+    """
+    Record the inputs of every target model while the pipeline runs on the calibration frames.
+    Returns:
+        dict[str, list[dict[str, np.ndarray]]]: Recorded inputs per target.
+    """
+    recorders = {}
+    for target_name in target_names:
+        module, pool_key, _ = QUANTIZATION_TARGETS[target_name]
+        inference_pool = module.get_inference_pool()
+        recorders[target_name] = InferenceInputRecorder(inference_pool[pool_key], max_inputs)
+        inference_pool[pool_key] = recorders[target_name]
+
+    try:
+        run_pipeline(anonymizer, frames)
+    finally:
+        for target_name, recorder in recorders.items():
+            module, pool_key, _ = QUANTIZATION_TARGETS[target_name]
+            module.get_inference_pool()[pool_key] = recorder.inference_session
+    return {target_name: recorder.inference_inputs for target_name, recorder in recorders.items()}
+
+
+def run_target(target_name, anonymizer, frames, target_faces_per_frame):
+    """
+    Compute the outputs of a target model that its metric compares.
+    Returns:
+        list: Bounding boxes per frame (detection) or one output per face.
+    """
+    if target_name == "yolo_face":
+        return [face_detector.detect_faces(frame)[0] for frame in frames]
+
+    outputs = []
+    for frame, target_faces in zip(frames, target_faces_per_frame):
+        for target_face in target_faces:
+            if target_name == "2dfan4":
+                outputs.append(face_landmarker.detect_face_landmark(frame, target_face.bounding_box, 0)[0])
+            if target_name == "arcface":
+                outputs.append(face_recognizer.calculate_face_embedding(frame, target_face.landmark_set.get("5/68"))[0])
+            if target_name == "inswapper_128":
+                result_frame = face_swapper.swap_face(anonymizer.source_face, target_face, frame.copy())
+                outputs.append(crop_face(result_frame, target_face.bounding_box))
+            if target_name == "gfpgan_1.4":
+                result_frame = face_enhancer.enhance_face(target_face, frame.copy())
+                outputs.append(crop_face(result_frame, target_face.bounding_box))
+    return outputs
+
+
+def score_outputs(metric, reference_outputs, outputs, target_faces_per_frame):
+    """
+    Compare the INT8 outputs against the FP32 reference outputs.
+    Returns:
+        float: Detection recall, mean landmark error, mean embedding cosine similarity or mean output SSIM.
+    """
+    if metric == "detection_recall":
+        reference_count = sum(len(bounding_boxes) for bounding_boxes in reference_outputs)
+        recalled_count = sum(map(count_recalled_bounding_boxes, reference_outputs, outputs))
+        return recalled_count / reference_count if reference_count else 1.0
+
+    if not reference_outputs:  # no faces in the validation frames, nothing proves the model accurate
+        return float("inf") if metric == "landmark_error" else 0.0
+    if metric == "landmark_error":
+        bounding_boxes = [face.bounding_box for target_faces in target_faces_per_frame for face in target_faces]
+        return float(np.mean(list(map(calculate_landmark_error, reference_outputs, outputs, bounding_boxes))))
+    if metric == "embedding_cosine":
+        return float(np.mean(list(map(calculate_embedding_cosine, reference_outputs, outputs))))
+    return float(np.mean(list(map(calculate_structural_similarity, reference_outputs, outputs))))
+
+
+def evaluate_quantized_model(target_name, quantized_model_path, anonymizer, frames, target_faces_per_frame):
+    """
+    Score the INT8 model by temporarily replacing the FP32 session in the inference pool.
+    Returns:
+        float: Metric score.
+    """
+    module, pool_key, metric = QUANTIZATION_TARGETS[target_name]
+    inference_pool = module.get_inference_pool()
+    inference_session = inference_pool[pool_key]
+    reference_outputs = run_target(target_name, anonymizer, frames, target_faces_per_frame)
+
+    inference_pool[pool_key] = inference_manager.create_inference_session(
+        quantized_model_path,
+        state_manager.get_item("execution_device_ids")[0],
+        inference_manager.resolve_execution_providers(module.__name__),
+        inference_manager.resolve_inference_session_options(module.__name__),
+    )
+    try:
+        outputs = run_target(target_name, anonymizer, frames, target_faces_per_frame)
+    finally:
+        inference_pool[pool_key] = inference_session
+    return score_outputs(metric, reference_outputs, outputs, target_faces_per_frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantize FaceFusion models to INT8 with an accuracy gate")
+    parser.add_argument("calibration_paths", type=Path, nargs="+", help="Videos, images or directories of them")
+    parser.add_argument("--synthetic-face", type=Path, required=True, help="Source face used by the face swapper")
+    parser.add_argument("--config", type=Path, default=None, help="FaceFusion parameters (yaml)")
+    parser.add_argument("--models", nargs="+", default=list(QUANTIZATION_TARGETS), choices=list(QUANTIZATION_TARGETS))
+    parser.add_argument("--mode", default="static", choices=["static", "dynamic"])
+    parser.add_argument("--frames-per-video", type=int, default=32)
+    parser.add_argument("--max-calibration-inputs", type=int, default=256)
+    parser.add_argument("--validation-fraction", type=float, default=0.25)
+    args = parser.parse_args()
+
+    anonymizer = FaceFusionDirectAnonymizer(args.synthetic_face, config_path=args.config)
+    state_manager.set_item("execution_quantized_models", False)  # the FP32 models are the reference
+    target_names = [
+        target_name for target_name in args.models if target_name != "gfpgan_1.4" or anonymizer.enable_face_enhancer
+    ]
+
+    frames = read_calibration_frames(args.calibration_paths, args.frames_per_video)
+    if len(frames) < 2:
+        raise SystemExit("At least two calibration frames are required")
+    validation_count = min(max(1, int(len(frames) * args.validation_fraction)), len(frames) - 1)
+    calibration_frames, validation_frames = frames[:-validation_count], frames[-validation_count:]
+    print(f"Calibration frames: {len(calibration_frames)}, validation frames: {len(validation_frames)}")
+
+    calibration_inputs = record_calibration_inputs(
+        anonymizer, target_names, calibration_frames, args.max_calibration_inputs
+    )
+    target_faces_per_frame = [face_analyser.get_many_faces([frame]) for frame in validation_frames]
+
+    for target_name in target_names:
+        _, _, metric = QUANTIZATION_TARGETS[target_name]
+        model_path = get_model_path(target_name)
+        quantized_model_path = get_quantized_model_path(model_path)
+
+        if args.mode == "static" and not calibration_inputs[target_name]:
+            print(f"{target_name}: no calibration inputs recorded (no faces found?), skipped")
+            continue
+        if not quantize_model(model_path, quantized_model_path, args.mode, calibration_inputs[target_name]):
+            print(f"{target_name}: quantization failed, skipped")
+            continue
+
+        score = evaluate_quantized_model(
+            target_name, quantized_model_path, anonymizer, validation_frames, target_faces_per_frame
+        )
+        passed = is_quantization_passed(metric, score)
+        register_quantized_model(
+            model_path,
+            {
+                "path": quantized_model_path,
+                "mode": args.mode,
+                "metric": metric,
+                "score": score,
+                "threshold": facefusion_choices.quantization_threshold_set.get(metric),
+                "passed": passed,
+            },
+        )
+        print(f"{target_name}: {metric} = {score:.4f} -> {'passed' if passed else 'rejected'} ({quantized_model_path})")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ setup(
         "opencv-python>=4.8.0",
         "numpy>=1.24.0",
         "pyyaml>=6.0",
+        "requests>=2.31.0",
         "onnxruntime>=1.16.0",
         "controlnet-aux>=0.0.7",
         "ultralytics>=8.0.0",
@@ -0,0 +1,64 @@
+import cv2
+import numpy as np
+import pytest
+
+from blanket.anonymization.pipelines.classic_video_pipeline import ClassicVideoPipeline
+from blanket.constants.enums.anonymization_enums import AnonymizationMethod
+from blanket.core.detectors.detector_factory import DetectorFactory
+from blanket.core.objects.detections import FaceDetection
+
+
+class StubFaceDetector:
+    """Detects one face at a fixed box in the top-left corner of every (rotated) frame."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def detect_batch(self, images_bgr):
+        self.batch_sizes.append(len(images_bgr))
+        return [[FaceDetection(np.array([0, 0, 16, 16]))] for _ in images_bgr]
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = tmp_path / "video.avi"
+    video_writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48))
+    for _ in range(10):
+        video_writer.write(np.full((48, 64, 3), 200, dtype=np.uint8))
+    video_writer.release()
+    return path
+
+
+def read_frames(path):
+    video_capture = cv2.VideoCapture(str(path))
+    frames = []
+    while (frame := video_capture.read()[1]) is not None:
+        frames.append(frame)
+    video_capture.release()
+    return frames
+
+
+def test_run_anonymizes_rotated_batches(tmp_path, video_path, monkeypatch):
+    face_detector = StubFaceDetector()
+    monkeypatch.setattr(DetectorFactory, "create_face_detector", lambda module: face_detector)
+    pipeline = ClassicVideoPipeline(
+        output_dir=str(tmp_path / "output"),
+        anonymization_method=AnonymizationMethod.BLACK_BOX,
+        detection_batch_size=4,
+        queue_size=8,
+        clockwise_rotation_index=1,
+    )
+
+    result = pipeline.run(str(video_path))
+
+    assert result["success"]
+    assert (result["frames_processed"], result["faces_anonymized"]) == (10, 10)
+    assert face_detector.batch_sizes == [4, 4, 2]
+
+    frames = read_frames(result["output_video"])
+    assert len(frames) == 10
+    for frame in frames:
+        assert frame.shape == (48, 64, 3)
+        # the top-left corner of the frame rotated clockwise is the bottom-left corner of the original frame
+        assert frame[36:44, 4:12].mean() < 30
+        assert frame[4:12, 4:12].mean() > 170
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+torch = pytest.importorskip("torch")
+diffusers = pytest.importorskip("diffusers")
+
+from blanket.anonymization.methods import cpu_execution  # noqa: E402
+from blanket.anonymization.methods.cpu_execution import (  # noqa: E402
+    DEFAULT_CPU_EXECUTION,
+    StepLatencyTracker,
+    configure_torch_threads,
+    cpu_autocast,
+    optimize_pipeline_for_cpu,
+    peak_signal_to_noise_ratio,
+    resolve_cpu_execution,
+)
+
+
+def create_tiny_pipeline():
+    """Small randomly initialized SDXL-like UNet and VAE, optimized like the anonymizer pipelines on the CPU."""
+    torch.manual_seed(0)
+    unet = diffusers.UNet2DConditionModel(
+        sample_size=16,
+        in_channels=4,
+        out_channels=4,
+        layers_per_block=1,
+        block_out_channels=(32, 64),
+        down_block_types=("CrossAttnDownBlock2D", "DownBlock2D"),
+        up_block_types=("UpBlock2D", "CrossAttnUpBlock2D"),
+        cross_attention_dim=32,
+        attention_head_dim=8,
+        norm_num_groups=32,
+    ).eval()
+    vae = diffusers.AutoencoderKL(
+        in_channels=3,
+        out_channels=3,
+        down_block_types=("DownEncoderBlock2D", "DownEncoderBlock2D"),
+        up_block_types=("UpDecoderBlock2D", "UpDecoderBlock2D"),
+        block_out_channels=(32, 64),
+        latent_channels=4,
+        norm_num_groups=32,
+    ).eval()
+    pipeline = SimpleNamespace(unet=unet, vae=vae)
+    return optimize_pipeline_for_cpu(pipeline, resolve_cpu_execution(None))
+
+
+@torch.no_grad()
+def run_tiny_pipeline(pipeline, use_bf16: bool, step_latency_tracker: StepLatencyTracker) -> Image.Image:
+    """Denoise fixed latents with the UNet and decode them with the VAE, the same way the base pass does."""
+    generator = torch.Generator().manual_seed(1)
+    latents = torch.randn((1, 4, 16, 16), generator=generator)
+    encoder_hidden_states = torch.randn((1, 8, 32), generator=generator)
+    scheduler = diffusers.DPMSolverMultistepScheduler()
+    scheduler.set_timesteps(10)
+
+    step_latency_tracker.start()
+    with cpu_autocast(use_bf16):
+        for step, timestep in enumerate(scheduler.timesteps):
+            noise_pred = pipeline.unet(latents, timestep, encoder_hidden_states=encoder_hidden_states).sample
+            latents = scheduler.step(noise_pred.float(), timestep, latents).prev_sample
+            step_latency_tracker(pipeline, step, timestep, {})
+        image = pipeline.vae.decode(latents / pipeline.vae.config.scaling_factor).sample.float()
+
+    image = ((image / 2 + 0.5).clamp(0, 1) * 255).round().to(torch.uint8)
+    return Image.fromarray(image[0].permute(1, 2, 0).numpy())
+
+
+def test_bf16_output_within_psnr_tolerance():
+    pipeline = create_tiny_pipeline()
+    step_latency_tracker = StepLatencyTracker()
+
+    fp32_output = run_tiny_pipeline(pipeline, False, step_latency_tracker)
+    bf16_output = run_tiny_pipeline(pipeline, True, step_latency_tracker)
+
+    assert len(step_latency_tracker.step_latencies) == 9
+    assert step_latency_tracker.mean_latency > 0
+    assert peak_signal_to_noise_ratio(fp32_output, bf16_output) >= DEFAULT_CPU_EXECUTION["bf16_min_psnr"]
+
+
+def test_peak_signal_to_noise_ratio():
+    image = Image.fromarray(np.full((8, 8, 3), 100, dtype=np.uint8))
+    shifted_image = Image.fromarray(np.full((8, 8, 3), 110, dtype=np.uint8))
+
+    assert peak_signal_to_noise_ratio(image, image) == float("inf")
+    assert peak_signal_to_noise_ratio(image, shifted_image) == pytest.approx(10 * np.log10(255.0**2 / 100))
+
+
+def test_configure_torch_threads(monkeypatch):
+    monkeypatch.setattr(cpu_execution, "_interop_threads_configured", False)
+    num_threads = torch.get_num_threads()
+
+    configure_torch_threads(1, None)
+
+    assert torch.get_num_threads() == 1
+    assert cpu_execution._interop_threads_configured is False
+    torch.set_num_threads(num_threads)
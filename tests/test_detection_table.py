@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from blanket.core.geometry import SO3
+from blanket.core.objects.detection_table import NO_TRACK_ID, DetectionTable
+from blanket.core.objects.detections import FaceDetection, FacialLandmarksDetection
+
+
+def create_detection(left: int, confidence=0.9, with_landmarks=True, orientation=None) -> FaceDetection:
+    landmarks = None
+    if with_landmarks:
+        landmarks = FacialLandmarksDetection(np.arange(10, dtype=np.float32).reshape(5, 2) + left, orientation=orientation)
+    return FaceDetection(np.array([left, 10, left + 20, 40]), confidence, landmarks)
+
+
+@pytest.fixture
+def detections_per_frame():
+    return [
+        [create_detection(0, orientation=SO3.from_euler_angles(np.array([0.1, 0.2, 0.3]), "zyx"))],
+        [],
+        [create_detection(30, confidence=None, with_landmarks=False), create_detection(60)],
+    ]
+
+
+@pytest.fixture
+def table(detections_per_frame):
+    return DetectionTable.from_detections(
+        detections_per_frame, frame_indices=[5, 3, 1], track_ids_per_frame=[[7], [], [8, 9]]
+    )
+
+
+def assert_tables_equal(first: DetectionTable, second: DetectionTable) -> None:
+    np.testing.assert_array_equal(first.frame_indices, second.frame_indices)
+    np.testing.assert_array_equal(first.track_ids, second.track_ids)
+    np.testing.assert_array_equal(first.left_top_right_bottom, second.left_top_right_bottom)
+    np.testing.assert_array_equal(first.confidences, second.confidences)
+    np.testing.assert_array_equal(first.landmarks, second.landmarks)
+    np.testing.assert_array_equal(first.orientation_quaternions, second.orientation_quaternions)
+
+
+def test_from_detections(table):
+    # rows are sorted by frame index, the order within a frame is kept
+    np.testing.assert_array_equal(table.frame_indices, [1, 1, 5])
+    np.testing.assert_array_equal(table.track_ids, [8, 9, 7])
+    np.testing.assert_array_equal(table.left_top_right_bottom[:, 0], [30, 60, 0])
+    assert np.isnan(table.confidences[0])
+    assert np.isnan(table.landmarks[0]).all()
+    assert np.isnan(table.orientation_quaternions[:2]).all()
+    assert table.frame_rows(3) == slice(2, 2)
+    assert len(table.frame(1)) == 2
+
+
+def test_from_detections_round_trip(detections_per_frame, table):
+    original_detections = detections_per_frame[2] + detections_per_frame[0]
+
+    for detection, original_detection in zip(table.to_face_detections(), original_detections):
+        np.testing.assert_array_equal(detection.left_top_right_bottom, original_detection.left_top_right_bottom)
+        if original_detection.confidence is None:
+            assert detection.confidence is None
+        else:
+            assert detection.confidence == pytest.approx(original_detection.confidence)
+
+        if original_detection.landmarks is None:
+            assert detection.landmarks is None
+            continue
+        np.testing.assert_array_equal(detection.landmarks.landmarks, original_detection.landmarks.landmarks)
+        if original_detection.landmarks.orientation is None:
+            assert detection.landmarks.orientation is None
+        else:
+            np.testing.assert_allclose(
+                detection.landmarks.orientation.rot, original_detection.landmarks.orientation.rot, atol=1e-12
+            )
+
+
+def test_from_detections_without_track_ids():
+    table = DetectionTable.from_detections([[create_detection(0, with_landmarks=False)]])
+
+    np.testing.assert_array_equal(table.track_ids, [NO_TRACK_ID])
+    assert table.landmarks is None
+    assert table.orientation_quaternions is None
+
+
+@pytest.mark.parametrize("file_name", ["detections.npz", "detections"])
+def test_save_and_load(tmp_path, table, file_name):
+    path = tmp_path / file_name
+
+    table.save(path)
+    loaded_table = DetectionTable.load(path)
+
+    assert_tables_equal(loaded_table, table)
+
+
+def test_save_folder_removes_stale_columns(tmp_path, table):
+    table.save(tmp_path / "detections")
+    table_without_landmarks = table.select(slice(0, 1))
+    table_without_landmarks.landmarks = None
+    table_without_landmarks.orientation_quaternions = None
+
+    table_without_landmarks.save(tmp_path / "detections")
+    loaded_table = DetectionTable.load(tmp_path / "detections", mmap_mode=None)
+
+    assert len(loaded_table) == 1
+    assert loaded_table.landmarks is None
+    assert loaded_table.orientation_quaternions is None
+
+
+def test_load_missing_folder(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        DetectionTable.load(tmp_path / "missing")
+
+
+def test_empty_table(tmp_path):
+    table = DetectionTable.empty(num_landmarks=5, with_orientations=True)
+
+    assert len(table) == 0
+    assert table.landmarks.shape == (0, 5, 2)
+    assert len(table.unique_frame_indices) == 0
+    assert table.to_face_detections() == []
+    assert table.intersection_over_union(table).shape == (0, 0)
+
+    table.save(tmp_path / "empty.npz")
+    assert len(DetectionTable.load(tmp_path / "empty.npz")) == 0
+    assert len(DetectionTable.from_detections([[], []])) == 0
+
+
+def test_concatenate(table):
+    first_chunk, second_chunk = table.select(slice(2, 3)), table.select(slice(0, 2))
+
+    concatenated_table = DetectionTable.concatenate([first_chunk, second_chunk])
+
+    assert_tables_equal(concatenated_table, table)
+    assert len(DetectionTable.concatenate([])) == 0
+
+
+def test_concatenate_with_missing_column(table):
+    table_without_landmarks = DetectionTable.from_detections([[create_detection(0, with_landmarks=False)]])
+
+    with pytest.raises(ValueError):
+        DetectionTable.concatenate([table, table_without_landmarks])
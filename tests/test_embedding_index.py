@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from blanket.evaluation.embedding_index import UNKNOWN_IDENTITY, EmbeddingIndex, normalize_embeddings
+
+DIMENSION = 16
+
+
+def create_embeddings(count: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(count, DIMENSION)).astype(np.float32)
+
+
+def brute_force_search(embeddings: np.ndarray, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Top-k by a full similarity matrix of the embeddings as stored in the index (normalized float16)."""
+    stored_embeddings = normalize_embeddings(embeddings).astype(np.float16).astype(np.float32)
+    similarities = normalize_embeddings(queries) @ stored_embeddings.T
+    indices = np.argsort(-similarities, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(similarities, indices, axis=1), indices
+
+
+@pytest.fixture
+def embeddings():
+    return create_embeddings(130, 0)
+
+
+@pytest.fixture
+def identity_ids(embeddings):
+    return np.arange(len(embeddings)) % 7
+
+
+@pytest.fixture
+def index(tmp_path, embeddings, identity_ids):
+    index = EmbeddingIndex(tmp_path / "index", dimension=DIMENSION, shard_size=50)
+    index.add(embeddings[:70], identity_ids[:70])
+    index.add(embeddings[70:], identity_ids[70:])
+    index.flush()
+    return index
+
+
+def test_search_matches_brute_force(index, embeddings, identity_ids):
+    queries = create_embeddings(20, 1)
+    query_identity_ids = np.arange(len(queries)) % 7
+
+    result = index.search(
+        queries, k=5, query_identity_ids=query_identity_ids, block_size=16, query_block_size=7, num_threads=2
+    )
+
+    expected_similarities, expected_indices = brute_force_search(embeddings, queries, 5)
+    np.testing.assert_array_equal(result.indices, expected_indices)
+    np.testing.assert_allclose(result.similarities, expected_similarities, rtol=1e-5, atol=1e-6)
+    np.testing.assert_array_equal(result.identity_ids, identity_ids[expected_indices])
+
+    all_similarities, all_indices = brute_force_search(embeddings, queries, len(embeddings))
+    same_identity = identity_ids[all_indices] == query_identity_ids[:, None]
+    np.testing.assert_allclose(
+        result.true_identity_similarities, np.where(same_identity, all_similarities, -np.inf).max(axis=1), rtol=1e-5
+    )
+
+
+def test_search_with_k_larger_than_index(tmp_path):
+    index = EmbeddingIndex(tmp_path / "index", dimension=DIMENSION)
+    index.add(create_embeddings(3, 0), identity_ids=4)
+
+    result = index.search(create_embeddings(2, 1), k=5)
+
+    assert (result.indices[:, :3] >= 0).all()
+    np.testing.assert_array_equal(result.indices[:, 3:], -1)
+    assert np.isneginf(result.similarities[:, 3:]).all()
+    np.testing.assert_array_equal(result.identity_ids, [[4, 4, 4, UNKNOWN_IDENTITY, UNKNOWN_IDENTITY]] * 2)
+
+
+def test_reopen_index(tmp_path, index, embeddings):
+    queries = create_embeddings(4, 2)
+
+    reopened_index = EmbeddingIndex(tmp_path / "index", dimension=8, shard_size=10)
+
+    assert (reopened_index.dimension, reopened_index.shard_size, len(reopened_index)) == (DIMENSION, 50, 130)
+    np.testing.assert_array_equal(reopened_index.search(queries, k=3).indices, index.search(queries, k=3).indices)
+
+    reopened_index.add(embeddings[:5], identity_ids=9)
+    reopened_index.flush()
+    assert len(EmbeddingIndex(tmp_path / "index")) == 135
+
+
+def test_search_empty_index(tmp_path):
+    index = EmbeddingIndex(tmp_path / "index", dimension=DIMENSION)
+
+    result = index.search(create_embeddings(3, 0), k=4, query_identity_ids=np.zeros(3))
+
+    assert len(index) == 0
+    np.testing.assert_array_equal(result.indices, np.full((3, 4), -1))
+    assert np.isneginf(result.similarities).all()
+    np.testing.assert_array_equal(result.identity_ids, np.full((3, 4), UNKNOWN_IDENTITY))
+    assert np.isneginf(result.true_identity_similarities).all()
@@ -0,0 +1,69 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from blanket.core.objects.detections import FaceDetection
+from blanket.evaluation.evaluation_engine import StreamingEvaluator
+from blanket.settings.evaluation_settings import EvaluationSettings
+
+
+class StubFaceDetector:
+    """Detects one face at a fixed box, failing from the fail_at_batch-th batch on (if given)."""
+
+    def __init__(self, fail_at_batch=None):
+        self.fail_at_batch = fail_at_batch
+        self.batch_count = 0
+
+    def detect_batch(self, images_bgr):
+        self.batch_count += 1
+        if self.fail_at_batch is not None and self.batch_count >= self.fail_at_batch:
+            raise RuntimeError("Detection failed")
+        return [[FaceDetection(np.array([8, 8, 24, 24]), confidence=0.9)] for _ in images_bgr]
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = tmp_path / "video.avi"
+    video_writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48))
+    for index in range(20):
+        video_writer.write(np.full((48, 64, 3), index * 10, dtype=np.uint8))
+    video_writer.release()
+    return path
+
+
+def run_with_timeout(target, timeout_seconds=30.0):
+    """Run target in a thread, return its result or exception; fail if it does not finish in time."""
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = target()
+        except BaseException as e:
+            outcome["exception"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout_seconds)
+    assert not thread.is_alive(), "evaluation did not finish"
+    return outcome
+
+
+def test_evaluate(video_path):
+    settings = EvaluationSettings(metrics=["detection_accuracy"], evaluation_batch_size=4)
+    evaluator = StreamingEvaluator(StubFaceDetector(), settings)
+
+    report = evaluator.evaluate(str(video_path), str(video_path))
+
+    assert report.evaluated_frames == 20
+
+
+@pytest.mark.parametrize("queue_size", [1, 2])
+def test_evaluate_stops_decoders_after_failure(video_path, queue_size):
+    settings = EvaluationSettings(metrics=["detection_accuracy"], evaluation_batch_size=1)
+    evaluator = StreamingEvaluator(StubFaceDetector(fail_at_batch=2), settings, queue_size=queue_size)
+
+    outcome = run_with_timeout(lambda: evaluator.evaluate(str(video_path), str(video_path)))
+
+    assert isinstance(outcome.get("exception"), RuntimeError)
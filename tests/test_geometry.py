@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from blanket.core.geometry import SO3, SO3Batch
+
+
+@pytest.fixture
+def rot_vectors():
+    rng = np.random.default_rng(0)
+    axes = rng.normal(size=(16, 3))
+    rot_vectors = axes / np.linalg.norm(axes, axis=1, keepdims=True) * rng.uniform(0, np.pi - 0.01, size=(16, 1))
+    # zero, tiny and large rotations (SO3.log loses precision closer to pi)
+    rot_vectors[0] = 0
+    rot_vectors[1] = [1e-9, 0, 0]
+    rot_vectors[2] = [0, 0, np.pi - 0.01]
+    return rot_vectors
+
+
+@pytest.fixture
+def rotations(rot_vectors):
+    return SO3Batch.from_so3s([SO3.exp(rot_vector) for rot_vector in rot_vectors])
+
+
+@pytest.mark.parametrize("seq", ["xyz", "zyx", "zxz", "yx", "y"])
+def test_from_euler_angles_matches_so3(seq):
+    angles = np.random.default_rng(1).uniform(-np.pi, np.pi, size=(10, len(seq)))
+
+    rotations = SO3Batch.from_euler_angles(angles, seq)
+
+    for rotation, item_angles in zip(rotations.to_so3s(), angles):
+        np.testing.assert_allclose(rotation.rot, SO3.from_euler_angles(item_angles, seq).rot, atol=1e-12)
+
+
+def test_from_euler_angles_rejects_unknown_axis():
+    with pytest.raises(ValueError):
+        SO3Batch.from_euler_angles(np.zeros((2, 2)), "xw")
+
+
+def test_to_euler_angles_zyx_matches_so3(rotations):
+    gimbal_lock_rotation = SO3.from_euler_angles(np.array([0.0, np.pi / 2, 0.3]), "zyx")
+    gimbal_lock_rotation.rot[0, 0] = gimbal_lock_rotation.rot[1, 0] = 0
+    rotations = SO3Batch(np.concatenate([rotations.rot, gimbal_lock_rotation.rot[None]]))
+
+    angles = rotations.to_euler_angles_zyx()
+
+    for rotation, item_angles in zip(rotations.to_so3s(), angles):
+        np.testing.assert_allclose(item_angles, rotation.to_euler_angles_zyx(), atol=1e-12)
+
+
+def test_compose_matches_so3(rotations):
+    other_rotations = SO3Batch.exp(np.random.default_rng(2).normal(size=(len(rotations), 3)))
+    single_rotation = SO3.exp(np.array([0.1, -0.2, 0.3]))
+
+    composed = rotations * other_rotations
+    composed_with_single = rotations * single_rotation
+
+    for position, (rotation, other_rotation) in enumerate(zip(rotations.to_so3s(), other_rotations.to_so3s())):
+        np.testing.assert_allclose(composed.rot[position], (rotation * other_rotation).rot, atol=1e-12)
+        np.testing.assert_allclose(composed_with_single.rot[position], (rotation * single_rotation).rot, atol=1e-12)
+
+
+def test_exp_and_log_match_so3(rot_vectors, rotations):
+    np.testing.assert_allclose(SO3Batch.exp(rot_vectors).rot, rotations.rot, atol=1e-9)
+
+    for rot_vector, rotation in zip(rotations.log(), rotations.to_so3s()):
+        np.testing.assert_allclose(rot_vector, rotation.log(), atol=1e-6)
+    np.testing.assert_allclose(rotations.log(), rot_vectors, atol=1e-9)
+
+    near_pi_rot_vector = np.array([[0, np.pi - 1e-6, 0]])
+    np.testing.assert_allclose(SO3Batch.exp(near_pi_rot_vector).log(), near_pi_rot_vector, atol=1e-9)
+
+
+def test_quaternions_match_so3(rotations):
+    quaternions = rotations.to_quaternions()
+
+    for quaternion, rotation in zip(quaternions, rotations.to_so3s()):
+        expected_quaternion = rotation.to_quaternion()
+        # q and -q are the same rotation, both conventions keep qw >= 0 (up to rounding at qw == 0)
+        sign = 1.0 if np.dot(quaternion, expected_quaternion) >= 0 else -1.0
+        np.testing.assert_allclose(quaternion, sign * expected_quaternion, atol=1e-9)
+    np.testing.assert_allclose(SO3Batch.from_quaternions(quaternions).rot, rotations.rot, atol=1e-12)
+
+
+def test_inverse_and_act_match_so3(rotations):
+    vectors = np.random.default_rng(3).normal(size=(len(rotations), 3))
+
+    inverse_rotations = rotations.inverse()
+    rotated_vectors = rotations.act(vectors)
+
+    for position, rotation in enumerate(rotations.to_so3s()):
+        np.testing.assert_allclose(inverse_rotations.rot[position], rotation.inverse().rot, atol=1e-12)
+        np.testing.assert_allclose(rotated_vectors[position], rotation.act(vectors[position]), atol=1e-12)
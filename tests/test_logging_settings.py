@@ -0,0 +1,64 @@
+import logging
+import time
+
+from blanket.settings.logging_settings import BatchedFileHandler, LoggingSettings
+
+
+def create_record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+
+def test_batched_file_handler_flushes_full_batches(tmp_path):
+    path = tmp_path / "log.txt"
+    handler = BatchedFileHandler(path, "w", flush_every_records=3, flush_interval_seconds=3600)
+
+    handler.handle(create_record("first"))
+    handler.handle(create_record("second"))
+    assert path.read_text() == ""
+
+    handler.handle(create_record("third"))
+    assert path.read_text().splitlines() == ["first", "second", "third"]
+    handler.close()
+
+
+def test_batched_file_handler_flush_writes_buffered_records(tmp_path):
+    path = tmp_path / "log.txt"
+    handler = BatchedFileHandler(path, "w", flush_every_records=100, flush_interval_seconds=3600)
+
+    handler.handle(create_record("first"))
+    handler.flush()
+    assert path.read_text().splitlines() == ["first"]
+
+    handler.handle(create_record("second"))
+    handler.close()
+    assert path.read_text().splitlines() == ["first", "second"]
+
+
+def test_batched_file_handler_flushes_after_interval(tmp_path):
+    path = tmp_path / "log.txt"
+    handler = BatchedFileHandler(path, "w", flush_every_records=100, flush_interval_seconds=0.0)
+
+    handler.handle(create_record("first"))
+    assert path.read_text().splitlines() == ["first"]
+    handler.close()
+
+
+def test_queue_listener_flushes_idle_file_handlers(tmp_path):
+    logging_settings = LoggingSettings(
+        process_log_filepath=tmp_path / "process_log.txt",
+        log_anonymization_result=False,
+        log_frames_without_detections=False,
+        process_console_log_level="critical",
+        flush_every_records=100,
+        flush_interval_seconds=0.05,
+    )
+    try:
+        logging_settings.process_logger.info("idle")
+
+        # nothing else is logged, the listener thread has to flush on its timer
+        deadline = time.monotonic() + 5.0
+        while "idle" not in (tmp_path / "process_log.txt").read_text() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert "idle" in (tmp_path / "process_log.txt").read_text()
+    finally:
+        logging_settings.stop()
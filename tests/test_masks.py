@@ -0,0 +1,44 @@
+import cv2
+import numpy as np
+import pytest
+
+from blanket.core.objects.masks import RegionMask
+
+IMAGE_SHAPE = (120, 160, 3)
+
+
+def full_frame_feathered(mask: RegionMask, blur_radius: int) -> np.ndarray:
+    kernel_size = blur_radius * 2 + 1
+    return cv2.GaussianBlur(mask.to_full_frame(), (kernel_size, kernel_size), 0)
+
+
+@pytest.mark.parametrize("blur_radius", [1, 4, 15])
+@pytest.mark.parametrize(
+    "points",
+    [
+        np.array([[60, 40], [100, 45], [95, 85], [65, 80]]),  # inside the image
+        np.array([[0, 0], [30, 2], [25, 28], [3, 20]]),  # touching the top-left image corner
+        np.array([[150, 100], [159, 110], [155, 119], [140, 117]]),  # close to the bottom-right image corner
+    ],
+)
+def test_feathered_matches_full_frame_blur(points, blur_radius):
+    mask = RegionMask.from_convex_hull(points, IMAGE_SHAPE)
+
+    feathered_mask = mask.feathered(blur_radius)
+
+    np.testing.assert_array_equal(feathered_mask.to_full_frame(), full_frame_feathered(mask, blur_radius))
+
+
+def test_feathered_box_matches_full_frame_blur():
+    mask = RegionMask.from_box(np.array([40, 30, 90, 70]), IMAGE_SHAPE, padding=5)
+
+    feathered_mask = mask.feathered(6)
+
+    assert tuple(feathered_mask.left_top_right_bottom) == (29, 19, 101, 81)
+    np.testing.assert_array_equal(feathered_mask.to_full_frame(), full_frame_feathered(mask, 6))
+
+
+def test_feathered_without_blur():
+    mask = RegionMask.from_box(np.array([40, 30, 90, 70]), IMAGE_SHAPE)
+
+    assert mask.feathered(0) is mask
@@ -0,0 +1,202 @@
+import cv2
+import numpy as np
+import pytest
+
+from blanket.core.objects.primitives import (
+    FrameBatch,
+    FrameBufferPool,
+    ImagePrimitive,
+    VideoFrameIndex,
+    VideoPrimitive,
+)
+
+
+def create_image(height: int, width: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    """Short 64x48 video with a distinct gray level in every frame."""
+    path = tmp_path / "video.avi"
+    video_writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48))
+    for index in range(10):
+        video_writer.write(np.full((48, 64, 3), index * 20, dtype=np.uint8))
+    video_writer.release()
+    return path
+
+
+def test_frame_batch_append():
+    batch = FrameBatch.allocate(3, 4, 6, pool=None)
+    image = create_image(4, 6, 0)
+    rotated_image = create_image(6, 4, 1)
+
+    frame = batch.append(image, frame_index=7)
+    batch.append(rotated_image, frame_index=8, clockwise_rotation_index=1)
+
+    assert len(batch) == 2
+    assert np.shares_memory(frame, batch.buffer)
+    np.testing.assert_array_equal(batch[0], image)
+    np.testing.assert_array_equal(batch[-1], ImagePrimitive.rotate_image(rotated_image, 1))
+    np.testing.assert_array_equal(batch.frame_indices, [7, 8, -1])
+    np.testing.assert_array_equal(batch.clockwise_rotation_indices, [0, 1, 0])
+
+    with pytest.raises(ValueError):
+        batch.append(image, clockwise_rotation_index=1)
+    with pytest.raises(IndexError):
+        batch[2]
+
+
+def test_frame_batch_append_full():
+    batch = FrameBatch.allocate(1, 4, 6, pool=None)
+    batch.append(create_image(4, 6, 0))
+
+    with pytest.raises(ValueError):
+        batch.append(create_image(4, 6, 1))
+
+
+def test_frame_batch_rotated():
+    batch = FrameBatch.allocate(3, 4, 6, pool=None)
+    images = [create_image(4, 6, seed) for seed in range(2)]
+    for frame_index, image in enumerate(images):
+        batch.append(image, frame_index=frame_index)
+
+    rotated_batch = batch.rotated(1)
+
+    assert (rotated_batch.height, rotated_batch.width, len(rotated_batch)) == (6, 4, 2)
+    for rotated_frame, image in zip(rotated_batch, images):
+        np.testing.assert_array_equal(rotated_frame, ImagePrimitive.rotate_image(image, 1))
+    # only the slots of valid frames are copied, the free slot keeps its cleared metadata
+    np.testing.assert_array_equal(rotated_batch.frame_indices, [0, 1, -1])
+    np.testing.assert_array_equal(rotated_batch.clockwise_rotation_indices, [1, 1, 0])
+
+    rotated_back_batch = rotated_batch.rotated(-1)
+    np.testing.assert_array_equal(rotated_back_batch.frames, batch.frames)
+    np.testing.assert_array_equal(rotated_back_batch.clockwise_rotation_indices, [0, 0, 0])
+    assert batch.rotated(4) is batch
+
+
+def test_frame_batch_swap_channel_order():
+    batch = FrameBatch.allocate(2, 4, 6, pool=None)
+    image = create_image(4, 6, 0)
+    batch.append(image)
+    buffer = batch.buffer
+
+    batch.to_rgb()
+
+    assert batch.is_rgb
+    assert batch.buffer is buffer
+    np.testing.assert_array_equal(batch[0], image[..., ::-1])
+    with pytest.raises(ValueError):
+        batch.as_image_primitives()
+
+    batch.to_rgb().to_bgr()
+
+    assert not batch.is_rgb
+    np.testing.assert_array_equal(batch[0], image)
+    assert np.shares_memory(batch.as_image_primitives()[0].image_bgr, buffer)
+
+
+def test_frame_batch_release_returns_buffer_to_pool():
+    pool = FrameBufferPool()
+
+    with FrameBatch.allocate(2, 4, 6, pool) as batch:
+        buffer = batch.buffer
+        batch.append(create_image(4, 6, 0))
+
+    assert batch.buffer is None
+    assert len(batch) == 0
+
+    reused_batch = FrameBatch.allocate(2, 4, 6, pool)
+    other_shape_batch = FrameBatch.allocate(2, 6, 4, pool)
+
+    assert reused_batch.buffer is buffer
+    assert len(reused_batch) == 0
+    assert other_shape_batch.buffer is not buffer
+
+
+def test_frame_buffer_pool_drops_oldest_buffer_when_full():
+    pool = FrameBufferPool(max_free_buffers=1)
+    first_buffer = pool.acquire((1, 2, 2, 3))
+    second_buffer = pool.acquire((1, 2, 2, 3))
+
+    pool.release(first_buffer)
+    pool.release(second_buffer)
+
+    assert pool.acquire((1, 2, 2, 3)) is second_buffer
+    assert pool.acquire((1, 2, 2, 3)) is not first_buffer
+
+
+def test_video_iter_frame_batches(video_path):
+    pool = FrameBufferPool()
+
+    with VideoPrimitive(video_path, clockwise_rotation_index=1) as video:
+        batch_sizes, frame_indices, gray_levels = [], [], []
+        buffers = set()
+        for batch in video.iter_frame_batches(4, pool):
+            assert (batch.height, batch.width) == (64, 48)
+            batch_sizes.append(len(batch))
+            frame_indices.extend(batch.frame_indices[: len(batch)])
+            gray_levels.extend(int(np.median(frame)) for frame in batch)
+            buffers.add(id(batch.buffer))
+            batch.release()
+
+    assert batch_sizes == [4, 4, 2]
+    assert frame_indices == list(range(10))
+    assert gray_levels == pytest.approx([index * 20 for index in range(10)], abs=3)
+    # released batch buffers are reused by the next batches
+    assert len(buffers) == 1
+
+
+def test_frame_index_is_cached_in_cache_dir(tmp_path, video_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+
+    frame_index = VideoFrameIndex.load_or_build(video_path, cache_dir)
+
+    assert frame_index.keyframe_indices[0] == 0
+    assert VideoFrameIndex.cache_path(video_path, cache_dir).is_file()
+    assert list(video_path.parent.glob("*.frame_index.npz")) == []
+
+    monkeypatch.setattr(VideoFrameIndex, "build", lambda video_path: pytest.fail("index was rebuilt"))
+    cached_frame_index = VideoFrameIndex.load_or_build(video_path, cache_dir)
+    np.testing.assert_array_equal(cached_frame_index.keyframe_indices, frame_index.keyframe_indices)
+
+
+def test_frame_index_without_cache_dir(tmp_path, video_path):
+    frame_index = VideoFrameIndex.load_or_build(video_path, None)
+
+    assert frame_index.keyframe_indices[0] == 0
+    assert list(tmp_path.rglob("*.frame_index.npz")) == []
+
+
+def test_video_random_access(tmp_path, video_path):
+    with VideoPrimitive(video_path, frame_index_cache_dir=tmp_path / "cache") as video:
+        gray_levels = [int(np.median(video.load_frame_as_array(index))) for index in (7, 2, 2, 9)]
+
+    assert gray_levels == pytest.approx([140, 40, 40, 180], abs=3)
+
+
+def test_video_iteration(video_path):
+    with VideoPrimitive(video_path, prefetch_frames=2) as video:
+        gray_levels = [int(np.median(frame.image_bgr)) for frame in video]
+
+    assert gray_levels == pytest.approx([index * 20 for index in range(10)], abs=3)
+
+
+def test_video_iteration_stops_prefetching_after_break(tmp_path, video_path):
+    with VideoPrimitive(video_path, prefetch_frames=2, frame_index_cache_dir=tmp_path / "cache") as video:
+        for frame in video:
+            prefetch_thread = video._prefetch_thread
+            break
+
+        # the abandoned iterator is garbage collected, which stops its prefetch thread
+        assert video._prefetch_thread is None
+        assert not prefetch_thread.is_alive()
+
+        iterator = iter(video)
+        next(iterator)
+        prefetch_thread = video._prefetch_thread
+        iterator.close()
+
+        assert not prefetch_thread.is_alive()
+        assert int(np.median(video.load_frame_as_array(5))) == pytest.approx(100, abs=3)
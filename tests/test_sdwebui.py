@@ -0,0 +1,113 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+import requests
+from PIL import Image
+
+from blanket.anonymization.methods.sdwebui import (
+    IMG2IMG_ENDPOINT,
+    SDWebUIAnonymizer,
+    decode_image_base64,
+    encode_image_base64,
+)
+from blanket.settings.individual_modules_settings.sdwebui_settings import SDWebUISettings
+
+
+class StubSDWebUIHandler(BaseHTTPRequestHandler):
+    """img2img stub answering with a gray image of the requested size, failing the first `fail_count` requests."""
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append((self.path, payload))
+            failed = len(server.requests) <= server.fail_count
+
+        if failed:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        image = Image.new("RGB", (payload["width"], payload["height"]), (128, 128, 128))
+        body = json.dumps({"images": [encode_image_base64(image)]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSDWebUIHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.fail_count = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def anonymizer(stub_server):
+    settings = SDWebUISettings(
+        port=str(stub_server.server_address[1]), request_timeout=10.0, max_retries=2, retry_backoff_factor=0.0
+    )
+    anonymizer = SDWebUIAnonymizer(settings=settings)
+    yield anonymizer
+    anonymizer.unload()
+
+
+def test_generate(stub_server, anonymizer):
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    output = anonymizer.generate(image, [200, 100, 400, 350])
+
+    assert output.size == (640, 480)
+    assert len(stub_server.requests) == 1
+
+    path, payload = stub_server.requests[0]
+    assert path == IMG2IMG_ENDPOINT
+    assert (payload["width"], payload["height"]) == (640, 480)
+    assert decode_image_base64(payload["init_images"][0]).size == (640, 480)
+    assert decode_image_base64(payload["mask"]).size == (640, 480)
+    assert payload["prompt"] == anonymizer.payload_template["prompt"]
+
+
+def test_generate_with_output_size(stub_server, anonymizer):
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    output = anonymizer.generate(image, [200, 100, 400, 350], output_size=(512, 384))
+
+    _, payload = stub_server.requests[0]
+    assert (payload["width"], payload["height"]) == (512, 384)
+    assert output.size == (512, 384)
+
+
+def test_generate_retries_unavailable_server(stub_server, anonymizer):
+    stub_server.fail_count = 2
+    image = np.zeros((256, 256, 3), dtype=np.uint8)
+
+    output = anonymizer.generate(image, [64, 64, 192, 192])
+
+    assert output.size == (256, 256)
+    assert len(stub_server.requests) == 3
+
+
+def test_generate_fails_after_retries(stub_server, anonymizer):
+    stub_server.fail_count = 10
+    image = np.zeros((256, 256, 3), dtype=np.uint8)
+
+    with pytest.raises(requests.HTTPError):
+        anonymizer.generate(image, [64, 64, 192, 192])
+
+    assert len(stub_server.requests) == 3